@@ -0,0 +1,369 @@
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import re
+import sys
+
+import numpy as np
+
+from sPyBlocks.connection_functions import static_synapse
+from sPyBlocks.connection_graph import IGNORED_ATTRIBUTES, block_populations
+from sPyBlocks.netlist import Netlist, NetlistCellType
+
+# Version of the cache format, included in the keys to invalidate old files
+CACHE_VERSION = 2
+
+# Element of a path inside a block (an attribute name and an optional list index)
+_PATH_ELEMENT = re.compile(r"(\w+)(?:\[(\d+)\])?")
+
+
+def _canonical(value, netlist):
+    """
+    Gets a hashable representation of a constructor argument.
+    """
+    if value is netlist:
+        return "<sim>"
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), _canonical(element, netlist)) for key, element in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(element, netlist) for element in value)
+    if hasattr(value, "weight") and hasattr(value, "delay"):  # Synapse
+        return "StaticSynapse", float(value.weight), None if value.delay is None else float(value.delay)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def source_hash(block_class):
+    """
+    Gets a hash of the source code used to build a block: the module of its class and every module of the same package
+    it depends on (for example, the modules of its inner blocks and of the connection functions).
+
+    :param type block_class: The class of the block.
+    :return: A hexadecimal string.
+    :rtype: str
+    """
+    package = block_class.__module__.split(".")[0]
+    modules = {}
+    pending = [sys.modules[block_class.__module__]]
+    while pending:
+        module = pending.pop()
+        if module.__name__ in modules:
+            continue
+        modules[module.__name__] = module
+
+        for value in vars(module).values():
+            name = value.__name__ if inspect.ismodule(value) else getattr(value, "__module__", None)
+            if isinstance(name, str) and name.split(".")[0] == package and name in sys.modules:
+                pending.append(sys.modules[name])
+
+    digest = hashlib.sha256()
+    for name in sorted(modules):
+        try:
+            digest.update(inspect.getsource(modules[name]).encode())
+        except (OSError, TypeError):  # No source available (for example, an interactive session)
+            digest.update(name.encode())
+
+    return digest.hexdigest()
+
+
+def build_key(block_class, *args, **kwargs):
+    """
+    Gets the key identifying the topology of a block, which is fully determined by its class, the arguments of its
+    constructor (including the global parameters, the neuron parameters and the standard connection) and the source
+    code used to build it (see source_hash).
+
+    :param type block_class: The class of the block.
+    :param args: The positional arguments of the constructor.
+    :param kwargs: The keyword arguments of the constructor.
+    :return: A hexadecimal string.
+    :rtype: str
+    """
+    netlist = next((arg for arg in list(args) + list(kwargs.values()) if isinstance(arg, Netlist)), None)
+    description = (CACHE_VERSION, block_class.__module__, block_class.__qualname__, source_hash(block_class),
+                   _canonical(args, netlist), _canonical(kwargs, netlist))
+
+    return hashlib.sha256(repr(description).encode()).hexdigest()
+
+
+def _population_spec(population):
+    """
+    Gets a JSON serializable description of a deferred population.
+    """
+    params = population.celltype.params
+    if population.celltype.name == "SpikeSourceArray":
+        params = {"spike_times": [[float(time) for time in times] for times in Netlist._spike_times(population)]}
+
+    return {"name": population.celltype.name, "params": params,
+            "initial_values": {key: float(value) for key, value in population.initial_values.items()}}
+
+
+def _is_block(value):
+    """
+    Checks whether a value is a spiking functional block.
+    """
+    return hasattr(value, "total_neurons") and not isinstance(value, type)
+
+
+def _is_population(value):
+    """
+    Checks whether a value is a deferred population or view.
+    """
+    return hasattr(value, "ids") and hasattr(value, "grandparent")
+
+
+def _block_structure(block, templates):
+    """
+    Gets a JSON serializable description of the structure of a block. Each block is described by a template (its class,
+    scalar attributes and synapses), shared by all the identical blocks, and by the descriptions of its inner blocks.
+    The neurons are not included, as they are stored by their path (see save_build).
+    """
+    attributes = {}
+    synapses = {}
+    blocks = {}
+    for name, value in vars(block).items():
+        if name in IGNORED_ATTRIBUTES:
+            continue
+
+        if isinstance(value, list) and value and _is_block(value[0]):
+            blocks[name] = [_block_structure(element, templates) for element in value]
+        elif _is_block(value):
+            blocks[name] = _block_structure(value, templates)
+        elif hasattr(value, "weight") and hasattr(value, "delay"):  # Synapse
+            synapses[name] = [float(value.weight), None if value.delay is None else float(value.delay)]
+        elif isinstance(value, list) and value and _is_population(value[0]) or _is_population(value):
+            continue
+        else:
+            attributes[name] = value.item() if isinstance(value, np.generic) else value
+
+    template = json.dumps([type(block).__module__, type(block).__qualname__, attributes, synapses], sort_keys=True)
+    index = templates.setdefault(template, len(templates))
+
+    return {"template": index, "blocks": blocks} if blocks else index
+
+
+def save_build(block, file_name):
+    """
+    Saves the netlist of a block built with a fresh Netlist into an .npz file. Consecutive populations with the same
+    dynamics are merged, as they would be pooled when the netlist is materialized. The structure of the block and the
+    neurons of each of its objects (by their path) are also saved, so the block can be connected after replaying it.
+
+    :param block: A spiking functional block built with a Netlist.
+    :param str file_name: Name of the file (including the .npz extension).
+    :return: None
+    """
+    netlist = block.sim
+
+    # Merge consecutive populations
+    specs = []
+    first_ids = []
+    for population in netlist.populations:
+        spec = _population_spec(population)
+        if specs and spec["name"] == specs[-1]["name"] and spec["initial_values"] == specs[-1]["initial_values"] and \
+                (spec["name"] == "SpikeSourceArray" or spec["params"] == specs[-1]["params"]):
+            if spec["name"] == "SpikeSourceArray":
+                specs[-1]["params"]["spike_times"] += spec["params"]["spike_times"]
+        else:
+            specs.append(spec)
+            first_ids.append(population.first_id)
+
+    # Neurons of each object of the block
+    paths = []
+    path_ids = []
+    for path, population in block_populations(block):
+        paths.append(path)
+        path_ids.append(population.ids)
+
+    # Structure of the block (classes, attributes and synapses of the block and its inner blocks)
+    templates = {}
+    root = _block_structure(block, templates)
+    structure = {"root": root, "templates": [json.loads(template) for template in templates],
+                 "global_params": block.global_params, "neuron_params": block.neuron_params,
+                 "std_conn": [float(block.std_conn.weight),
+                              None if block.std_conn.delay is None else float(block.std_conn.delay)]}
+
+    edges = netlist.edges()
+    np.savez(file_name, pre=edges["pre"], post=edges["post"], weight=edges["weight"], delay=edges["delay"],
+             receptor=edges["receptor"], first_ids=np.array(first_ids, dtype=np.int32),
+             total_neurons=np.array(netlist.total_neurons), paths=np.array(paths, dtype=str),
+             path_ids=np.concatenate(path_ids).astype(np.int32) if path_ids else np.zeros(0, dtype=np.int32),
+             path_offsets=np.cumsum([0] + [len(ids) for ids in path_ids]),
+             specs=np.array(json.dumps(specs)), structure=np.array(json.dumps(structure)))
+
+
+class CachedBlock:
+    """
+    This class defines a block replayed from the build cache. The structure of the original block is rebuilt without
+    creating any neuron or connection: every inner block is an instance of its class containing its attributes and the
+    replayed neurons. Every attribute and method not defined here (total_neurons, connect_data, get_output_neurons...)
+    is taken from the rebuilt block, so the replayed block can be connected and read as the original one. The neurons
+    can also be accessed through their path inside the block (for example,
+    "latches.latch_array[3].latch_sr.output_neuron").
+    """
+    def __init__(self, netlist, file_name):
+        """
+        Constructor of the class. The neurons and connections stored in the file are added to the netlist.
+
+        :param Netlist netlist: The netlist where the block is replayed.
+        :param str file_name: Name of the cache file.
+        """
+        # Storing parameters
+        self.sim = netlist
+
+        with np.load(file_name) as data:
+            offset = netlist.total_neurons
+            specs = json.loads(str(data["specs"]))
+            first_ids = data["first_ids"]
+            sizes = np.diff(np.append(first_ids, int(data["total_neurons"])))
+
+            # Create the neurons
+            self.populations = []
+            for spec, size in zip(specs, sizes):
+                celltype = NetlistCellType(spec["name"], spec["params"])
+                self.populations.append(netlist.Population(int(size), celltype,
+                                                           initial_values=spec["initial_values"] or None))
+
+            # Create the connections
+            netlist.add_connections(data["pre"] + offset, data["post"] + offset, data["weight"], data["delay"],
+                                    data["receptor"])
+
+            self._first_ids = first_ids + offset
+            self._paths = {str(path): index for index, path in enumerate(data["paths"])}
+            self._path_ids = data["path_ids"] + offset
+            self._path_offsets = data["path_offsets"]
+
+            # Population of each path and whether its neurons are consecutive (computed at once for all the paths)
+            starts = self._path_offsets[:-1]
+            ends = self._path_offsets[1:]
+            breaks = np.concatenate([[0], np.cumsum(np.diff(self._path_ids) != 1)])
+            self._path_populations = np.searchsorted(self._first_ids, self._path_ids[starts], side="right") - 1
+            self._path_consecutive = breaks[ends - 1] == breaks[starts]
+
+            # Rebuild the structure of the block
+            structure = json.loads(str(data["structure"]))
+            weight, delay = structure["std_conn"]
+            self._shared = {"sim": netlist, "global_params": structure["global_params"],
+                            "neuron_params": structure["neuron_params"],
+                            "std_conn": netlist.StaticSynapse(weight=weight, delay=delay)}
+            self._templates = [(self._block_class(module_name, qualname), attributes, synapses)
+                               for module_name, qualname, attributes, synapses in structure["templates"]]
+            self.block = self._rebuild(structure["root"])
+
+            for path in self._paths:
+                self._set_neurons(path)
+
+    def __getattr__(self, name):
+        block = self.__dict__.get("block")
+        if block is None:
+            raise AttributeError(name)
+        return getattr(block, name)
+
+    @staticmethod
+    def _block_class(module_name, qualname):
+        """
+        Gets a block class from the name of its module and its qualified name.
+        """
+        block_class = importlib.import_module(module_name)
+        for name in qualname.split("."):
+            block_class = getattr(block_class, name)
+        return block_class
+
+    def _rebuild(self, node):
+        """
+        Creates an inner block (without calling its constructor) from its description (see _block_structure).
+        """
+        index, blocks = (node, {}) if isinstance(node, int) else (node["template"], node["blocks"])
+        block_class, attributes, synapses = self._templates[index]
+
+        block = block_class.__new__(block_class)
+        vars(block).update(self._shared)
+        vars(block).update(attributes)
+        for name, (weight, delay) in synapses.items():
+            setattr(block, name, static_synapse(self.sim, weight, delay))
+        for name, value in blocks.items():
+            setattr(block, name, [self._rebuild(element) for element in value] if isinstance(value, list)
+                    else self._rebuild(value))
+
+        return block
+
+    def _set_neurons(self, path):
+        """
+        Stores the neurons of a path in the rebuilt block. The elements of lists are stored in order.
+        """
+        *parents, name = path.split(".")
+        obj = self.block
+        for parent in parents:
+            parent_name, index = _PATH_ELEMENT.fullmatch(parent).groups()
+            obj = getattr(obj, parent_name)
+            if index is not None:
+                obj = obj[int(index)]
+
+        name, index = _PATH_ELEMENT.fullmatch(name).groups()
+        if index is None:
+            setattr(obj, name, self.neurons(path))
+        else:
+            vars(obj).setdefault(name, []).append(self.neurons(path))
+
+    @property
+    def paths(self):
+        return list(self._paths.keys())
+
+    def neurons(self, path):
+        """
+        Gets the neurons of an object of the block.
+
+        :param str path: The path of the object inside the block (for example, "decoder.and_gates.and_array[0].output_neuron").
+        :return: A deferred population or view containing the neurons.
+        :rtype: NetlistPopulation, NetlistView
+        :raise KeyError: If the block does not contain the given path.
+        """
+        index = self._paths[path]
+        start, end = self._path_offsets[index], self._path_offsets[index + 1]
+
+        population = self.populations[self._path_populations[index]]
+        if population.size == end - start:
+            return population
+
+        if self._path_consecutive[index]:
+            first = int(self._path_ids[start]) - population.first_id
+            return self.sim.PopulationView(population, slice(first, first + int(end - start)))
+        return self.sim.PopulationView(population, self._path_ids[start:end] - population.first_id)
+
+
+def cached_build(cache_dir, block_class, *args, **kwargs):
+    """
+    Builds a block with a Netlist using an on-disk build cache. The first time a block is built with a set of
+    arguments, its netlist is compiled and saved into the cache directory. Later builds with the same arguments skip
+    the construction of the block and replay the saved netlist. The returned object has the same attributes and methods
+    as the block (see CachedBlock).
+
+    :param str cache_dir: The directory of the build cache. It is created if it does not exist.
+    :param type block_class: The class of the block (for example, NeuralMemory).
+    :param args: The positional arguments of the constructor. The simulator package must be a Netlist.
+    :param kwargs: The keyword arguments of the constructor.
+    :return: The replayed block.
+    :rtype: CachedBlock
+    :raise TypeError: If no Netlist is given as simulator package.
+    """
+    arguments = list(args) + list(kwargs.values())
+    netlist = next((arg for arg in arguments if isinstance(arg, Netlist)), None)
+    if netlist is None:
+        raise TypeError("The build cache requires a Netlist as simulator package")
+
+    file_name = os.path.join(cache_dir, block_class.__name__ + "_" + build_key(block_class, *args, **kwargs) + ".npz")
+
+    if not os.path.exists(file_name):
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # Build the block into a fresh netlist, replacing the given one
+        build_netlist = Netlist()
+        block = block_class(*[build_netlist if arg is netlist else arg for arg in args],
+                            **{key: build_netlist if value is netlist else value for key, value in kwargs.items()})
+
+        temp_file_name = file_name[:-4] + "." + str(os.getpid()) + ".npz"
+        save_build(block, temp_file_name)
+        os.replace(temp_file_name, file_name)
+
+    return CachedBlock(netlist, file_name)
@@ -1,5 +1,23 @@
+from functools import lru_cache, partial
+from weakref import WeakKeyDictionary, WeakValueDictionary
+
+from math import ceil
+
 import numpy as np
 
+from sPyBlocks.spike_bus import SpikeBus
+
+
+@lru_cache(maxsize=128)
+def _truth_table_indexes(n_values, n_var, select):
+    """
+    Computes the array of indices returned by truth_table_column. The value of the column n_var at row i is the bit
+    n_var of i, so the indices are obtained with a single vectorized bit test. Results are cached and read-only.
+    """
+    indexes = np.flatnonzero(((np.arange(n_values) >> n_var) & 1) == select)
+    indexes.flags.writeable = False
+    return indexes
+
 
 def truth_table_column(n_values, n_var, select=1):
     """
@@ -19,22 +37,7 @@ def truth_table_column(n_values, n_var, select=1):
     if select != 1 and select != 0:
         raise ValueError("Only binary values are allowed in the truth table")
 
-    numbers = range(0, n_values)
-
-    zeros = []
-    for i in numbers:
-        if i % (2 ** (n_var + 1)) == 0:
-            for j in range(i, i + 2 ** n_var):
-                if i >= n_values:
-                    break
-                zeros.append(i)
-                i += 1
-
-    if not select:
-        return zeros
-    else:
-        ones = np.delete(numbers, zeros)
-        return ones.tolist()
+    return _truth_table_indexes(int(n_values), int(n_var), int(select)).tolist()
 
 
 def is_pynn_object(obj, sim):
@@ -71,6 +74,61 @@ def inverse_rcp_type(rcp_type):
         raise ValueError("This receptor type is not supported")
 
 
+# Interned static synapses, indexed by simulator package and (weight, delay) pair
+_static_synapses = WeakKeyDictionary()
+
+
+def static_synapse(sim, weight, delay):
+    """
+    Gets a static synapse with the given weight and delay. Synapses are interned for each simulator, so the same
+    object is returned for the same (weight, delay) pair. This avoids creating a new synapse for each connection and
+    allows to group the connections with identical dynamics (see ProjectionBatch).
+
+    :param sim: The simulator package.
+    :param float weight: The weight of the synapse.
+    :param float delay: The delay of the synapse (ms). None uses the default delay of the simulator.
+    :return: The static synapse.
+    :rtype: sim.StaticSynapse
+    """
+    synapses = _static_synapses.get(sim)
+    if synapses is None:
+        synapses = {}
+        _static_synapses[sim] = synapses
+
+    key = (float(weight), None if delay is None else float(delay))
+    synapse = synapses.get(key)
+    if synapse is None:
+        synapse = sim.StaticSynapse(weight=weight, delay=delay)
+        synapses[key] = synapse
+
+    return synapse
+
+
+def clear_static_synapses(sim):
+    """
+    Forgets the static synapses interned for a simulator. It is called by clear_simulator_state when the simulator is
+    set up or ended.
+
+    :param sim: The simulator package.
+    :return: None
+    """
+    _static_synapses.pop(sim, None)
+
+
+def clear_simulator_state(sim):
+    """
+    Forgets all the objects kept by the library for a simulator, which are only valid for the network being built. It
+    is called by setup and end of the NumPy backend. With other simulators, it must be called after sim.end(), before
+    building a new network.
+
+    :param sim: The simulator package.
+    :return: None
+    """
+    clear_static_synapses(sim)
+    _projection_batches.pop(sim, None)
+    _delay_policies.pop(sim, None)
+
+
 def list_element(array, index_array):
     """
     Returns the elements of the input list found at the positions indicated by the indices contained in index_array[
@@ -85,12 +143,351 @@ def list_element(array, index_array):
     return array[index_array[0]]
 
 
+def neuron_indexes(obj):
+    """
+    Gets the neurons contained in a PyNN object as pairs of root population and indices inside that population. Views
+    are resolved to the population they were taken from, and assemblies are resolved element by element.
+
+    :param sim.Population, sim.PopulationView, sim.Assembly, SpikeBus obj: The PyNN object whose neurons are requested.
+    :return: A list of (population, indices) tuples, where indices is an array with the positions of the neurons of the object inside the population.
+    :rtype: list
+    """
+    if isinstance(obj, SpikeBus):
+        return [(obj.population, np.arange(obj.size))]
+    elif hasattr(obj, "populations"):  # Assembly
+        neurons = []
+        for population in obj.populations:
+            neurons += neuron_indexes(population)
+        return neurons
+    elif hasattr(obj, "grandparent"):  # PopulationView
+        return [(obj.grandparent, np.asarray(obj.index_in_grandparent(np.arange(obj.size))))]
+    else:  # Population
+        return [(obj, np.arange(obj.size))]
+
+
+class ProjectionBatch:
+    """
+    This class accumulates the connections requested through create_connections while it is active for a simulator,
+    and emits them as a reduced set of projections when it is flushed. All the connections sharing the same source
+    population, target population, synapse and receptor type are grouped into a single projection.
+    """
+    def __init__(self, sim):
+        """
+        Constructor of the class.
+
+        :param sim: The simulator package.
+        """
+        self.sim = sim
+        self.groups = {}
+
+        # Connection and projection amounts
+        self.total_connections = 0
+        self.total_projections = 0
+
+    def add(self, ini_obj, end_obj, conn, rcp_type):
+        """
+        Adds the OneToOne connections between the neurons of two PyNN objects to the batch.
+
+        :param sim.Population, sim.PopulationView, sim.Assembly, list ini_obj: The PyNN object that serves as input population, or its neurons as a list of (population, indices) tuples (see neuron_indexes).
+        :param sim.Population, sim.PopulationView, sim.Assembly, list end_obj: The PyNN object that serves as end population, or its neurons as a list of (population, indices) tuples (see neuron_indexes).
+        :param sim.StaticSynapse conn: The connection to use.
+        :param str rcp_type: A string indicating the receptor type of the connections (excitatory or inhibitory).
+        :return: None
+        :raise ValueError: If both objects do not contain the same number of neurons.
+        """
+        ini_neurons = ini_obj if isinstance(ini_obj, list) else neuron_indexes(ini_obj)
+        end_neurons = end_obj if isinstance(end_obj, list) else neuron_indexes(end_obj)
+
+        if sum(len(indexes) for _, indexes in ini_neurons) != sum(len(indexes) for _, indexes in end_neurons):
+            raise ValueError("The number of selected elements of ini_pop and end_pop must be the same in OneToOne connections")
+
+        # Single neuron objects are the usual case, so avoid building the full neuron lists for them
+        if len(ini_neurons) == 1 and len(end_neurons) == 1:
+            pairs = [(ini_neurons[0][0], end_neurons[0][0], ini_neurons[0][1], end_neurons[0][1])]
+        else:
+            ini_flat = [(pop, index) for pop, indexes in ini_neurons for index in indexes]
+            end_flat = [(pop, index) for pop, indexes in end_neurons for index in indexes]
+            pairs = [(ini_flat[i][0], end_flat[i][0], [ini_flat[i][1]], [end_flat[i][1]])
+                     for i in range(len(ini_flat))]
+
+        for ini_root, end_root, ini_indexes, end_indexes in pairs:
+            key = (id(ini_root), id(end_root), id(conn), rcp_type)
+            group = self.groups.get(key)
+            if group is None:
+                group = (ini_root, end_root, conn, rcp_type, [], [])
+                self.groups[key] = group
+
+            group[4].extend(int(index) for index in ini_indexes)
+            group[5].extend(int(index) for index in end_indexes)
+            self.total_connections += len(ini_indexes)
+
+    @staticmethod
+    def element_function(obj):
+        """
+        Gets a function that selects an element of a PyNN object like population_view does, but returning the neuron as
+        a (population, indices) tuple list (see neuron_indexes) instead of creating a view, as the batch only needs the
+        neurons of the connections.
+
+        :param sim.Population, sim.PopulationView, sim.Assembly obj: The PyNN object containing the elements.
+        :return: A function receiving the object and a list with the position of the element, like population_view.
+        :rtype: function
+        """
+        neurons = neuron_indexes(obj)
+        offsets = np.cumsum([len(indexes) for _, indexes in neurons])
+
+        def select(_, index_array):
+            index = int(index_array[0])
+            part = int(np.searchsorted(offsets, index, side="right"))
+            population, indexes = neurons[part]
+            position = index - int(offsets[part]) + len(indexes)
+            return [(population, indexes[position:position + 1])]
+
+        return select
+
+    def flush(self):
+        """
+        Creates the projections for all the connections accumulated in the batch and empties it. An AllToAllConnector
+        is used when the connections of a group cover all the possible pairs of its neurons, and a FromListConnector is
+        used otherwise.
+
+        :return: The number of projections that have been created.
+        :rtype: int
+        """
+        created_projections = 0
+
+        for ini_root, end_root, conn, rcp_type, ini_indexes, end_indexes in self.groups.values():
+            ini_indexes = np.array(ini_indexes)
+            end_indexes = np.array(end_indexes)
+            ini_unique = np.unique(ini_indexes)
+            end_unique = np.unique(end_indexes)
+            n_pairs = len(np.unique(ini_indexes * end_root.size + end_indexes))
+
+            if n_pairs == len(ini_indexes) == len(ini_unique) * len(end_unique):  # Dense group
+                ini_view = ini_root if len(ini_unique) == ini_root.size else self.sim.PopulationView(ini_root,
+                                                                                                    ini_unique)
+                end_view = end_root if len(end_unique) == end_root.size else self.sim.PopulationView(end_root,
+                                                                                                    end_unique)
+                self.sim.Projection(ini_view, end_view, self.sim.AllToAllConnector(), conn, receptor_type=rcp_type)
+            else:
+                conn_list = list(zip(ini_indexes.tolist(), end_indexes.tolist()))
+                self.sim.Projection(ini_root, end_root, self.sim.FromListConnector(conn_list), conn,
+                                    receptor_type=rcp_type)
+            created_projections += 1
+
+        self.groups = {}
+        self.total_projections += created_projections
+        return created_projections
+
+
+# Active projection batches, indexed by simulator package
+_projection_batches = {}
+
+
+def start_projection_batch(sim):
+    """
+    Starts the batched mode of create_connections for a simulator. From this moment, the connections are not projected
+    one by one but accumulated until flush_projection_batch is called. The returned connection amounts do not change.
+
+    :param sim: The simulator package.
+    :return: The batch that accumulates the connections.
+    :rtype: ProjectionBatch
+    :raise ValueError: If a batch is already active for the simulator.
+    """
+    if sim in _projection_batches:
+        raise ValueError("A projection batch is already active for this simulator")
+
+    batch = ProjectionBatch(sim)
+    _projection_batches[sim] = batch
+    return batch
+
+
+def flush_projection_batch(sim):
+    """
+    Ends the batched mode of create_connections for a simulator and creates all the accumulated projections. It must
+    be called before running the simulation.
+
+    :param sim: The simulator package.
+    :return: The number of projections that have been created.
+    :rtype: int
+    :raise ValueError: If there is no active batch for the simulator.
+    """
+    batch = _projection_batches.pop(sim, None)
+    if batch is None:
+        raise ValueError("There is no active projection batch for this simulator")
+
+    return batch.flush()
+
+
+class DelayPolicy:
+    """
+    This class splits the connections whose delay is longer than the maximum delay handled natively by the hardware
+    (commonly 16 timesteps in a SpiNNaker core, beyond which expensive delay extensions are needed) into chains of relay
+    neurons. Each relay neuron fires when it receives a spike, so a spike crosses a relay every max_delay milliseconds,
+    and the last relay of the chain is connected to the target with the remaining delay, the original weight and the
+    original receptor type. Relays must be built with neuron parameters that fire in the same timestep their input
+    arrives, like the idealized parameters of the blocks.
+
+    When the chains are shared, a single delay line is built for each source object and all its long-delay targets are
+    tapped from the relay whose firing time is closest to their delay, so the relays grow with the longest delay instead
+    of with the fan-out.
+
+    Delays are split in whole timesteps, as the simulator rounds them: the relays are max_delay (rounded down to the
+    timestep) milliseconds apart, and the remaining delay of the last connection is always between one timestep and
+    max_delay. The delay lines are only valid for the network being built, so the policy is removed when the simulator
+    is set up or ended (see clear_simulator_state) and must be set again for each new network.
+    """
+    def __init__(self, sim, neuron_params, max_delay=16.0, share=True, relay_weight=1.0, timestep=None):
+        """
+        Constructor of the class.
+
+        :param sim: The simulator package.
+        :param dict neuron_params: A dictionary of type str:int containing the neuron parameters of the relay neurons.
+        :param float max_delay: The longest delay (ms) allowed for a connection. 16.0 by default.
+        :param bool share: A boolean indicating whether or not to share a delay line among the targets of each source object. True by default.
+        :param float relay_weight: The weight of the connections between relays. 1.0 by default.
+        :param float timestep: The simulation timestep (ms). The timestep of the simulator by default (1.0 if it cannot be obtained).
+        :raise ValueError: If max_delay is shorter than the timestep.
+        """
+        if timestep is None:
+            timestep = sim.get_time_step() if hasattr(sim, "get_time_step") else 1.0
+
+        # Storing parameters
+        self.sim = sim
+        self.neuron_params = neuron_params
+        self.max_delay = max_delay
+        self.share = share
+        self.timestep = timestep
+
+        # Delay between consecutive relays, in timesteps
+        self.relay_steps = int(np.floor(max_delay / timestep + 1e-9))
+        if self.relay_steps < 1:
+            raise ValueError("The maximum delay must be equal to or greater than the timestep")
+        self.relay_conn = static_synapse(sim, relay_weight, self.relay_steps * timestep)
+
+        # Delay lines, indexed by the neurons of their source object
+        self.lines = {}
+
+        # Neuron and connection amounts
+        self.total_relays = 0
+        self.total_relay_connections = 0
+
+    def _line(self, ini_obj):
+        """
+        Gets the delay line of a source object, creating an empty one if it does not exist or if lines are not shared.
+        """
+        if not self.share:
+            return [ini_obj]
+
+        key = tuple((id(population), tuple(np.asarray(indexes).tolist()))
+                    for population, indexes in neuron_indexes(ini_obj))
+        line = self.lines.get(key)
+        if line is None:
+            line = [ini_obj]
+            self.lines[key] = line
+
+        return line
+
+    def connect(self, ini_obj, end_obj, conn, rcp_type):
+        """
+        Connects two PyNN objects OneToOne through a chain of relay neurons. The spikes arrive at the end object with
+        the delay of the connection.
+
+        :param sim.Population, sim.PopulationView, sim.Assembly ini_obj: The PyNN object that serves as input population.
+        :param sim.Population, sim.PopulationView, sim.Assembly end_obj: The PyNN object that serves as end population.
+        :param sim.StaticSynapse conn: The connection to use, whose delay is longer than max_delay.
+        :param str rcp_type: A string indicating the receptor type of the connections (excitatory or inhibitory).
+        :return: None
+        """
+        delay_steps = max(int(np.rint(conn.delay / self.timestep)), 1)
+        n_relays = ceil(delay_steps / self.relay_steps) - 1
+        line = self._line(ini_obj)
+
+        # Extend the line up to the required relay (element i of the line fires i * relay_steps timesteps after the
+        # source)
+        while len(line) <= n_relays:
+            relay = self.sim.Population(ini_obj.size, self.sim.IF_curr_exp(**self.neuron_params),
+                                        initial_values={'v': self.neuron_params["v_rest"]})
+            self.total_relay_connections += create_connections(line[-1], relay, self.sim, self.relay_conn,
+                                                               conn_all=False)
+            self.total_relays += relay.size
+            line.append(relay)
+
+        remaining_steps = delay_steps - n_relays * self.relay_steps
+        remaining_conn = static_synapse(self.sim, conn.weight, remaining_steps * self.timestep)
+        create_connections(line[n_relays], end_obj, self.sim, remaining_conn, conn_all=False, rcp_type=rcp_type)
+        self.total_relay_connections += end_obj.size
+
+
+# Active delay policies, indexed by simulator package
+_delay_policies = {}
+
+
+def set_delay_policy(sim, policy):
+    """
+    Sets the delay policy used by create_connections for a simulator. From this moment, the connections with a delay
+    longer than the maximum delay of the policy are split into chains of relay neurons. The returned connection amounts
+    do not change. The policy is removed when the simulator is set up or ended (see clear_simulator_state).
+
+    :param sim: The simulator package.
+    :param DelayPolicy policy: The delay policy, or None to connect all the delays natively again.
+    :return: The previous delay policy of the simulator, or None.
+    :rtype: DelayPolicy
+    """
+    previous_policy = _delay_policies.pop(sim, None)
+    if policy is not None:
+        _delay_policies[sim] = policy
+
+    return previous_policy
+
+
+# Cached population views, indexed by population and tuple of indices. Views are weakly referenced, as they keep their
+# population alive: an entry lasts while its view is used by a projection, and disappears with the network
+_population_views = WeakKeyDictionary()
+
+
+def population_view(population, index_array, sim):
+    """
+    Gets a view of the elements of a PyNN object found at the positions indicated by index_array. Views are cached for
+    each population while they are in use, so repeated connection endpoints reuse the same view instead of creating a
+    new PyNN object. The cache does not keep the views (nor their populations) alive once the network is released.
+
+    :param sim.Population, sim.PopulationView population: The PyNN object containing the elements.
+    :param list index_array: A list containing the positions of the elements to take in the PyNN object.
+    :param sim: The simulator package.
+    :return: A view containing the desired elements.
+    :rtype: sim.PopulationView
+    """
+    key = tuple(int(index) for index in index_array)
+
+    try:
+        views = _population_views.get(population)
+    except TypeError:  # The object cannot be weakly referenced
+        return sim.PopulationView(population, list(key))
+
+    if views is None:
+        views = WeakValueDictionary()
+        _population_views[population] = views
+
+    view = views.get(key)
+    if view is None:
+        view = sim.PopulationView(population, list(key))
+        try:
+            views[key] = view
+        except TypeError:  # The view cannot be weakly referenced
+            pass
+
+    return view
+
+
 def create_connections(ini_pop, end_pop, sim, conn, conn_all=True, rcp_type="excitatory", ini_pop_indexes=None,
                        end_pop_indexes=None):
     """
-    Creates connections between ini_pop and end_pop objects.
+    Creates connections between ini_pop and end_pop objects. If a projection batch is active for the simulator (see
+    start_projection_batch), the connections are accumulated in the batch instead of being projected one by one. If a
+    delay policy is set for the simulator (see set_delay_policy), the connections with long delays are split into
+    chains of relay neurons.
 
-    :param sim.Population, sim.PopulationView, sim.Assembly, list ini_pop: A PyNN object or a list of PyNN objects that serve as input population. Starting point of the connections.
+    :param sim.Population, sim.PopulationView, sim.Assembly, SpikeBus, list ini_pop: A PyNN object, a spike bus or a list of PyNN objects that serve as input population. Starting point of the connections.
     :param sim.Population, sim.PopulationView, sim.Assembly, list end_pop: A PyNN object or a list of PyNN objects that serve as end population. End point of the connections.
     :param sim: The simulator package.
     :param sim.StaticSynapse conn: The connection to use.
@@ -101,20 +498,24 @@ def create_connections(ini_pop, end_pop, sim, conn, conn_all=True, rcp_type="exc
     :return: The number of connections that have been created.
     :rtype: int
     """
+    # Spike buses are connected through their population, whose neurons are the channels
+    if isinstance(ini_pop, SpikeBus):
+        ini_pop = ini_pop.population
+
     # Check ini_pop and end_pop object types
     ini_pop_islist = isinstance(ini_pop, list)
     end_pop_islist = isinstance(end_pop, list)
 
     # Functions to access elements of ini_pop and end_pop and calculation of ini_pop and end_pop sizes
     if not ini_pop_islist:
-        ini_pop_function = sim.PopulationView
+        ini_pop_function = partial(population_view, sim=sim)
         ini_pop_size = ini_pop.size
     else:
         ini_pop_function = list_element
         ini_pop_size = len(ini_pop)
 
     if not end_pop_islist:
-        end_pop_function = sim.PopulationView
+        end_pop_function = partial(population_view, sim=sim)
         end_pop_size = end_pop.size
     else:
         end_pop_function = list_element
@@ -131,21 +532,38 @@ def create_connections(ini_pop, end_pop, sim, conn, conn_all=True, rcp_type="exc
     ini_pop_indexes_len = len(ini_pop_indexes)
     end_pop_indexes_len = len(end_pop_indexes)
 
+    # Projection function, which accumulates the connections instead of projecting them in batched mode, or splits
+    # them into relay chains when their delay is too long for the delay policy
+    batch = _projection_batches.get(sim)
+    policy = _delay_policies.get(sim)
+    if policy is not None and conn.delay is not None and conn.delay > policy.max_delay + 1e-9:
+        def project(ini_obj, end_obj):
+            policy.connect(ini_obj, end_obj, conn, rcp_type)
+    elif batch is None:
+        def project(ini_obj, end_obj):
+            sim.Projection(ini_obj, end_obj, sim.OneToOneConnector(), conn, receptor_type=rcp_type)
+    else:
+        def project(ini_obj, end_obj):
+            batch.add(ini_obj, end_obj, conn, rcp_type)
+
+        # The batch only needs the neurons of the connections, so no view is created for them
+        if not ini_pop_islist:
+            ini_pop_function = batch.element_function(ini_pop)
+        if not end_pop_islist:
+            end_pop_function = batch.element_function(end_pop)
+
     # Create connections
     if conn_all:  # AllToAll
         for i in ini_pop_indexes:
             for j in end_pop_indexes:
-                sim.Projection(ini_pop_function(ini_pop, [i]), end_pop_function(end_pop, [j]),
-                               sim.OneToOneConnector(), conn, receptor_type=rcp_type)
+                project(ini_pop_function(ini_pop, [i]), end_pop_function(end_pop, [j]))
         created_connections = ini_pop_indexes_len * end_pop_indexes_len
     else:  # OneToOne
         if ini_pop_indexes_len != end_pop_indexes_len:
             raise ValueError("The number of selected elements of ini_pop and end_pop must be the same in OneToOne connections")
 
         for i in range(ini_pop_indexes_len):  # It could be the length of end_pop_indexes too
-            sim.Projection(ini_pop_function(ini_pop, [ini_pop_indexes[i]]),
-                           end_pop_function(end_pop, [end_pop_indexes[i]]),
-                           sim.OneToOneConnector(), conn, receptor_type=rcp_type)
+            project(ini_pop_function(ini_pop, [ini_pop_indexes[i]]), end_pop_function(end_pop, [end_pop_indexes[i]]))
         created_connections = ini_pop_indexes_len
 
     return created_connections
@@ -207,17 +625,53 @@ def multiple_connect(function_name, population, components, conn, conn_all, rcp_
     return created_connections
 
 
-def flatten(array):
+def iter_flatten(array):
     """
-    Flats an array recursively.
+    Iterates over the elements of a nested list in order, without recursion.
 
     :param list array: An input array.
-    :return: The flattened input array.
-    :rtype: list
+    :return: A generator yielding all the elements of the input array that are not lists.
+    :rtype: generator
     """
-    if not array:
-        return array
-    if isinstance(array[0], list):
-        return flatten(array[0]) + flatten(array[1:])
-    return array[:1] + flatten(array[1:])
+    stack = [iter(array)]
+    while stack:
+        for element in stack[-1]:
+            if isinstance(element, list):
+                stack.append(iter(element))
+                break
+            yield element
+        else:
+            stack.pop()
+
 
+def flatten(array, output="list", sim=None):
+    """
+    Flats an array iteratively. The flattened array can also be returned as a single PyNN object, so that it can be
+    connected with one projection: an Assembly containing all its elements, or a PopulationView when all its elements
+    belong to the same population.
+
+    :param list array: An input array.
+    :param str output: A string indicating the type of the result ("list", "assembly" or "view"). "list" by default.
+    :param sim: The simulator package. Only needed when output is "assembly" or "view".
+    :return: The flattened input array.
+    :rtype: list, sim.Assembly, sim.PopulationView
+    :raise ValueError: If the output type is not supported, or if a view is requested for elements of different populations.
+    """
+    elements = list(iter_flatten(array))
+
+    if output == "list":
+        return elements
+
+    if sim is None:
+        raise ValueError("The simulator package is required to flatten into a PyNN object")
+
+    if output == "assembly":
+        return sim.Assembly(*elements)
+    elif output == "view":
+        neurons = [neuron for element in elements for neuron in neuron_indexes(element)]
+        populations = {id(population) for population, _ in neurons}
+        if len(populations) != 1:
+            raise ValueError("A view can only be created for elements of the same population")
+        return sim.PopulationView(neurons[0][0], np.concatenate([indexes for _, indexes in neurons]))
+    else:
+        raise ValueError("This output type is not supported")
@@ -0,0 +1,199 @@
+import inspect
+import zipfile
+
+import numpy as np
+
+from sPyBlocks.netlist import Netlist
+
+# Data types of the exported arrays
+CONNECTION_DTYPE = np.dtype([("pre", np.int32), ("post", np.int32), ("weight", np.float64), ("delay", np.float64),
+                             ("receptor", np.int8), ("block", np.int32)])
+NEURON_DTYPE = np.dtype([("id", np.int32), ("block", np.int32)])
+
+# Block attributes that are not part of the block structure
+IGNORED_ATTRIBUTES = ("sim", "global_params", "neuron_params", "std_conn")
+
+
+def netlist_copy(block, netlist=None):
+    """
+    Builds a copy of a block in a Netlist. The arguments of the constructor are read from the attributes of the block,
+    where every block stores them, so a block built with any simulator can be copied. The copy has the same neurons and
+    internal connections as the block, but not the connections made to its ports after building it.
+
+    :param block: A spiking functional block.
+    :param Netlist netlist: The netlist where the copy is built. A new netlist by default.
+    :return: A tuple (copy, netlist).
+    :rtype: tuple
+    :raise TypeError: If an argument of the constructor is not stored in the block.
+    """
+    if netlist is None:
+        netlist = Netlist()
+
+    arguments = {}
+    for name, parameter in inspect.signature(type(block).__init__).parameters.items():
+        if name == "self":
+            continue
+        elif name == "sim":
+            arguments[name] = netlist
+        elif name == "std_conn":
+            arguments[name] = netlist.StaticSynapse(weight=block.std_conn.weight, delay=block.std_conn.delay)
+        elif parameter.default is None:  # Existing PyNN objects to reuse (for example, output_neuron), created again
+            continue
+        elif hasattr(block, name):
+            arguments[name] = getattr(block, name)
+        else:
+            raise TypeError("The argument " + name + " of " + type(block).__name__ + " is not stored in the block")
+
+    return type(block)(**arguments), netlist
+
+
+def block_populations(block, path=""):
+    """
+    Walks the structure of a block built with a Netlist, yielding all the deferred populations and views it contains
+    together with their path inside the block (for example, "latches.latch_array[3].latch_sr.output_neuron"). Inner
+    blocks are yielded after the objects of their parent block.
+
+    :param block: A spiking functional block built with a Netlist.
+    :param str path: The path of the block. Empty by default.
+    :return: A generator yielding (path, population) tuples.
+    :rtype: generator
+    """
+    for name, value in vars(block).items():
+        if name in IGNORED_ATTRIBUTES:
+            continue
+
+        value_path = path + "." + name if path else name
+        values = [(value_path + "[" + str(i) + "]", element) for i, element in enumerate(value)] \
+            if isinstance(value, list) else [(value_path, value)]
+
+        for element_path, element in values:
+            if hasattr(element, "ids") and hasattr(element, "grandparent"):  # Deferred population or view
+                yield element_path, element
+            elif hasattr(element, "total_neurons") and not isinstance(element, type):  # Inner block
+                yield from block_populations(element, element_path)
+
+
+def block_neurons(block, netlist=None):
+    """
+    Gets the neurons of a block built with a Netlist and the path of the innermost block containing each of them.
+
+    :param block: A spiking functional block built with a Netlist.
+    :param Netlist netlist: The netlist used to build the block. The sim attribute of the block by default.
+    :return: A tuple (neuron ids, block indexes, block paths), where the block index of each neuron points to the array of block paths.
+    :rtype: tuple
+    :raise TypeError: If the block has not been built with a Netlist.
+    """
+    if netlist is None:
+        netlist = block.sim
+
+    neuron_block = np.full(getattr(netlist, "total_neurons", 0), -1, dtype=np.int32)
+    paths = {}
+
+    for path, population in block_populations(block):
+        block_path = path.rsplit(".", 1)[0] if "." in path else ""
+        neuron_block[population.ids] = paths.setdefault(block_path, len(paths))  # Inner blocks override their parents
+
+    if not paths:
+        raise TypeError("Connection export requires a block built with a Netlist")
+
+    ids = np.flatnonzero(neuron_block >= 0).astype(np.int32)
+
+    return ids, neuron_block[ids], np.array(list(paths.keys()))
+
+
+def block_connections(block, netlist=None):
+    """
+    Gets all the connections of a block as a structured array. The block of each connection is the innermost block
+    containing its end neuron (or its start neuron, if the end neuron is outside the block).
+
+    For a block built with a Netlist, this includes the internal connections of the block and the connections from or
+    to other objects of the netlist, and the neuron ids are those of the netlist. A block built with a simulator does not
+    keep its projections (and sPyNNaker only provides the connections of a projection after running), so it is copied
+    into a new Netlist (see netlist_copy): only its internal connections are included, and the neuron ids are those of
+    the copy.
+
+    :param block: A spiking functional block.
+    :param Netlist netlist: The netlist used to build the block. The sim attribute of the block by default.
+    :return: A tuple (connections, neurons, block paths) of NumPy arrays.
+    :rtype: tuple
+    """
+    if netlist is None:
+        netlist = block.sim
+        if not isinstance(netlist, Netlist):
+            block, netlist = netlist_copy(block)
+
+    ids, blocks, paths = block_neurons(block, netlist)
+    edges = netlist.edges()
+
+    neuron_block = np.full(netlist.total_neurons, -1, dtype=np.int32)
+    neuron_block[ids] = blocks
+
+    pre_block = neuron_block[edges["pre"]]
+    post_block = neuron_block[edges["post"]]
+    selection = np.flatnonzero((pre_block >= 0) | (post_block >= 0))
+
+    connections = np.empty(len(selection), dtype=CONNECTION_DTYPE)
+    for name in ("pre", "post", "weight", "delay", "receptor"):
+        connections[name] = edges[name][selection]
+    connections["block"] = np.where(post_block[selection] >= 0, post_block[selection], pre_block[selection])
+
+    neurons = np.empty(len(ids), dtype=NEURON_DTYPE)
+    neurons["id"] = ids
+    neurons["block"] = blocks
+
+    return connections, neurons, paths
+
+
+def export_connections(block, file_name, netlist=None):
+    """
+    Saves the full connectivity of a block into an uncompressed .npz file, which can be memory mapped by
+    load_connections (see block_connections for the blocks built with a simulator). The file contains three arrays:
+    "connections" (pre id, post id, weight, delay, receptor and block index of each connection), "neurons" (id and
+    block index of each neuron) and "blocks" (block paths).
+
+    :param block: A spiking functional block.
+    :param str file_name: Name of the file (the .npz extension is added if it is not included).
+    :param Netlist netlist: The netlist used to build the block. The sim attribute of the block by default.
+    :return: The number of connections that have been exported.
+    :rtype: int
+    """
+    connections, neurons, paths = block_connections(block, netlist)
+    np.savez(file_name, connections=connections, neurons=neurons, blocks=paths)
+
+    return len(connections)
+
+
+def load_connections(file_name, mmap=True):
+    """
+    Loads the connectivity saved by export_connections. The arrays are memory mapped by default, so loading is
+    independent of the size of the block.
+
+    :param str file_name: Name of the file (including the .npz extension).
+    :param bool mmap: A boolean indicating whether or not to memory map the arrays. True by default.
+    :return: A dictionary with the "connections", "neurons" and "blocks" arrays.
+    :rtype: dict
+    """
+    if not mmap:
+        with np.load(file_name) as data:
+            return {name: data[name] for name in data.files}
+
+    arrays = {}
+    with zipfile.ZipFile(file_name) as archive, open(file_name, "rb") as file:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError("Only uncompressed files can be memory mapped")
+
+            # Skip the local file header (30 bytes plus name and extra fields) and the .npy header
+            file.seek(info.header_offset + 26)
+            name_length, extra_length = np.frombuffer(file.read(4), dtype="<u2")
+            file.seek(info.header_offset + 30 + int(name_length) + int(extra_length))
+            version = np.lib.format.read_magic(file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+
+            arrays[info.filename[:-4]] = np.memmap(file_name, dtype=dtype, mode="r", offset=file.tell(),
+                                                   shape=shape, order="F" if fortran_order else "C")
+
+    return arrays
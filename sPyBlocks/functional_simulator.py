@@ -0,0 +1,421 @@
+import numpy as np
+
+from sPyBlocks.numpy_backend import IF_CURR_EXP_DEFAULTS
+
+# Recurrent components with up to this number of internal connections are stepped connection by connection, which is
+# faster than stepping them with NumPy operations
+SMALL_COMPONENT_CONNECTIONS = 256
+
+
+class FunctionalSimulator:
+    """
+    This class simulates a netlist as a circuit of boolean threshold gates with integer delays. It requires idealized
+    neuron parameters (time constants much shorter than the timestep and no refractory period), so that every neuron
+    fires in a timestep if and only if the weighted sum of the spikes arriving in that timestep reaches its threshold.
+    Under these conditions, the results are the same as those of the spiking simulation, without integrating the
+    membrane equations.
+
+    The neurons are evaluated level by level over whole chunks of time: neurons without feedback are evaluated for all
+    the timesteps of a chunk at once, SR latch neurons (a single neuron with an excitatory self-connection) are solved
+    as set/reset/hold sequences, and the rest of the recurrent components are stepped in groups of timesteps as long
+    as their shortest internal delay.
+    """
+    def __init__(self, netlist, timestep=1.0, tolerance=1e-3, chunk_size=1024):
+        """
+        Constructor of the class.
+
+        :param Netlist netlist: The netlist to simulate. Its spike sources provide the input spikes.
+        :param float timestep: The timestep (ms). 1.0 by default.
+        :param float tolerance: The largest decay factor of the membrane and synapses (per timestep) allowed to consider the neurons memoryless. 1e-3 by default.
+        :param int chunk_size: The number of timesteps evaluated at once. 1024 by default.
+        :raise ValueError: If the neuron parameters are not idealized or a delay is shorter than the timestep.
+        """
+        # Storing parameters
+        self.netlist = netlist
+        self.timestep = timestep
+        self.chunk_size = chunk_size - chunk_size % 8 if chunk_size >= 8 else 8
+
+        self.total_neurons = netlist.total_neurons
+        self._compile_neurons(tolerance)
+        self._compile_connections()
+        self._compile_levels()
+
+        self.current_step = 0
+        self.history = np.zeros((self.total_neurons, self.max_delay), dtype=np.uint8)
+        self.packed_spikes = np.zeros((self.total_neurons, 0), dtype=np.uint8)
+        self.total_steps = 0
+
+    # --- Compilation ---
+
+    def _compile_neurons(self, tolerance):
+        """
+        Computes the threshold of each neuron and the membrane potential change produced by a unitary weight of each
+        receptor type.
+        """
+        dt = self.timestep
+        n = self.total_neurons
+
+        params = {name: np.full(n, value, dtype=float) for name, value in IF_CURR_EXP_DEFAULTS.items()}
+        self.is_source = np.zeros(n, dtype=bool)
+        source_steps = []
+        source_ids = []
+
+        for population in self.netlist.populations:
+            ids = population.ids
+            if population.celltype.name == "SpikeSourceArray":
+                self.is_source[ids] = True
+                for neuron_id, times in zip(ids, self.netlist._spike_times(population)):
+                    steps = np.rint(np.asarray(times, dtype=float) / dt).astype(np.int64)
+                    source_steps.append(steps)
+                    source_ids.append(np.full(len(steps), neuron_id, dtype=np.int64))
+            elif population.celltype.name == "IF_curr_exp":
+                for name, value in population.celltype.params.items():
+                    params[name][ids] = value
+            else:
+                raise ValueError("The cell type " + population.celltype.name + " is not supported")
+
+        neurons = ~self.is_source
+        exp_tau_m = np.exp(-dt / params["tau_m"])
+        syn_decay = np.exp(-dt / np.array([params["tau_syn_E"], params["tau_syn_I"]]))
+        if np.any(exp_tau_m[neurons] > tolerance) or np.any(syn_decay[:, neurons] > tolerance):
+            raise ValueError("The functional simulation requires time constants much shorter than the timestep")
+        if np.any(np.ceil(np.round(params["tau_refrac"][neurons] / dt, 9)) > 0):
+            raise ValueError("The functional simulation requires neurons without refractory period")
+
+        # Membrane potential change of a unitary weight (excitatory and inhibitory) and threshold
+        gain = params["tau_m"] / params["cm"] * (1.0 - exp_tau_m)
+        syn_init = np.array([params["tau_syn_E"], params["tau_syn_I"]]) / dt * (1.0 - syn_decay)
+        self.unit_change = np.array([1.0, -1.0])[:, None] * syn_init * gain
+        self.threshold = np.where(neurons, params["v_thresh"] - params["v_rest"] - params["i_offset"] * gain, np.inf)
+
+        source_steps = np.concatenate(source_steps) if source_steps else np.zeros(0, dtype=np.int64)
+        source_ids = np.concatenate(source_ids) if source_ids else np.zeros(0, dtype=np.int64)
+        order = np.argsort(source_steps, kind="stable")
+        self.source_steps = source_steps[order]
+        self.source_ids = source_ids[order]
+
+    def _compile_connections(self):
+        """
+        Converts the connections of the netlist into membrane potential changes and integer delays.
+        """
+        edges = self.netlist.edges()
+        self.pre = edges["pre"].astype(np.int64)
+        self.post = edges["post"].astype(np.int64)
+        self.delay = np.rint(edges["delay"] / self.timestep).astype(np.int64)
+        self.change = edges["weight"] * self.unit_change[edges["receptor"], self.post]
+
+        if len(self.delay) and self.delay.min() < 1:
+            raise ValueError("The delays must be equal to or greater than the timestep")
+        if np.any(self.is_source[self.post]):
+            raise ValueError("Spike sources cannot receive connections")
+
+        self.max_delay = int(self.delay.max()) if len(self.delay) else 1
+
+    def _strongly_connected_components(self):
+        """
+        Gets the strongly connected component of each neuron (iterative Tarjan's algorithm). The components are
+        numbered in reverse topological order.
+        """
+        n = self.total_neurons
+        order = np.argsort(self.pre, kind="stable")
+        successors = self.post[order].tolist()
+        indptr = np.searchsorted(self.pre[order], np.arange(n + 1)).tolist()
+
+        index = [-1] * n
+        lowlink = [0] * n
+        on_stack = [False] * n
+        component = [-1] * n
+        stack = []
+        n_components = 0
+        counter = 0
+
+        for root in range(n):
+            if index[root] >= 0:
+                continue
+            work = [(root, indptr[root])]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+
+            while work:
+                node, position = work[-1]
+                if position < indptr[node + 1]:
+                    work[-1] = (node, position + 1)
+                    successor = successors[position]
+                    if index[successor] < 0:
+                        index[successor] = lowlink[successor] = counter
+                        counter += 1
+                        stack.append(successor)
+                        on_stack[successor] = True
+                        work.append((successor, indptr[successor]))
+                    elif on_stack[successor]:
+                        lowlink[node] = min(lowlink[node], index[successor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component[member] = n_components
+                            if member == node:
+                                break
+                        n_components += 1
+
+        return np.array(component, dtype=np.int64), n_components
+
+    def _compile_levels(self):
+        """
+        Groups the neurons into levels, so that the neurons of a level only receive external connections from lower
+        levels, and classifies them into gates, latches and stepped components.
+        """
+        component, n_components = self._strongly_connected_components()
+        internal = component[self.pre] == component[self.post]
+        component_size = np.bincount(component, minlength=n_components)
+
+        # Level of each component (components are numbered in reverse topological order, so the connections are
+        # processed from the first components to the last ones)
+        external = ~internal
+        pre_components = component[self.pre[external]]
+        post_components = component[self.post[external]]
+        order = np.argsort(-pre_components, kind="stable")
+        level = [0] * n_components
+        for pre_component, post_component in zip(pre_components[order].tolist(), post_components[order].tolist()):
+            level[post_component] = max(level[post_component], level[pre_component] + 1)
+        level = np.array(level, dtype=np.int64)
+
+        # Latches: single neurons whose internal connections are excitatory self-connections with the same delay
+        self_loop = internal & (component_size[component[self.post]] == 1)
+        latch = np.zeros(self.total_neurons, dtype=bool)
+        latch_delay = np.zeros(self.total_neurons, dtype=np.int64)
+        latch_change = np.zeros(self.total_neurons)
+        stepped = np.zeros(self.total_neurons, dtype=bool)
+
+        if np.any(self_loop):
+            loop_post = self.post[self_loop]
+            latch_change = np.bincount(loop_post, weights=self.change[self_loop], minlength=self.total_neurons)
+            min_delay = np.full(self.total_neurons, np.iinfo(np.int64).max)
+            max_delay = np.zeros(self.total_neurons, dtype=np.int64)
+            np.minimum.at(min_delay, loop_post, self.delay[self_loop])
+            np.maximum.at(max_delay, loop_post, self.delay[self_loop])
+
+            looped = np.zeros(self.total_neurons, dtype=bool)
+            looped[loop_post] = True
+            latch = looped & (min_delay == max_delay) & (latch_change >= 0)
+            latch_delay = np.where(latch, max_delay, 0)
+            stepped |= looped & ~latch
+
+        stepped |= component_size[component] > 1
+        stepped &= ~self.is_source
+
+        # Connections evaluated over whole chunks and connections evaluated step by step
+        neuron_level = level[component]
+        self.levels = []
+        for current_level in np.unique(neuron_level[~self.is_source]):
+            in_level = (neuron_level == current_level) & ~self.is_source
+            gates = np.flatnonzero(in_level & ~latch & ~stepped)
+            latches = np.flatnonzero(in_level & latch)
+            stepped_neurons = np.flatnonzero(in_level & stepped)
+
+            level_edges = in_level[self.post]
+            stepped_edges = level_edges & internal & stepped[self.post]
+            chunk_edges = level_edges & ~internal
+
+            nodes = np.concatenate([gates, latches, stepped_neurons])
+            self.levels.append({
+                "gates": gates, "latches": latches, "stepped": stepped_neurons, "nodes": nodes,
+                "latch_delay": latch_delay[latches], "latch_change": latch_change[latches],
+                "edges": self._edge_groups(np.flatnonzero(chunk_edges), nodes),
+                "stepped_edges": self._edge_groups(np.flatnonzero(stepped_edges), stepped_neurons),
+                "stepped_inputs": self._input_lists(np.flatnonzero(stepped_edges), stepped_neurons)
+                if np.count_nonzero(stepped_edges) <= SMALL_COMPONENT_CONNECTIONS else None,
+                "step_size": int(self.delay[stepped_edges].min()) if np.any(stepped_edges) else 1})
+
+    def _edge_groups(self, edge_indexes, nodes):
+        """
+        Groups a set of connections by delay and by their position among the connections of their end neuron, so that
+        every group contains at most one connection to each neuron and its inputs can be added without reductions.
+        """
+        local_index = np.full(self.total_neurons, -1, dtype=np.int64)
+        local_index[nodes] = np.arange(len(nodes))
+
+        groups = []
+        for delay in np.unique(self.delay[edge_indexes]):
+            selection = edge_indexes[self.delay[edge_indexes] == delay]
+            selection = selection[np.argsort(local_index[self.post[selection]], kind="stable")]
+            posts = local_index[self.post[selection]]
+            starts = np.flatnonzero(np.diff(posts, prepend=-1))
+            position = np.arange(len(posts)) - np.repeat(starts, np.diff(np.append(starts, len(posts))))
+
+            for k in range(position.max() + 1 if len(position) else 0):
+                in_group = position == k
+                groups.append((int(delay), self.pre[selection[in_group]], self.change[selection[in_group]][:, None],
+                               posts[in_group]))
+        return groups
+
+    def _input_lists(self, edge_indexes, nodes):
+        """
+        Gets the list of (start node, delay, membrane potential change) tuples of the connections arriving to each of
+        the given nodes, where start nodes are also given as positions in the list of nodes.
+        """
+        local_index = np.full(self.total_neurons, -1, dtype=np.int64)
+        local_index[nodes] = np.arange(len(nodes))
+
+        input_lists = [[] for _ in nodes]
+        for pre, post, delay, change in zip(local_index[self.pre[edge_indexes]].tolist(),
+                                            local_index[self.post[edge_indexes]].tolist(),
+                                            self.delay[edge_indexes].tolist(), self.change[edge_indexes].tolist()):
+            input_lists[post].append((pre, delay, change))
+        return input_lists
+
+    # --- Simulation ---
+
+    def _inputs(self, window, edge_groups, n_nodes, start, width):
+        """
+        Adds the membrane potential changes arriving to a set of neurons in the given timesteps of the window.
+        """
+        inputs = np.zeros((n_nodes, width))
+        for delay, pre, change, posts in edge_groups:
+            column = start - delay
+            inputs[posts] += window[pre, column:column + width] * change
+        return inputs
+
+    @staticmethod
+    def _step_small(rows, external_inputs, threshold, input_lists, offset):
+        """
+        Steps a small recurrent component timestep by timestep, returning the spikes of its neurons.
+        """
+        values = rows.tolist()
+        external_inputs = external_inputs.tolist()
+        threshold = threshold[:, 0].tolist()
+        nodes = range(len(values))
+
+        for step in range(external_inputs and len(external_inputs[0])):
+            t = offset + step
+            for node in nodes:
+                total_input = external_inputs[node][step]
+                for pre, delay, change in input_lists[node]:
+                    if values[pre][t - delay]:
+                        total_input += change
+                values[node][t] = total_input >= threshold[node]
+
+        return np.array(values, dtype=np.uint8)[:, offset:]
+
+    def _run_chunk(self, first_step, width):
+        """
+        Simulates a chunk of timesteps, returning the spikes of all the neurons.
+        """
+        offset = self.max_delay
+        window = np.zeros((self.total_neurons, offset + width), dtype=np.uint8)
+        window[:, :offset] = self.history
+
+        # Spike sources
+        source_start, source_end = np.searchsorted(self.source_steps, [first_step, first_step + width])
+        window[self.source_ids[source_start:source_end], offset + self.source_steps[source_start:source_end] -
+               first_step] = 1
+
+        for level in self.levels:
+            nodes = level["nodes"]
+            inputs = self._inputs(window, level["edges"], len(nodes), offset, width)
+            threshold = self.threshold[nodes][:, None]
+            n_gates = len(level["gates"])
+            n_latches = len(level["latches"])
+
+            # Gates
+            window[level["gates"], offset:] = inputs[:n_gates] >= threshold[:n_gates]
+
+            # Latches: set if the input reaches the threshold, reset if it does not even with the self-connection
+            if n_latches:
+                latch_inputs = inputs[n_gates:n_gates + n_latches]
+                latch_threshold = threshold[n_gates:n_gates + n_latches]
+                fires_off = latch_inputs >= latch_threshold
+                fires_on = latch_inputs + level["latch_change"][:, None] >= latch_threshold
+                for delay in np.unique(level["latch_delay"]):
+                    rows = np.flatnonzero(level["latch_delay"] == delay)
+                    for residue in range(delay):
+                        columns = np.arange(residue, width, delay)
+                        decided = fires_off[rows][:, columns] | ~fires_on[rows][:, columns]
+                        last_decided = np.where(decided, np.arange(len(columns)), -1)
+                        np.maximum.accumulate(last_decided, axis=1, out=last_decided)
+                        carry = window[level["latches"][rows], offset + residue - delay]
+                        values = np.take_along_axis(fires_off[rows][:, columns], np.maximum(last_decided, 0), axis=1)
+                        values = np.where(last_decided >= 0, values, carry[:, None])
+                        window[level["latches"][rows][:, None], offset + columns] = values
+
+            # Recurrent components, stepped in groups of timesteps as long as their shortest internal delay
+            stepped = level["stepped"]
+            if len(stepped):
+                stepped_inputs = inputs[n_gates + n_latches:]
+                stepped_threshold = threshold[n_gates + n_latches:]
+                if level["stepped_inputs"] is not None:
+                    window[stepped, offset:] = self._step_small(window[stepped], stepped_inputs, stepped_threshold,
+                                                                level["stepped_inputs"], offset)
+                else:
+                    step_size = level["step_size"]
+                    for start in range(0, width, step_size):
+                        end = min(start + step_size, width)
+                        internal_inputs = self._inputs(window, level["stepped_edges"], len(stepped), offset + start,
+                                                       end - start)
+                        window[stepped, offset + start:offset + end] = \
+                            stepped_inputs[:, start:end] + internal_inputs >= stepped_threshold
+
+        self.history = window[:, width:].copy()
+        return window[:, offset:]
+
+    def run(self, simtime):
+        """
+        Runs the simulation for the given time, continuing from the end of the previous run.
+
+        :param float simtime: The simulation time (ms).
+        :return: The spikes of all the neurons in the simulated timesteps, packed in bits along the time axis (see np.packbits).
+        :rtype: np.ndarray
+        """
+        n_steps = int(round(simtime / self.timestep))
+        packed_chunks = []
+
+        for start in range(0, n_steps, self.chunk_size):
+            width = min(self.chunk_size, n_steps - start)
+            packed_chunks.append(np.packbits(self._run_chunk(self.current_step + start, width), axis=1))
+
+        packed_spikes = np.concatenate(packed_chunks, axis=1) if packed_chunks else \
+            np.zeros((self.total_neurons, 0), dtype=np.uint8)
+
+        # Append to the spikes of previous runs, which end at a multiple of 8 timesteps except for the last one
+        if self.total_steps % 8:
+            all_spikes = np.concatenate([self.spike_matrix().T, np.unpackbits(packed_spikes, axis=1,
+                                                                              count=n_steps).astype(bool)], axis=1)
+            self.packed_spikes = np.packbits(all_spikes, axis=1)
+        else:
+            self.packed_spikes = np.concatenate([self.packed_spikes, packed_spikes], axis=1)
+
+        self.current_step += n_steps
+        self.total_steps += n_steps
+        return packed_spikes
+
+    # --- Results ---
+
+    def spike_matrix(self, obj=None):
+        """
+        Gets the spikes of the neurons of a deferred population, view or assembly as a boolean matrix.
+
+        :param obj: A deferred population, view or assembly of the netlist. All the neurons by default.
+        :return: A boolean matrix with a row for each timestep and a column for each neuron.
+        :rtype: np.ndarray
+        """
+        packed_spikes = self.packed_spikes if obj is None else self.packed_spikes[obj.ids]
+        return np.unpackbits(packed_spikes, axis=1, count=self.total_steps).astype(bool).T
+
+    def spike_times(self, obj):
+        """
+        Gets the spike times of the neurons of a deferred population, view or assembly, in the same format as the
+        spiketrains of the spiking simulators.
+
+        :param obj: A deferred population, view or assembly of the netlist.
+        :return: A list containing an array of spike times (ms) for each neuron.
+        :rtype: list
+        """
+        spikes = self.spike_matrix(obj)
+        return [np.flatnonzero(spikes[:, i]) * self.timestep for i in range(spikes.shape[1])]
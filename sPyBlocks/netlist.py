@@ -0,0 +1,586 @@
+import numpy as np
+
+# Receptor types, indexed by the receptor codes stored in the netlist
+RECEPTOR_TYPES = ("excitatory", "inhibitory")
+
+
+class NetlistCellType:
+    """
+    This class defines a deferred cell type, which only stores the name and the parameters of the PyNN cell type to
+    create when the netlist is materialized.
+    """
+    def __init__(self, name, params):
+        """
+        Constructor of the class.
+
+        :param str name: The name of the PyNN cell type (IF_curr_exp or SpikeSourceArray).
+        :param dict params: A dictionary containing the parameters of the cell type.
+        """
+        self.name = name
+        self.params = params
+
+
+class NetlistSynapse:
+    """
+    This class defines a deferred static synapse.
+    """
+    def __init__(self, weight=0.0, delay=None):
+        """
+        Constructor of the class.
+
+        :param float weight: The weight of the synapse.
+        :param float delay: The delay of the synapse (ms).
+        """
+        self.weight = weight
+        self.delay = delay
+
+
+class NetlistConnector:
+    """
+    This class defines a deferred connector (OneToOne, AllToAll or FromList).
+    """
+    def __init__(self, name, conn_list=None, allow_self_connections=True):
+        """
+        Constructor of the class.
+
+        :param str name: The name of the PyNN connector (OneToOneConnector, AllToAllConnector or FromListConnector).
+        :param list conn_list: A list of (pre index, post index[, weight, delay]) tuples. Only used by FromListConnector.
+        :param bool allow_self_connections: Whether or not to connect a neuron with itself. Only used by AllToAllConnector.
+        """
+        self.name = name
+        self.conn_list = conn_list
+        self.allow_self_connections = allow_self_connections
+
+
+class NetlistPopulation:
+    """
+    This class defines a deferred population, a set of consecutive neuron identifiers of a netlist. Once the netlist is
+    materialized, every attribute not defined here is taken from the simulator object representing the population.
+    """
+    def __init__(self, netlist, first_id, size, celltype, initial_values=None, label=None):
+        """
+        Constructor of the class.
+
+        :param Netlist netlist: The netlist containing the population.
+        :param int first_id: The identifier of the first neuron of the population inside the netlist.
+        :param int size: The number of neurons of the population.
+        :param NetlistCellType celltype: The cell type of the neurons.
+        :param dict initial_values: A dictionary containing the initial values of the state variables of the neurons.
+        :param str label: The label of the population.
+        """
+        self.netlist = netlist
+        self.first_id = first_id
+        self.size = size
+        self.celltype = celltype
+        self.initial_values = initial_values if initial_values is not None else {}
+        self.label = label
+
+        # Simulator objects, available once the netlist is materialized
+        self.recorded_variables = []
+        self.pool = None
+        self.pool_offset = 0
+        self.real_view = None
+
+    @property
+    def ids(self):
+        """
+        Gets the netlist identifiers of the neurons of the population.
+
+        :return: An array containing the identifiers.
+        :rtype: np.ndarray
+        """
+        return np.arange(self.first_id, self.first_id + self.size)
+
+    @property
+    def grandparent(self):
+        return self
+
+    def index_in_grandparent(self, indices):
+        return np.asarray(indices)
+
+    def record(self, variables, **kwargs):
+        """
+        Records the given variables of the neurons of the population. If the netlist is not materialized yet, the
+        recording is applied when it is.
+
+        :param variables: A string or a tuple of strings with the names of the variables to record.
+        :return: None
+        """
+        if self.real_view is not None:
+            self.real_view.record(variables, **kwargs)
+        else:
+            self.recorded_variables.append((variables, kwargs))
+
+    def __getattr__(self, name):
+        real_view = self.__dict__.get("real_view")
+        if real_view is None:
+            if name.startswith("__"):
+                raise AttributeError(name)
+            raise AttributeError("'" + name + "' is not available until the netlist is materialized")
+        return getattr(real_view, name)
+
+
+class NetlistView:
+    """
+    This class defines a deferred population view, a subset of the neurons of a deferred population.
+    """
+    def __init__(self, parent, selector, label=None):
+        """
+        Constructor of the class.
+
+        :param NetlistPopulation, NetlistView parent: The population or view containing the selected neurons.
+        :param selector: A list, array, slice or int used to select neurons from the parent.
+        :param str label: The label of the view.
+        """
+        self.parent = parent
+        if isinstance(selector, slice):  # Without indexing the whole parent
+            self.mask = np.arange(*selector.indices(parent.size))
+        else:
+            self.mask = np.atleast_1d(np.arange(parent.size)[selector])
+        self.size = len(self.mask)
+        self.label = label
+        self.real_view = None
+
+    @property
+    def grandparent(self):
+        return self.parent.grandparent
+
+    @property
+    def netlist(self):
+        return self.grandparent.netlist
+
+    @property
+    def ids(self):
+        """
+        Gets the netlist identifiers of the neurons of the view.
+
+        :return: An array containing the identifiers.
+        :rtype: np.ndarray
+        """
+        return self.parent.ids[self.mask]
+
+    def index_in_grandparent(self, indices):
+        return self.parent.index_in_grandparent(self.mask[indices])
+
+    def record(self, variables, **kwargs):
+        """
+        Records the given variables of the neurons of the view. If the netlist is not materialized yet, the whole
+        population containing the view is recorded when it is.
+
+        :param variables: A string or a tuple of strings with the names of the variables to record.
+        :return: None
+        """
+        if self.netlist.materialized:
+            self._get_real_view().record(variables, **kwargs)
+        else:
+            self.grandparent.record(variables, **kwargs)
+
+    def _get_real_view(self):
+        """
+        Gets the simulator view containing the neurons of the view, creating it the first time it is requested.
+        """
+        if self.real_view is None:
+            grandparent = self.grandparent
+            if grandparent.pool is None:
+                return None
+            indexes = grandparent.pool_offset + self.index_in_grandparent(np.arange(self.size))
+            self.real_view = grandparent.netlist.sim.PopulationView(grandparent.pool, indexes)
+        return self.real_view
+
+    def __getattr__(self, name):
+        if "parent" not in self.__dict__:
+            raise AttributeError(name)
+        real_view = self._get_real_view()
+        if real_view is None:
+            raise AttributeError("'" + name + "' is not available until the netlist is materialized")
+        return getattr(real_view, name)
+
+
+class NetlistAssembly:
+    """
+    This class defines a deferred assembly, an ordered group of deferred populations and views.
+    """
+    def __init__(self, *populations):
+        """
+        Constructor of the class.
+
+        :param populations: The deferred populations and views to group.
+        """
+        self.populations = list(populations)
+        self.size = sum(population.size for population in self.populations)
+
+    @property
+    def ids(self):
+        return np.concatenate([population.ids for population in self.populations])
+
+
+class Netlist:
+    """
+    This class defines a deferred network builder. It can be used as the simulator package of any block: neurons and
+    connections are recorded into compact NumPy arrays instead of being created in the simulator, and a single call to
+    materialize emits the minimal set of populations and projections, paying the network construction cost only once.
+    """
+    # PyNN objects that do not need access to the netlist
+    PopulationView = NetlistView
+    Assembly = NetlistAssembly
+    StaticSynapse = NetlistSynapse
+
+    def __init__(self, sim=None):
+        """
+        Constructor of the class.
+
+        :param sim: The simulator package used to materialize the netlist. It can be None to build the netlist without a simulator (for example, to analyse it).
+        """
+        self.sim = sim
+        self.materialized = False
+
+        # Neurons
+        self.populations = []
+        self.total_neurons = 0
+
+        # Connections, stored as chunks that are concatenated on demand
+        self._chunks = {"pre": [], "post": [], "weight": [], "delay": [], "receptor": []}
+        self._edges = None
+        self.total_projections = 0
+
+        # Simulator objects created by materialize
+        self.real_populations = []
+        self.real_projections = []
+
+    def __getattr__(self, name):
+        sim = self.__dict__.get("sim")
+        if sim is None:
+            raise AttributeError("The netlist has no simulator to provide '" + name + "'")
+        return getattr(sim, name)
+
+    # --- PyNN surface ---
+
+    def IF_curr_exp(self, **params):
+        return NetlistCellType("IF_curr_exp", params)
+
+    def SpikeSourceArray(self, spike_times=None):
+        return NetlistCellType("SpikeSourceArray", {"spike_times": [] if spike_times is None else spike_times})
+
+    def OneToOneConnector(self):
+        return NetlistConnector("OneToOneConnector")
+
+    def AllToAllConnector(self, allow_self_connections=True):
+        return NetlistConnector("AllToAllConnector", allow_self_connections=allow_self_connections)
+
+    def FromListConnector(self, conn_list, column_names=None):
+        return NetlistConnector("FromListConnector", conn_list=conn_list)
+
+    def Population(self, size, cellclass, cellparams=None, initial_values=None, label=None):
+        """
+        Records a new population in the netlist.
+
+        :param int size: The number of neurons of the population.
+        :param NetlistCellType cellclass: The cell type of the neurons.
+        :param cellparams: Unused.
+        :param dict initial_values: A dictionary containing the initial values of the state variables of the neurons.
+        :param str label: The label of the population.
+        :return: The deferred population.
+        :rtype: NetlistPopulation
+        :raise RuntimeError: If the netlist has already been materialized.
+        """
+        if self.materialized:
+            raise RuntimeError("Populations cannot be added to a materialized netlist")
+
+        population = NetlistPopulation(self, self.total_neurons, size, cellclass, initial_values, label)
+        self.populations.append(population)
+        self.total_neurons += size
+
+        return population
+
+    def Projection(self, presynaptic_population, postsynaptic_population, connector, synapse_type=None,
+                   receptor_type="excitatory"):
+        """
+        Records the connections defined by a projection in the netlist.
+
+        :param presynaptic_population: The deferred population, view or assembly that serves as input population.
+        :param postsynaptic_population: The deferred population, view or assembly that serves as end population.
+        :param NetlistConnector connector: The connector defining the connections.
+        :param synapse_type: The synapse to use (any object with weight and delay attributes).
+        :param str receptor_type: A string indicating the receptor type of the connections (excitatory or inhibitory).
+        :return: The number of connections that have been recorded.
+        :rtype: int
+        :raise RuntimeError: If the netlist has already been materialized.
+        :raise ValueError: If the connector is not supported or OneToOne populations have different sizes.
+        """
+        if self.materialized:
+            raise RuntimeError("Projections cannot be added to a materialized netlist")
+
+        if synapse_type is None:
+            synapse_type = NetlistSynapse()
+
+        pre_ids = presynaptic_population.ids
+        post_ids = postsynaptic_population.ids
+        weight = synapse_type.weight
+        delay = synapse_type.delay if synapse_type.delay is not None else 1.0
+
+        if connector.name == "OneToOneConnector":
+            if len(pre_ids) != len(post_ids):
+                raise ValueError("OneToOne projections require populations of the same size")
+            pre, post = pre_ids, post_ids
+        elif connector.name == "AllToAllConnector":
+            pre = np.repeat(pre_ids, len(post_ids))
+            post = np.tile(post_ids, len(pre_ids))
+            if not connector.allow_self_connections:
+                not_self = pre != post
+                pre, post = pre[not_self], post[not_self]
+        elif connector.name == "FromListConnector":
+            conn_array = np.array(connector.conn_list, dtype=float).reshape(len(connector.conn_list), -1)
+            pre = pre_ids[conn_array[:, 0].astype(int)]
+            post = post_ids[conn_array[:, 1].astype(int)]
+            if conn_array.shape[1] >= 4:
+                weight = conn_array[:, 2]
+                delay = conn_array[:, 3]
+        else:
+            raise ValueError("This connector is not supported by the netlist")
+
+        n_connections = self.add_connections(pre, post, weight, delay, RECEPTOR_TYPES.index(receptor_type))
+        self.total_projections += 1
+
+        return n_connections
+
+    def add_connections(self, pre, post, weight, delay, receptor):
+        """
+        Records a set of connections between neurons of the netlist.
+
+        :param pre: An array containing the netlist identifiers of the start neurons.
+        :param post: An array containing the netlist identifiers of the end neurons.
+        :param weight: The weight of the connections (a single value or an array).
+        :param delay: The delay of the connections (a single value or an array).
+        :param receptor: The receptor code of the connections (0 is excitatory and 1 is inhibitory). A single value or an array.
+        :return: The number of connections that have been recorded.
+        :rtype: int
+        :raise RuntimeError: If the netlist has already been materialized.
+        """
+        if self.materialized:
+            raise RuntimeError("Connections cannot be added to a materialized netlist")
+
+        n_connections = len(pre)
+        self._chunks["pre"].append(np.asarray(pre, dtype=np.int32))
+        self._chunks["post"].append(np.asarray(post, dtype=np.int32))
+        self._chunks["weight"].append(np.broadcast_to(np.asarray(weight, dtype=np.float64), (n_connections,)))
+        self._chunks["delay"].append(np.broadcast_to(np.asarray(delay, dtype=np.float64), (n_connections,)))
+        self._chunks["receptor"].append(np.broadcast_to(np.asarray(receptor, dtype=np.int8), (n_connections,)))
+        self._edges = None
+
+        return n_connections
+
+    # --- Netlist contents ---
+
+    def edges(self):
+        """
+        Gets all the connections recorded in the netlist as NumPy arrays.
+
+        :return: A dictionary with the "pre", "post", "weight", "delay" and "receptor" arrays (receptor 0 is excitatory and 1 is inhibitory).
+        :rtype: dict
+        """
+        if self._edges is None:
+            self._edges = {}
+            for name, chunks in self._chunks.items():
+                if chunks:
+                    self._edges[name] = np.concatenate(chunks)
+                else:
+                    self._edges[name] = np.zeros(0, dtype=np.float64 if name in ("weight", "delay") else np.int32)
+            self._chunks = {name: [array] for name, array in self._edges.items()}
+
+        return self._edges
+
+    @property
+    def total_connections(self):
+        return len(self.edges()["pre"])
+
+    def _parallel_groups(self):
+        """
+        Sorts the connections of the netlist by (pre, post, receptor, delay), returning the sort order, the index of the
+        group of each sorted connection and the start position of each group.
+        """
+        edges = self.edges()
+        order = np.lexsort((edges["delay"], edges["receptor"], edges["post"], edges["pre"]))
+
+        new_group = np.ones(len(order), dtype=bool)
+        for name in ("pre", "post", "receptor", "delay"):
+            values = edges[name][order]
+            new_group[1:] &= values[1:] == values[:-1]
+        new_group[1:] = ~new_group[1:]
+
+        starts = np.flatnonzero(new_group)
+        return order, np.cumsum(new_group) - 1, starts
+
+    def parallel_synapses(self):
+        """
+        Finds the parallel synapses of the netlist, that is, the connections between the same pair of neurons with the
+        same receptor type and delay.
+
+        :return: A dictionary with the "pre", "post", "receptor", "delay", "count" and "weight" (summed weight) arrays, with an element for each group of parallel synapses.
+        :rtype: dict
+        """
+        edges = self.edges()
+        order, groups, starts = self._parallel_groups()
+
+        counts = np.diff(np.append(starts, len(order)))
+        weights = np.bincount(groups, weights=edges["weight"][order], minlength=len(starts))
+        parallel = counts > 1
+        first = order[starts[parallel]]
+
+        return {"pre": edges["pre"][first], "post": edges["post"][first], "receptor": edges["receptor"][first],
+                "delay": edges["delay"][first], "count": counts[parallel], "weight": weights[parallel]}
+
+    def merge_parallel_synapses(self):
+        """
+        Merges the parallel synapses of the netlist into a single connection whose weight is the sum of their weights.
+        Synapses arriving at the same time to the same receptor are added by the neuron, so the behavior of the network
+        does not change, but the synaptic rows are shorter. The connection amounts of the blocks are not modified.
+
+        :return: The number of connections that have been removed.
+        :rtype: int
+        :raise RuntimeError: If the netlist has already been materialized.
+        """
+        if self.materialized:
+            raise RuntimeError("Connections of a materialized netlist cannot be merged")
+
+        edges = self.edges()
+        order, groups, starts = self._parallel_groups()
+        removed_connections = len(order) - len(starts)
+
+        if removed_connections:
+            first = order[starts]
+            merged_edges = {name: edges[name][first] for name in ("pre", "post", "delay", "receptor")}
+            merged_edges["weight"] = np.bincount(groups, weights=edges["weight"][order], minlength=len(starts))
+
+            self._edges = None
+            self._chunks = {name: [merged_edges[name]] for name in self._chunks}
+
+        return removed_connections
+
+    def population_of(self, neuron_ids):
+        """
+        Gets the index of the population of the netlist containing each of the given neurons.
+
+        :param neuron_ids: An array containing netlist identifiers.
+        :return: An array containing population indexes.
+        :rtype: np.ndarray
+        """
+        first_ids = np.array([population.first_id for population in self.populations])
+        return np.searchsorted(first_ids, neuron_ids, side="right") - 1
+
+    @staticmethod
+    def pool_key(population):
+        """
+        Gets the key used to group populations with the same dynamics into a single simulator population when the
+        netlist is materialized.
+
+        :param NetlistPopulation population: The deferred population.
+        :return: A hashable tuple, equal for the populations that share a pool.
+        :rtype: tuple
+        """
+        celltype = population.celltype
+        if celltype.name == "SpikeSourceArray":
+            return celltype.name,
+        return (celltype.name, tuple(sorted(celltype.params.items())),
+                tuple(sorted(population.initial_values.items())))
+
+    @staticmethod
+    def _spike_times(population):
+        """
+        Gets the list of spike times of each neuron of a spike source population.
+        """
+        spike_times = population.celltype.params["spike_times"]
+        spike_times = list(spike_times)
+        if spike_times and np.ndim(spike_times[0]) > 0:  # A list of spike times for each neuron
+            return [list(times) for times in spike_times]
+        return [spike_times] * population.size
+
+    def materialize(self):
+        """
+        Creates the simulator populations and projections for all the neurons and connections recorded in the netlist.
+        Populations with the same cell type, parameters and initial values are pooled together, and all the
+        connections between two pools with the same receptor type are emitted as a single projection.
+
+        :return: The number of projections that have been created.
+        :rtype: int
+        :raise RuntimeError: If the netlist has no simulator or has already been materialized.
+        """
+        if self.sim is None:
+            raise RuntimeError("A simulator is required to materialize the netlist")
+        if self.materialized:
+            raise RuntimeError("The netlist has already been materialized")
+
+        sim = self.sim
+
+        # Group populations into pools
+        pools = {}
+        for population in self.populations:
+            pools.setdefault(self.pool_key(population), []).append(population)
+
+        neuron_pool = np.zeros(self.total_neurons, dtype=np.int32)
+        neuron_index = np.zeros(self.total_neurons, dtype=np.int32)
+
+        for pool_index, members in enumerate(pools.values()):
+            pool_size = sum(population.size for population in members)
+            celltype = members[0].celltype
+
+            if celltype.name == "SpikeSourceArray":
+                spike_times = []
+                for population in members:
+                    spike_times += self._spike_times(population)
+                pool = sim.Population(pool_size, sim.SpikeSourceArray(spike_times=spike_times))
+            else:
+                pool = sim.Population(pool_size, getattr(sim, celltype.name)(**celltype.params),
+                                      initial_values=members[0].initial_values or None)
+            self.real_populations.append(pool)
+
+            offset = 0
+            for population in members:
+                population.pool = pool
+                population.pool_offset = offset
+                if population.size == pool_size:
+                    population.real_view = pool
+                else:
+                    population.real_view = sim.PopulationView(pool, list(range(offset, offset + population.size)))
+
+                neuron_pool[population.ids] = pool_index
+                neuron_index[population.ids] = np.arange(offset, offset + population.size)
+                offset += population.size
+
+        # Group connections into projections
+        edges = self.edges()
+        created_projections = 0
+
+        if len(edges["pre"]):
+            pre_pool = neuron_pool[edges["pre"]]
+            post_pool = neuron_pool[edges["post"]]
+            n_pools = len(self.real_populations)
+            group_key = (pre_pool.astype(np.int64) * n_pools + post_pool) * len(RECEPTOR_TYPES) + edges["receptor"]
+
+            order = np.argsort(group_key, kind="stable")
+            keys, starts = np.unique(group_key[order], return_index=True)
+            ends = np.append(starts[1:], len(order))
+
+            for key, start, end in zip(keys, starts, ends):
+                selection = order[start:end]
+                conn_list = np.column_stack([neuron_index[edges["pre"][selection]],
+                                             neuron_index[edges["post"][selection]],
+                                             edges["weight"][selection], edges["delay"][selection]])
+                receptor = int(key % len(RECEPTOR_TYPES))
+                pools_key = key // len(RECEPTOR_TYPES)
+
+                projection = sim.Projection(self.real_populations[pools_key // n_pools],
+                                            self.real_populations[pools_key % n_pools],
+                                            sim.FromListConnector(conn_list.tolist()),
+                                            receptor_type=RECEPTOR_TYPES[receptor])
+                self.real_projections.append(projection)
+                created_projections += 1
+
+        self.materialized = True
+
+        # Deferred recordings
+        for population in self.populations:
+            for variables, kwargs in population.recorded_variables:
+                population.real_view.record(variables, **kwargs)
+            population.recorded_variables = []
+
+        return created_projections
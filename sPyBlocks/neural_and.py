@@ -1,4 +1,4 @@
-from .connection_functions import create_connections, multiple_connect, flatten
+from .connection_functions import create_connections, multiple_connect, flatten, static_synapse
 from .neural_or import NeuralOr
 
 
@@ -6,7 +6,8 @@ class NeuralAnd:
     """
     This class defines the AND block. This block has two variants: classic and fast.
     """
-    def __init__(self, n_inputs, sim, global_params, neuron_params, std_conn, build_type="classic"):
+    def __init__(self, n_inputs, sim, global_params, neuron_params, std_conn, build_type="classic", or_neuron=None,
+                 output_neuron=None):
         """
         Constructor of the class.
 
@@ -16,6 +17,8 @@ class NeuralAnd:
         :param dict neuron_params: A dictionary of type str:int containing the neuron parameters.
         :param sim.StaticSynapse std_conn: The connection to be used for the construction of the block. Commonly, its weight is 1.0 and its delay is equal to the timestep. Using other values could change the behavior of the block.
         :param str build_type: A string indicating the AND variant ("classic" or "fast"). "classic" by default.
+        :param sim.PopulationView or_neuron: A single-neuron view of an existing population to be used as the neuron of the internal OR block (only used by the classic variant). A new population is created by default.
+        :param sim.PopulationView output_neuron: A single-neuron view of an existing population to be used as the output neuron of the block. A new population is created by default.
         :raise ValueError: If the build_type string is not "classic" or "fast".
         """
         # Storing parameters
@@ -37,17 +40,19 @@ class NeuralAnd:
 
         # Create the neurons
         if build_type == "classic":
-            self.or_gate = NeuralOr(sim, global_params, neuron_params, std_conn)
+            self.or_gate = NeuralOr(sim, global_params, neuron_params, std_conn, output_neuron=or_neuron)
 
             self.total_neurons += self.or_gate.total_neurons
             self.total_internal_connections += self.or_gate.total_internal_connections
 
-        self.output_neuron = sim.Population(1, sim.IF_curr_exp(**neuron_params),
-                                            initial_values={'v': neuron_params["v_rest"]})
+        if output_neuron is None:
+            output_neuron = sim.Population(1, sim.IF_curr_exp(**neuron_params),
+                                           initial_values={'v': neuron_params["v_rest"]})
+        self.output_neuron = output_neuron
         self.total_neurons += self.output_neuron.size
 
         # Custom synapses
-        self.inh_synapse = sim.StaticSynapse(weight=n_inputs - 1, delay=global_params["min_delay"])
+        self.inh_synapse = static_synapse(sim, n_inputs - 1, global_params["min_delay"])
 
         # Create the connections
         if build_type == "classic":
@@ -111,7 +116,7 @@ class NeuralAnd:
             created_connections += self.or_gate.connect_inputs(input_population, conn, rcp_type=rcp_type,
                                                                ini_pop_indexes=ini_pop_indexes)
 
-        delayed_conn = self.sim.StaticSynapse(weight=conn.weight, delay=conn.delay + self.delay)
+        delayed_conn = static_synapse(self.sim, conn.weight, conn.delay + self.delay)
         created_connections += create_connections(input_population, self.output_neuron, self.sim, delayed_conn,
                                                   rcp_type=rcp_type, ini_pop_indexes=ini_pop_indexes)
 
@@ -189,10 +194,14 @@ class MultipleNeuralAnd:
         """
         Constructor of the class.
 
+        If global_params includes the "pooled" keyword set to True, the output neurons of all the blocks (and the
+        neurons of their internal OR blocks) are allocated in a single population, and the neurons of each block are
+        single-neuron views of that population.
+
         :param int n_components: The number of blocks to create.
         :param int n_inputs: The number of expected inputs of the blocks.
         :param sim: The simulator package.
-        :param dict global_params: A dictionary of type str:int which must include the "min_delay" keyword. This keyword is likely to have the time period associated with it as a value.
+        :param dict global_params: A dictionary of type str:int which must include the "min_delay" keyword. This keyword is likely to have the time period associated with it as a value. It can also include the "pooled" keyword (False by default), which allocates the neurons of all the blocks of a MultipleNeuralAnd in a single population.
         :param dict neuron_params: A dictionary of type str:int containing the neuron parameters.
         :param sim.StaticSynapse std_conn: The connection to be used for the construction of the blocks. Commonly, its weight is 1.0 and its delay is equal to the timestep. Using other values could change the behavior of the block.
         :param str build_type: A string indicating the AND variant ("classic" or "fast"). "classic" by default.
@@ -216,10 +225,26 @@ class MultipleNeuralAnd:
         self.total_internal_connections = 0
         self.total_output_connections = 0
 
+        # Create the neuron pools
+        if global_params.get("pooled", False):
+            self.output_pool = sim.Population(n_components, sim.IF_curr_exp(**neuron_params),
+                                              initial_values={'v': neuron_params["v_rest"]})
+            if build_type == "classic":
+                self.or_pool = sim.Population(n_components, sim.IF_curr_exp(**neuron_params),
+                                              initial_values={'v': neuron_params["v_rest"]})
+            else:
+                self.or_pool = None
+        else:
+            self.output_pool = None
+            self.or_pool = None
+
         # Create the array of multiple src
         self.and_array = []
         for i in range(n_components):
-            and_gate = NeuralAnd(n_inputs, sim, global_params, neuron_params, std_conn, build_type=build_type)
+            or_neuron = sim.PopulationView(self.or_pool, [i]) if self.or_pool is not None else None
+            output_neuron = sim.PopulationView(self.output_pool, [i]) if self.output_pool is not None else None
+            and_gate = NeuralAnd(n_inputs, sim, global_params, neuron_params, std_conn, build_type=build_type,
+                                 or_neuron=or_neuron, output_neuron=output_neuron)
             self.and_array.append(and_gate)
 
             self.total_neurons += and_gate.total_neurons
@@ -1,4 +1,4 @@
-from .connection_functions import truth_table_column, inverse_rcp_type, flatten
+from .connection_functions import truth_table_column, inverse_rcp_type, flatten, static_synapse
 from .neural_and import MultipleNeuralAnd
 from .neural_not import MultipleNeuralNot
 
@@ -80,7 +80,7 @@ class NeuralDecoder:
                                                              component_indexes=not_indexes)
 
         # Connect inputs to AND neurons
-        delayed_conn = self.sim.StaticSynapse(weight=conn.weight, delay=conn.delay * 2 + self.not_gates.delay)
+        delayed_conn = static_synapse(self.sim, conn.weight, conn.delay * 2 + self.not_gates.delay)
 
         # TODO: Extract a new function?
         if ini_pop_indexes is None:  # All inputs for all specified components
@@ -1,4 +1,4 @@
-from .connection_functions import inverse_rcp_type, flatten
+from .connection_functions import inverse_rcp_type, flatten, static_synapse
 from .neural_and import MultipleNeuralAnd
 from .neural_not import NeuralNot
 
@@ -98,12 +98,12 @@ class NeuralFlankDetector:
         created_connections += self.not_gate.connect_inputs(input_population, conn, rcp_type=inv_rcp_type,
                                                             ini_pop_indexes=ini_pop_indexes)
 
-        rising_conn = self.sim.StaticSynapse(weight=conn.weight, delay=conn.delay + self.not_gate.delay)
+        rising_conn = static_synapse(self.sim, conn.weight, conn.delay + self.not_gate.delay)
         created_connections += self.and_gates.connect_inputs(input_population, rising_conn, rcp_type=rcp_type,
                                                              ini_pop_indexes=ini_pop_indexes,
                                                              component_indexes=[0])
 
-        falling_conn = self.sim.StaticSynapse(weight=conn.weight, delay=conn.delay * 3 + self.not_gate.delay)
+        falling_conn = static_synapse(self.sim, conn.weight, conn.delay * 3 + self.not_gate.delay)
         created_connections += self.and_gates.connect_inputs(input_population, falling_conn, rcp_type=rcp_type,
                                                              ini_pop_indexes=ini_pop_indexes,
                                                              component_indexes=[1])
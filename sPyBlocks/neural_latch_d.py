@@ -1,4 +1,4 @@
-from sPyBlocks.connection_functions import inverse_rcp_type, flatten, multiple_connect
+from sPyBlocks.connection_functions import inverse_rcp_type, flatten, multiple_connect, static_synapse
 from sPyBlocks.neural_and import MultipleNeuralAnd
 from sPyBlocks.neural_latch_sr import NeuralLatchSR
 from sPyBlocks.neural_not import NeuralNot
@@ -76,8 +76,7 @@ class NeuralLatchD:
             created_connections = self.not_gate.connect_inputs(input_population, conn, conn_all=conn_all,
                                                                rcp_type=inv_rcp_type, ini_pop_indexes=ini_pop_indexes)
 
-            delayed_conn = self.sim.StaticSynapse(weight=conn.weight,
-                                                  delay=conn.delay + self.std_conn.delay + self.not_gate.delay)
+            delayed_conn = static_synapse(self.sim, conn.weight, conn.delay + self.std_conn.delay + self.not_gate.delay)
             created_connections += self.and_gates.connect_inputs(input_population, delayed_conn, conn_all=conn_all,
                                                                  rcp_type=rcp_type,
                                                                  ini_pop_indexes=ini_pop_indexes, component_indexes=[0])
@@ -107,8 +106,7 @@ class NeuralLatchD:
             conn = self.std_conn
 
         if self.include_not:
-            delayed_conn = self.sim.StaticSynapse(weight=conn.weight,
-                                                  delay=conn.delay + self.std_conn.delay + self.not_gate.delay)
+            delayed_conn = static_synapse(self.sim, conn.weight, conn.delay + self.std_conn.delay + self.not_gate.delay)
             created_connections = self.and_gates.connect_inputs(input_population, delayed_conn, conn_all=conn_all,
                                                                 rcp_type=rcp_type, ini_pop_indexes=ini_pop_indexes)
         else:
@@ -1,6 +1,8 @@
 from math import ceil, log2
 
-from sPyBlocks.connection_functions import flatten, inverse_rcp_type
+import numpy as np
+
+from sPyBlocks.connection_functions import flatten, inverse_rcp_type, static_synapse
 from sPyBlocks.neural_decoder import NeuralDecoder
 from sPyBlocks.neural_latch_d import MultipleNeuralLatchD
 from sPyBlocks.neural_not import MultipleNeuralNot
@@ -32,8 +34,8 @@ class NeuralMemory:
         self.latches = MultipleNeuralLatchD(self.capacity, sim, global_params, neuron_params, std_conn,
                                             and_type=and_type, include_not=False)
 
-        self.total_neurons += self.decoder.total_neurons + self.latches.total_neurons
-        self.total_internal_connections += self.decoder.total_internal_connections + self.latches.total_internal_connections
+        self.total_neurons += self.decoder.total_neurons + self.not_gates.total_neurons + self.latches.total_neurons
+        self.total_internal_connections += self.decoder.total_internal_connections + self.not_gates.total_internal_connections + self.latches.total_internal_connections
 
         # Create the connections
         created_connections = 0
@@ -79,10 +81,8 @@ class NeuralMemory:
             bit_indexes = range(self.width)
 
         inv_rcp_type = inverse_rcp_type(rcp_type)
-        delayed_conn_data = self.sim.StaticSynapse(weight=conn.weight,
-                                                   delay=self.std_conn.delay + self.decoder.delay + conn.delay)
-        delayed_conn_not_data = self.sim.StaticSynapse(weight=conn.weight,
-                                                       delay=self.std_conn.delay + self.decoder.delay)
+        delayed_conn_data = static_synapse(self.sim, conn.weight, self.std_conn.delay + self.decoder.delay + conn.delay)
+        delayed_conn_not_data = static_synapse(self.sim, conn.weight, self.std_conn.delay + self.decoder.delay)
 
         created_connections = 0
 
@@ -198,3 +198,33 @@ class NeuralMemory:
             return flatten(output_neurons)
         else:
             return output_neurons
+
+    def read_state(self, spike_matrix):
+        """
+        Gets the words stored in the memory at each timestep from the spikes of its output neurons (the latches).
+
+        :param np.ndarray spike_matrix: A boolean array with a row for each timestep and a column for each output neuron, in the order given by get_output_neurons (see SpikeReadout).
+        :return: A tuple (values, write_times), where values is an uint64 array with a row for each address (starting from address 1) and a column for each timestep, and write_times is a list with the timesteps where the word of each address changes (writes of the same word are not visible from the latches).
+        :rtype: tuple
+        :raise ValueError: If the matrix does not have a column for each output neuron, or if the width of the memory is greater than 64 bits.
+        """
+        spike_matrix = np.asarray(spike_matrix, dtype=bool)
+        if spike_matrix.ndim != 2 or spike_matrix.shape[1] != self.capacity:
+            raise ValueError("The spike matrix must have a column for each of the " + str(self.capacity) +
+                             " output neurons")
+        if self.width > 64:
+            raise ValueError("Words wider than 64 bits cannot be read")
+
+        # Pack the bits of each word into little endian bytes, padded to 8 bytes
+        n_steps = len(spike_matrix)
+        packed = np.packbits(spike_matrix.reshape(n_steps, self.n_dir, self.width), axis=2, bitorder="little")
+        words = np.zeros((n_steps, self.n_dir, 8), dtype=np.uint8)
+        words[:, :, :packed.shape[2]] = packed
+        values = np.ascontiguousarray(words.view("<u8")[:, :, 0].T)
+
+        # Timesteps where the stored words change
+        changes = np.diff(values, axis=1, prepend=np.zeros((self.n_dir, 1), dtype=values.dtype)) != 0
+        addresses, times = np.nonzero(changes)
+        write_times = np.split(times, np.searchsorted(addresses, np.arange(1, self.n_dir)))
+
+        return values, write_times
@@ -1,4 +1,4 @@
-from .connection_functions import truth_table_column, inverse_rcp_type, flatten
+from .connection_functions import truth_table_column, inverse_rcp_type, flatten, static_synapse
 from .neural_and import MultipleNeuralAnd
 from .neural_not import MultipleNeuralNot
 from .neural_or import NeuralOr
@@ -94,7 +94,7 @@ class NeuralMuxDemux:
                                                              component_indexes=not_indexes)
 
         # Connect inputs to AND neurons
-        delayed_conn = self.sim.StaticSynapse(weight=conn.weight, delay=conn.delay * 2 + self.not_gates.delay)
+        delayed_conn = static_synapse(self.sim, conn.weight, conn.delay * 2 + self.not_gates.delay)
 
         # TODO: Extract a new function?
         if ini_pop_indexes is None:  # All inputs for all specified components
@@ -138,7 +138,7 @@ class NeuralMuxDemux:
         if and_indexes is None:
             and_indexes = range(self.n_outputs)
 
-        delayed_conn = self.sim.StaticSynapse(weight=conn.weight, delay=conn.delay * 2 + self.not_gates.delay)
+        delayed_conn = static_synapse(self.sim, conn.weight, conn.delay * 2 + self.not_gates.delay)
         created_connections = self.and_gates.connect_inputs(input_population, delayed_conn, conn_all=conn_all,
                                                             rcp_type=rcp_type, ini_pop_indexes=ini_pop_indexes,
                                                             component_indexes=and_indexes)
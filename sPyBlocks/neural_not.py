@@ -5,7 +5,7 @@ class NeuralNot:
     """
     This class defines the NOT block.
     """
-    def __init__(self, sim, global_params, neuron_params, std_conn):
+    def __init__(self, sim, global_params, neuron_params, std_conn, output_neuron=None):
         """
         Constructor of the class.
 
@@ -13,6 +13,7 @@ class NeuralNot:
         :param dict global_params: A dictionary of type str:int which must include the "min_delay" keyword. This keyword is likely to have the time period associated with it as a value.
         :param dict neuron_params: A dictionary of type str:int containing the neuron parameters.
         :param sim.StaticSynapse std_conn: The connection to be used for the construction of the block. Commonly, its weight is 1.0 and its delay is equal to the timestep.
+        :param sim.PopulationView output_neuron: A single-neuron view of an existing population to be used as the output neuron of the block. A new population is created by default.
         """
         # Storing parameters
         self.sim = sim
@@ -27,8 +28,10 @@ class NeuralNot:
         self.total_output_connections = 0
 
         # Create the neurons
-        self.output_neuron = sim.Population(1, sim.IF_curr_exp(**neuron_params),
-                                            initial_values={'v': neuron_params["v_rest"]})
+        if output_neuron is None:
+            output_neuron = sim.Population(1, sim.IF_curr_exp(**neuron_params),
+                                           initial_values={'v': neuron_params["v_rest"]})
+        self.output_neuron = output_neuron
         self.total_neurons += self.output_neuron.size
 
         # Total internal delay
@@ -142,9 +145,12 @@ class MultipleNeuralNot:
         """
         Constructor of the class.
 
+        If global_params includes the "pooled" keyword set to True, the output neurons of all the blocks are allocated
+        in a single population, and the output neuron of each block is a single-neuron view of that population.
+
         :param int n_components: The number of blocks to create.
         :param sim: The simulator package.
-        :param dict global_params: A dictionary of type str:int which must include the "min_delay" keyword. This keyword is likely to have the time period associated with it as a value.
+        :param dict global_params: A dictionary of type str:int which must include the "min_delay" keyword. This keyword is likely to have the time period associated with it as a value. It can also include the "pooled" keyword (False by default), which allocates the neurons of all the blocks of a MultipleNeuralNot in a single population.
         :param dict neuron_params: A dictionary of type str:int containing the neuron parameters.
         :param sim.StaticSynapse std_conn: The connection to be used for the construction of the block. Commonly, its weight is 1.0 and its delay is equal to the timestep.
         """
@@ -161,10 +167,18 @@ class MultipleNeuralNot:
         self.total_internal_connections = 0
         self.total_output_connections = 0
 
+        # Create the neuron pool
+        if global_params.get("pooled", False):
+            self.output_pool = sim.Population(n_components, sim.IF_curr_exp(**neuron_params),
+                                              initial_values={'v': neuron_params["v_rest"]})
+        else:
+            self.output_pool = None
+
         # Create the array of multiple src
         self.not_array = []
         for i in range(n_components):
-            not_gate = NeuralNot(sim, global_params, neuron_params, std_conn)
+            output_neuron = sim.PopulationView(self.output_pool, [i]) if self.output_pool is not None else None
+            not_gate = NeuralNot(sim, global_params, neuron_params, std_conn, output_neuron=output_neuron)
             self.not_array.append(not_gate)
 
             self.total_neurons += not_gate.total_neurons
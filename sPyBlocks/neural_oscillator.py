@@ -1,4 +1,5 @@
-from sPyBlocks.connection_functions import create_connections, inverse_rcp_type, multiple_connect, flatten
+from sPyBlocks.connection_functions import create_connections, inverse_rcp_type, multiple_connect, flatten, \
+    static_synapse
 
 
 class NeuralSyncOscillator:
@@ -42,7 +43,7 @@ class NeuralSyncOscillator:
 
         created_connections += create_connections(self.set_source, self.input_neuron, sim, std_conn)
 
-        delayed_conn = sim.StaticSynapse(weight=1.0, delay=n_period)
+        delayed_conn = static_synapse(sim, 1.0, n_period)
         created_connections += create_connections(self.input_neuron, self.output_neuron, self.sim, delayed_conn)
         created_connections += create_connections(self.output_neuron, self.input_neuron, self.sim, delayed_conn)
 
@@ -0,0 +1,1051 @@
+"""
+Pure NumPy simulator implementing the subset of the PyNN API used by sPyBlocks, so the blocks can be simulated without
+SpiNNaker hardware. It can be imported in place of spynnaker8:
+
+    import sPyBlocks.numpy_backend as sim
+
+The neurons are simulated with a fixed timestep, following the discrete-time equations of the IF_curr_exp model of
+sPyNNaker, and the synaptic delays are implemented with ring buffers.
+
+An event-driven engine can be selected with setup(engine="event"). It keeps the delayed spike deliveries in a priority
+queue and only updates the neurons that are away from their resting state, skipping the idle timesteps, so its cost
+scales with the number of spikes instead of the number of neurons and timesteps.
+"""
+import heapq
+import sys
+
+import numpy as np
+
+from sPyBlocks.connection_functions import clear_simulator_state
+
+# Default parameters of the cell types
+IF_CURR_EXP_DEFAULTS = {"cm": 1.0, "tau_m": 20.0, "tau_refrac": 0.1, "tau_syn_E": 5.0, "tau_syn_I": 5.0,
+                        "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -50.0, "i_offset": 0.0}
+
+# Receptor types, indexed by the receptor codes used by the ring buffers
+RECEPTOR_TYPES = ("excitatory", "inhibitory")
+
+# Simulation engines
+ENGINES = ("step", "event")
+
+# The event-driven engine updates all the neurons when more than 1 / DENSE_FRACTION of them are awake
+DENSE_FRACTION = 8
+
+
+# --- Cell types, synapses and connectors ---
+
+class IF_curr_exp:
+    """
+    This class defines the leaky integrate-and-fire cell type with exponentially decaying current inputs.
+    """
+    def __init__(self, **params):
+        """
+        Constructor of the class.
+
+        :param params: The parameters of the neurons (cm, tau_m, tau_refrac, tau_syn_E, tau_syn_I, v_rest, v_reset, v_thresh and i_offset).
+        :raise ValueError: If an unknown parameter is given.
+        """
+        unknown_params = set(params) - set(IF_CURR_EXP_DEFAULTS)
+        if unknown_params:
+            raise ValueError("Unknown IF_curr_exp parameters: " + ", ".join(sorted(unknown_params)))
+
+        self.parameters = dict(IF_CURR_EXP_DEFAULTS, **params)
+
+
+class SpikeSourceArray:
+    """
+    This class defines the spike source cell type, which fires spikes at the given times.
+    """
+    def __init__(self, spike_times=None):
+        """
+        Constructor of the class.
+
+        :param list spike_times: A list of spike times (ms) shared by all the neurons, or a list containing a list of spike times for each neuron.
+        """
+        self.spike_times = [] if spike_times is None else spike_times
+
+    def neuron_spike_times(self, size):
+        """
+        Gets the list of spike times of each neuron of a population.
+
+        :param int size: The number of neurons of the population.
+        :return: A list containing an array of spike times for each neuron.
+        :rtype: list
+        """
+        spike_times = list(self.spike_times)
+        if spike_times and np.ndim(spike_times[0]) > 0:
+            if len(spike_times) != size:
+                raise ValueError("A list of spike times is required for each neuron of the population")
+            return [np.asarray(times, dtype=float) for times in spike_times]
+        return [np.asarray(spike_times, dtype=float)] * size
+
+
+class StaticSynapse:
+    """
+    This class defines a synapse with fixed weight and delay.
+    """
+    def __init__(self, weight=0.0, delay=None):
+        """
+        Constructor of the class.
+
+        :param float weight: The weight of the synapse.
+        :param float delay: The delay of the synapse (ms). The timestep by default.
+        """
+        self.weight = weight
+        self.delay = delay
+
+
+class OneToOneConnector:
+    """
+    This class connects each neuron of the input population to the neuron with the same index of the end population.
+    """
+    def connect(self, n_pre, n_post):
+        if n_pre != n_post:
+            raise ValueError("OneToOneConnector requires populations of the same size")
+        return np.arange(n_pre), np.arange(n_post), None, None
+
+
+class AllToAllConnector:
+    """
+    This class connects every neuron of the input population to every neuron of the end population.
+    """
+    def __init__(self, allow_self_connections=True):
+        self.allow_self_connections = allow_self_connections
+
+    def connect(self, n_pre, n_post):
+        pre = np.repeat(np.arange(n_pre), n_post)
+        post = np.tile(np.arange(n_post), n_pre)
+        if not self.allow_self_connections:
+            not_self = pre != post
+            pre, post = pre[not_self], post[not_self]
+        return pre, post, None, None
+
+
+class FromListConnector:
+    """
+    This class creates the connections given in a list of (pre index, post index[, weight, delay]) tuples.
+    """
+    def __init__(self, conn_list, column_names=None):
+        self.conn_list = conn_list
+
+    def connect(self, n_pre, n_post):
+        conn_array = np.array(self.conn_list, dtype=float).reshape(len(self.conn_list), -1)
+        pre = conn_array[:, 0].astype(int)
+        post = conn_array[:, 1].astype(int)
+        if len(conn_array) and (pre.max() >= n_pre or post.max() >= n_post):
+            raise IndexError("FromListConnector indices exceed the size of the populations")
+        if conn_array.shape[1] >= 4:
+            return pre, post, conn_array[:, 2], conn_array[:, 3]
+        return pre, post, None, None
+
+
+# --- Recorded data ---
+
+class SpikeTrain(np.ndarray):
+    """
+    This class defines the spike times (ms) fired by a neuron.
+    """
+    @property
+    def times(self):
+        return self
+
+    @property
+    def magnitude(self):
+        return np.asarray(self)
+
+
+class AnalogSignal(np.ndarray):
+    """
+    This class defines a recorded state variable, with a row for each timestep and a column for each neuron.
+    """
+    def __array_finalize__(self, obj):
+        self.name = getattr(obj, "name", None)
+        self.times = getattr(obj, "times", None)
+        self.sampling_period = getattr(obj, "sampling_period", None)
+
+    @property
+    def magnitude(self):
+        return np.asarray(self)
+
+
+class Segment:
+    """
+    This class defines the data recorded during a simulation, following the structure of Neo segments.
+    """
+    def __init__(self, spiketrains=None, analogsignals=None):
+        self.spiketrains = [] if spiketrains is None else spiketrains
+        self.analogsignals = [] if analogsignals is None else analogsignals
+
+    def filter(self, name=None, **kwargs):
+        return [signal for signal in self.analogsignals if name is None or signal.name == name]
+
+
+class Block:
+    """
+    This class defines a group of segments, following the structure of Neo blocks.
+    """
+    def __init__(self, segments):
+        self.segments = segments
+
+
+class TrialResults:
+    """
+    This class contains the spikes recorded in a batch of independent trials (see run_trials).
+    """
+    def __init__(self, steps, trials, neuron_ids, n_trials, n_steps, timestep, n_neurons):
+        """
+        Constructor of the class. The results keep the number of neurons of the network, so the spikes can still be
+        read after the network is removed by setup or end.
+
+        :param np.ndarray steps: The timestep of each spike.
+        :param np.ndarray trials: The trial of each spike.
+        :param np.ndarray neuron_ids: The neuron of each spike.
+        :param int n_trials: The number of trials.
+        :param int n_steps: The number of simulated timesteps.
+        :param float timestep: The simulation timestep (ms).
+        :param int n_neurons: The number of neurons of the simulated network.
+        """
+        self.steps = steps
+        self.trials = trials
+        self.neuron_ids = neuron_ids
+        self.n_trials = n_trials
+        self.n_steps = n_steps
+        self.timestep = timestep
+        self.n_neurons = n_neurons
+
+    def spike_matrix(self, obj):
+        """
+        Gets the spikes of the neurons of a population, view or assembly in every trial.
+
+        :param obj: The population, view or assembly whose spikes are requested.
+        :return: A boolean array of shape (trials, timesteps, neurons).
+        :rtype: np.ndarray
+        :raise ValueError: If the object contains neurons which were not in the simulated network.
+        """
+        neuron_ids = obj._neuron_ids()
+        if np.any(neuron_ids >= self.n_neurons):
+            raise ValueError("The object contains neurons which were not in the simulated network")
+
+        columns = np.full(self.n_neurons, -1, dtype=np.int64)
+        columns[neuron_ids] = np.arange(len(neuron_ids))
+
+        selected = columns[self.neuron_ids] >= 0
+        spikes = np.zeros((self.n_trials, self.n_steps, len(neuron_ids)), dtype=bool)
+        spikes[self.trials[selected], self.steps[selected], columns[self.neuron_ids[selected]]] = True
+        return spikes
+
+    def spiketrains(self, obj, trial):
+        """
+        Gets the spike trains of the neurons of a population, view or assembly in a trial.
+
+        :param obj: The population, view or assembly whose spikes are requested.
+        :param int trial: The index of the trial.
+        :return: A list containing the spike times (ms) of each neuron.
+        :rtype: list
+        """
+        spikes = self.spike_matrix(obj)[trial]
+        return [(np.flatnonzero(spikes[:, i]) * self.timestep).view(SpikeTrain) for i in range(spikes.shape[1])]
+
+
+# --- Populations ---
+
+def _variable_list(variables):
+    """
+    Gets a list of variable names from a string, a tuple or a list.
+    """
+    if isinstance(variables, str):
+        variables = [variables]
+    variables = list(variables)
+    if "all" in variables:
+        return ["spikes", "v"]
+    return variables
+
+
+class _NeuronGroup:
+    """
+    Common functionality of populations, views and assemblies, which are ordered groups of neurons of the simulator.
+    """
+    def record(self, variables, to_file=None, sampling_interval=None):
+        """
+        Records the given variables of the neurons.
+
+        :param variables: A string or a tuple of strings with the names of the variables to record ("spikes" or "v").
+        :return: None
+        """
+        for variable in _variable_list(variables):
+            _simulator.record(self._neuron_ids(), variable)
+
+    def get_data(self, variables="all", gather=True, clear=False):
+        """
+        Gets the recorded data of the neurons.
+
+        :param variables: A string or a list of strings with the names of the variables to get. All the variables by default.
+        :param gather: Unused.
+        :param bool clear: A boolean indicating whether or not to clear the recorded data after getting it.
+        :return: A Neo-like block with a single segment.
+        :rtype: Block
+        """
+        segment = _simulator.get_data(self._neuron_ids(), _variable_list(variables))
+        if clear:
+            _simulator.clear_data(self._neuron_ids())
+        return Block([segment])
+
+    def get_spike_counts(self, gather=True):
+        spiketrains = self.get_data("spikes").segments[0].spiketrains
+        return {i: len(spiketrain) for i, spiketrain in enumerate(spiketrains)}
+
+    def __len__(self):
+        return self.size
+
+
+class Population(_NeuronGroup):
+    """
+    This class defines a group of neurons of the same cell type.
+    """
+    def __init__(self, size, cellclass, cellparams=None, initial_values=None, label=None):
+        """
+        Constructor of the class.
+
+        :param int size: The number of neurons of the population.
+        :param IF_curr_exp, SpikeSourceArray cellclass: The cell type of the neurons.
+        :param cellparams: Unused.
+        :param dict initial_values: A dictionary containing the initial values of the state variables of the neurons.
+        :param str label: The label of the population.
+        """
+        self.size = size
+        self.celltype = cellclass
+        self.initial_values = {} if initial_values is None else dict(initial_values)
+        self.label = label
+        self.first_id = _simulator.add_population(self)
+
+    def _neuron_ids(self):
+        return np.arange(self.first_id, self.first_id + self.size)
+
+    def __getitem__(self, selector):
+        return PopulationView(self, selector)
+
+
+class PopulationView(_NeuronGroup):
+    """
+    This class defines a subset of the neurons of a population (or of another view).
+    """
+    def __init__(self, parent, selector, label=None):
+        """
+        Constructor of the class.
+
+        :param Population, PopulationView parent: The population or view containing the selected neurons.
+        :param selector: A list, array, slice or int used to select neurons from the parent.
+        :param str label: The label of the view.
+        """
+        self.parent = parent
+        self.mask = np.atleast_1d(np.arange(parent.size)[selector])
+        self.size = len(self.mask)
+        self.label = label
+
+    @property
+    def grandparent(self):
+        return self.parent if isinstance(self.parent, Population) else self.parent.grandparent
+
+    def index_in_grandparent(self, indices):
+        indices = self.mask[indices]
+        return indices if isinstance(self.parent, Population) else self.parent.index_in_grandparent(indices)
+
+    def _neuron_ids(self):
+        return self.parent._neuron_ids()[self.mask]
+
+    def __getitem__(self, selector):
+        return PopulationView(self, selector)
+
+
+class Assembly(_NeuronGroup):
+    """
+    This class defines an ordered group of populations and views.
+    """
+    def __init__(self, *populations, label=None):
+        """
+        Constructor of the class.
+
+        :param populations: The populations and views to group.
+        :param str label: The label of the assembly.
+        """
+        self.populations = list(populations)
+        self.size = sum(population.size for population in self.populations)
+        self.label = label
+
+    def _neuron_ids(self):
+        if not self.populations:
+            return np.zeros(0, dtype=int)
+        return np.concatenate([population._neuron_ids() for population in self.populations])
+
+
+class Projection:
+    """
+    This class defines a set of connections between two groups of neurons.
+    """
+    def __init__(self, presynaptic_population, postsynaptic_population, connector, synapse_type=None,
+                 receptor_type="excitatory", label=None):
+        """
+        Constructor of the class.
+
+        :param presynaptic_population: The population, view or assembly that serves as input population.
+        :param postsynaptic_population: The population, view or assembly that serves as end population.
+        :param connector: The connector defining the connections.
+        :param StaticSynapse synapse_type: The synapse to use. A synapse with weight 0 by default.
+        :param str receptor_type: A string indicating the receptor type of the connections (excitatory or inhibitory).
+        :param str label: The label of the projection.
+        :raise ValueError: If the receptor type is not supported or a delay is shorter than the timestep.
+        """
+        if synapse_type is None:
+            synapse_type = StaticSynapse()
+        if receptor_type not in RECEPTOR_TYPES:
+            raise ValueError("Unknown receptor type: " + str(receptor_type))
+
+        self.pre = presynaptic_population
+        self.post = postsynaptic_population
+        self.receptor_type = receptor_type
+        self.label = label
+
+        pre, post, weight, delay = connector.connect(self.pre.size, self.post.size)
+        if weight is None:
+            weight = synapse_type.weight
+        if delay is None:
+            delay = synapse_type.delay if synapse_type.delay is not None else _simulator.timestep
+
+        self.size = _simulator.add_connections(self.pre._neuron_ids()[pre], self.post._neuron_ids()[post], weight,
+                                               delay, RECEPTOR_TYPES.index(receptor_type))
+
+    def __len__(self):
+        return self.size
+
+
+# --- Simulation core ---
+
+class _Simulator:
+    """
+    This class contains the state of the simulation: the neurons, the connections, the ring buffers and the recorded
+    data. The network is compiled into flat NumPy arrays the first time it is run after being modified.
+    """
+    def __init__(self, timestep=1.0, engine="step", rest_tolerance=1e-9):
+        if engine not in ENGINES:
+            raise ValueError("Unknown engine " + str(engine) + ", it must be one of " + ", ".join(ENGINES))
+
+        self.timestep = timestep
+        self.engine = engine
+        self.rest_tolerance = rest_tolerance
+        self.populations = []
+        self.total_neurons = 0
+        self.current_step = 0
+
+        self._chunks = {"pre": [], "post": [], "weight": [], "delay": [], "receptor": []}
+        self._compiled = False
+
+        # State of the neurons
+        self.v = np.zeros(0)
+        self.synaptic_input = np.zeros((len(RECEPTOR_TYPES), 0))
+        self.refract_timer = np.zeros(0, dtype=np.int64)
+        self.ring_buffer = np.zeros((len(RECEPTOR_TYPES), 1, 0))
+
+        # Pending deliveries of the event-driven engine: heap of arrival steps and (receptor, post, weight) arrays
+        self.pending_steps = []
+        self.pending = {}
+
+        # Recording
+        self.recorded = {"spikes": np.zeros(0, dtype=bool), "v": np.zeros(0, dtype=bool)}
+        self.spike_chunks = []  # Arrays of (step, neuron id) rows
+        self.v_chunks = []  # Tuples of (first step, neuron ids, array of voltages)
+
+    # Network construction
+
+    def add_population(self, population):
+        first_id = self.total_neurons
+        self.populations.append(population)
+        self.total_neurons += population.size
+        self._compiled = False
+        return first_id
+
+    def add_connections(self, pre, post, weight, delay, receptor):
+        n_connections = len(pre)
+        delay_steps = np.rint(np.broadcast_to(np.asarray(delay, dtype=float), (n_connections,)) / self.timestep)
+        if n_connections and delay_steps.min() < 1:
+            raise ValueError("The delays must be equal to or greater than the timestep")
+
+        self._chunks["pre"].append(np.asarray(pre, dtype=np.int64))
+        self._chunks["post"].append(np.asarray(post, dtype=np.int64))
+        self._chunks["weight"].append(np.broadcast_to(np.asarray(weight, dtype=float), (n_connections,)))
+        self._chunks["delay"].append(delay_steps.astype(np.int64))
+        self._chunks["receptor"].append(np.full(n_connections, receptor, dtype=np.int64))
+        self._compiled = False
+        return n_connections
+
+    def record(self, neuron_ids, variable):
+        if variable not in self.recorded:
+            raise ValueError("The variable " + str(variable) + " cannot be recorded")
+        self._resize_state()
+        self.recorded[variable][neuron_ids] = True
+
+    # Compilation
+
+    def _initial_v(self, first_id):
+        """
+        Gets the initial membrane potential of the neurons created from the given identifier onwards.
+        """
+        v = np.zeros(self.total_neurons - first_id)
+        for population in self.populations:
+            start = max(population.first_id, first_id) - first_id
+            end = population.first_id + population.size - first_id
+            if end > 0 and isinstance(population.celltype, IF_curr_exp):
+                v[start:end] = population.initial_values.get("v", population.celltype.parameters["v_rest"])
+        return v
+
+    def _resize_state(self):
+        """
+        Extends the state arrays with the neurons created since the last compilation.
+        """
+        n_old = len(self.v)
+        n_new = self.total_neurons - n_old
+        if n_new <= 0:
+            return
+
+        self.v = np.append(self.v, self._initial_v(n_old))
+        self.synaptic_input = np.append(self.synaptic_input, np.zeros((len(RECEPTOR_TYPES), n_new)), axis=1)
+        self.refract_timer = np.append(self.refract_timer, np.zeros(n_new, dtype=np.int64))
+        self.ring_buffer = np.append(self.ring_buffer, np.zeros(self.ring_buffer.shape[:2] + (n_new,)), axis=2)
+        for variable in self.recorded:
+            self.recorded[variable] = np.append(self.recorded[variable], np.zeros(n_new, dtype=bool))
+
+    def _compile(self):
+        """
+        Builds the parameter arrays of the neurons and the connection table (sorted by presynaptic neuron).
+        """
+        self._resize_state()
+        dt = self.timestep
+        n = self.total_neurons
+
+        # Neuron parameters (spike sources never reach their threshold)
+        params = {name: np.full(n, value, dtype=float) for name, value in IF_CURR_EXP_DEFAULTS.items()}
+        params["v_thresh"][:] = np.inf
+        source_ids = []
+        source_steps = []
+
+        for population in self.populations:
+            ids = slice(population.first_id, population.first_id + population.size)
+            if isinstance(population.celltype, IF_curr_exp):
+                for name, value in population.celltype.parameters.items():
+                    params[name][ids] = value
+            else:
+                for i, times in enumerate(population.celltype.neuron_spike_times(population.size)):
+                    source_steps.append(np.rint(times / dt).astype(np.int64))
+                    source_ids.append(np.full(len(times), population.first_id + i, dtype=np.int64))
+
+        self.exp_tau_m = np.exp(-dt / params["tau_m"])
+        self.r_membrane = params["tau_m"] / params["cm"]
+        self.v_rest = params["v_rest"]
+        self.v_reset = params["v_reset"]
+        self.v_thresh = params["v_thresh"]
+        self.i_offset = params["i_offset"]
+        self.t_refract = np.ceil(np.round(params["tau_refrac"] / dt, 9)).astype(np.int64)
+
+        tau_syn = np.array([params["tau_syn_E"], params["tau_syn_I"]])
+        self.syn_decay = np.exp(-dt / tau_syn)
+        self.syn_init = tau_syn / dt * (1.0 - self.syn_decay)
+
+        # Spike source schedule, sorted by step
+        source_steps = np.concatenate(source_steps) if source_steps else np.zeros(0, dtype=np.int64)
+        source_ids = np.concatenate(source_ids) if source_ids else np.zeros(0, dtype=np.int64)
+        order = np.argsort(source_steps, kind="stable")
+        self.source_steps = source_steps[order]
+        self.source_ids = source_ids[order]
+
+        # Connections, sorted by presynaptic neuron
+        edges = {name: np.concatenate(chunks) if chunks else np.zeros(0, dtype=float if name == "weight" else np.int64)
+                 for name, chunks in self._chunks.items()}
+        self._chunks = {name: [array] for name, array in edges.items()}
+
+        order = np.argsort(edges["pre"], kind="stable")
+        self.post = edges["post"][order]
+        self.weight = edges["weight"][order]
+        self.delay = edges["delay"][order]
+        self.receptor = edges["receptor"][order]
+        self.indptr = np.searchsorted(edges["pre"][order], np.arange(n + 1))
+
+        # Ring buffers long enough for the longest delay, keeping the pending inputs
+        buffer_length = int(self.delay.max()) + 1 if len(self.delay) else 1
+        if buffer_length > self.ring_buffer.shape[1]:
+            old_length = self.ring_buffer.shape[1]
+            ring_buffer = np.zeros((len(RECEPTOR_TYPES), buffer_length, n))
+            for step in range(self.current_step, self.current_step + old_length):
+                ring_buffer[:, step % buffer_length] = self.ring_buffer[:, step % old_length]
+            self.ring_buffer = ring_buffer
+
+        self._compiled = True
+
+    # Simulation
+
+    def _parameters(self, n_trials):
+        """
+        Gets the parameters of the neurons repeated for the given number of independent trials.
+        """
+        names = ("exp_tau_m", "r_membrane", "v_rest", "v_reset", "v_thresh", "i_offset", "t_refract")
+        params = {name: np.tile(getattr(self, name), n_trials) for name in names}
+        params["syn_decay"] = np.tile(self.syn_decay, n_trials)
+        params["syn_init"] = np.tile(self.syn_init, n_trials)
+        return params
+
+    def _deliver(self, ring_buffer, fired, step):
+        """
+        Adds the spikes fired by the given neurons (flat indices of trial and neuron) to the ring buffers of their
+        postsynaptic neurons.
+        """
+        neuron_ids = fired % self.total_neurons
+        starts = self.indptr[neuron_ids]
+        counts = self.indptr[neuron_ids + 1] - starts
+        n_connections = counts.sum()
+        if n_connections == 0:
+            return
+
+        edges = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(n_connections)
+        targets = np.repeat(fired - neuron_ids, counts) + self.post[edges]
+        slots = (step + self.delay[edges]) % ring_buffer.shape[1]
+        np.add.at(ring_buffer, (self.receptor[edges], slots, targets), self.weight[edges])
+
+    def _advance(self, state, first_step, n_steps, n_trials, source_steps, source_ids, record_spikes, record_v):
+        """
+        Simulates the given number of timesteps from a state. The state contains flat arrays with the variables of
+        the neurons of every trial (trial * total_neurons + neuron id), which are updated in place.
+
+        :return: The (step, flat index) rows of the recorded spikes and the recorded membrane potentials.
+        """
+        params = self._parameters(n_trials)
+        v = state["v"]
+        synaptic_input = state["synaptic_input"]
+        refract_timer = state["refract_timer"]
+        ring_buffer = state["ring_buffer"]
+        buffer_length = ring_buffer.shape[1]
+
+        v_record = np.empty((n_steps, len(record_v)))
+        spike_chunks = []
+        source_start = np.searchsorted(source_steps, first_step)
+
+        for step in range(first_step, first_step + n_steps):
+            # Synaptic input arriving at this timestep
+            slot = step % buffer_length
+            synaptic_input += ring_buffer[:, slot] * params["syn_init"]
+            ring_buffer[:, slot] = 0.0
+
+            # Membrane potential of the non-refractory neurons
+            active = refract_timer <= 0
+            total_input = synaptic_input[0] - synaptic_input[1] + params["i_offset"]
+            alpha = total_input * params["r_membrane"] + params["v_rest"]
+            v[:] = np.where(active, alpha - params["exp_tau_m"] * (alpha - v), v)
+            refract_timer[~active] -= 1
+            v_record[step - first_step] = v[record_v]
+
+            # Spikes
+            spiked = v >= params["v_thresh"]
+            v[spiked] = params["v_reset"][spiked]
+            refract_timer[spiked] = params["t_refract"][spiked]
+
+            source_end = np.searchsorted(source_steps, step, side="right")
+            fired = np.union1d(np.flatnonzero(spiked), source_ids[source_start:source_end])
+            source_start = source_end
+
+            synaptic_input *= params["syn_decay"]
+
+            if len(fired):
+                self._deliver(ring_buffer, fired, step)
+                recorded_fired = fired[record_spikes[fired]]
+                if len(recorded_fired):
+                    spike_chunks.append(np.column_stack([np.full(len(recorded_fired), step), recorded_fired]))
+
+        spikes = np.concatenate(spike_chunks) if spike_chunks else np.zeros((0, 2), dtype=np.int64)
+        return spikes, v_record
+
+    def _awake(self, neuron_ids):
+        """
+        Gets a mask of the given neurons that are away from their resting state: neurons with a membrane potential or
+        a synaptic input above the tolerance, refractory neurons and neurons that fire or change without input. Spike
+        sources are never awake.
+        """
+        tolerance = self.rest_tolerance
+        r_membrane = self.r_membrane[neuron_ids]
+        return ((np.abs(self.v[neuron_ids] - self.v_rest[neuron_ids]) > tolerance) |
+                np.any(np.abs(self.synaptic_input[:, neuron_ids]) * r_membrane > tolerance, axis=0) |
+                (self.refract_timer[neuron_ids] > 0) | (self.i_offset[neuron_ids] != 0.0) |
+                (self.v_rest[neuron_ids] >= self.v_thresh[neuron_ids])) & np.isfinite(self.v_thresh[neuron_ids])
+
+    def _schedule(self, fired, step):
+        """
+        Adds the deliveries of the spikes fired by the given neurons to the priority queue of pending deliveries.
+        """
+        starts = self.indptr[fired]
+        counts = self.indptr[fired + 1] - starts
+        n_connections = counts.sum()
+        if n_connections == 0:
+            return
+
+        edges = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(n_connections)
+        arrivals = step + self.delay[edges]
+        if arrivals.min() == arrivals.max():
+            groups = [(arrivals[0], edges)]
+        else:
+            order = np.argsort(arrivals, kind="stable")
+            bounds = np.flatnonzero(np.diff(arrivals[order])) + 1
+            groups = zip(arrivals[order][np.append(0, bounds)], np.split(edges[order], bounds))
+
+        for arrival, selected in groups:
+            if arrival not in self.pending:
+                self.pending[arrival] = []
+                heapq.heappush(self.pending_steps, arrival)
+            self.pending[arrival].append((self.receptor[selected], self.post[selected], self.weight[selected]))
+
+    def _receive(self, step, is_awake):
+        """
+        Adds the deliveries arriving at the given timestep to the synaptic input of their targets, waking them up.
+        """
+        heapq.heappop(self.pending_steps)
+        receptors, targets, weights = (np.concatenate(arrays) for arrays in zip(*self.pending.pop(step)))
+
+        # Weights accumulated per target before scaling them, as the ring buffers do
+        n = self.total_neurons
+        targets = receptors * n + targets
+        if len(targets) > n // DENSE_FRACTION:
+            weights = np.bincount(targets, weights, minlength=len(RECEPTOR_TYPES) * n).reshape(-1, n)
+            self.synaptic_input += weights * self.syn_init
+            is_awake |= np.any(weights != 0.0, axis=0)
+        else:
+            targets, inverse = np.unique(targets, return_inverse=True)
+            receptors, targets = np.divmod(targets, n)
+            self.synaptic_input[receptors, targets] += np.bincount(inverse, weights) * self.syn_init[receptors, targets]
+            is_awake[targets] = True
+
+    def _advance_events(self, first_step, n_steps, record_spikes, record_v):
+        """
+        Simulates the given number of timesteps with the event-driven engine. Only the neurons away from their resting
+        state are updated (or all of them, when most are awake), and the timesteps without awake neurons, deliveries
+        or source spikes are skipped. Neurons are put to sleep when they get back within the tolerance of their resting
+        state, setting them exactly to rest, so updating a sleeping neuron does not change it.
+
+        :return: The (step, neuron id) rows of the recorded spikes and the recorded membrane potentials.
+        """
+        n = self.total_neurons
+        end_step = first_step + n_steps
+        is_awake = self._awake(np.arange(n))
+
+        # Membrane potentials only change while awake, so the missing values are filled forward at the end
+        v_record = np.full((n_steps, len(record_v)), np.nan)
+        initial_v = self.v[record_v].copy()
+        is_recorded = self.recorded["v"]
+        record_columns = np.zeros(n, dtype=np.int64)
+        record_columns[record_v] = np.arange(len(record_v))
+
+        spike_chunks = []
+        source_start = np.searchsorted(self.source_steps, first_step)
+        step = first_step
+        n_awake = np.count_nonzero(is_awake)
+
+        while True:
+            # Next timestep with work to do
+            if not n_awake:
+                next_steps = [end_step]
+                if self.pending_steps:
+                    next_steps.append(self.pending_steps[0])
+                if source_start < len(self.source_steps):
+                    next_steps.append(self.source_steps[source_start])
+                step = max(step, min(next_steps))
+            if step >= end_step:
+                break
+
+            # Synaptic input arriving at this timestep
+            if self.pending_steps and self.pending_steps[0] == step:
+                self._receive(step, is_awake)
+                n_awake = np.count_nonzero(is_awake)
+
+            # Membrane potential of the non-refractory awake neurons
+            if n_awake > n // DENSE_FRACTION:
+                awake = np.arange(n)
+                index = slice(None)
+            else:
+                awake = np.flatnonzero(is_awake)
+                index = awake
+
+            active = self.refract_timer[index] <= 0
+            synaptic_input = self.synaptic_input[:, index]
+            total_input = synaptic_input[0] - synaptic_input[1] + self.i_offset[index]
+            alpha = total_input * self.r_membrane[index] + self.v_rest[index]
+            v = np.where(active, alpha - self.exp_tau_m[index] * (alpha - self.v[index]), self.v[index])
+            self.refract_timer[awake[~active]] -= 1
+
+            recorded = is_recorded[awake]
+            v_record[step - first_step, record_columns[awake[recorded]]] = v[recorded]
+
+            # Spikes
+            spiked = v >= self.v_thresh[index]
+            v[spiked] = self.v_reset[awake[spiked]]
+            self.v[index] = v
+            self.refract_timer[awake[spiked]] = self.t_refract[awake[spiked]]
+
+            source_end = np.searchsorted(self.source_steps, step, side="right")
+            fired = np.union1d(awake[spiked], self.source_ids[source_start:source_end])
+            source_start = source_end
+
+            self.synaptic_input[:, index] = synaptic_input * self.syn_decay[:, index]
+
+            if len(fired):
+                self._schedule(fired, step)
+                recorded_fired = fired[record_spikes[fired]]
+                if len(recorded_fired):
+                    spike_chunks.append(np.column_stack([np.full(len(recorded_fired), step), recorded_fired]))
+
+            # Neurons back at rest go to sleep
+            still_awake = self._awake(index)
+            sleeping = awake[~still_awake & is_awake[index]]
+            is_awake[index] = still_awake
+            n_awake = np.count_nonzero(is_awake)
+            if len(sleeping):
+                self.v[sleeping] = self.v_rest[sleeping]
+                self.synaptic_input[:, sleeping] = 0.0
+                if step + 1 < end_step:
+                    sleeping = sleeping[is_recorded[sleeping]]
+                    v_record[step + 1 - first_step, record_columns[sleeping]] = self.v_rest[sleeping]
+
+            step += 1
+
+        # Fill the membrane potentials of the sleeping neurons
+        v_record = np.vstack([initial_v, v_record])
+        written = np.where(np.isnan(v_record), 0, np.arange(n_steps + 1)[:, None])
+        v_record = v_record[np.maximum.accumulate(written, axis=0), np.arange(len(record_v))][1:]
+
+        spikes = np.concatenate(spike_chunks) if spike_chunks else np.zeros((0, 2), dtype=np.int64)
+        return spikes, v_record
+
+    def run(self, n_steps):
+        """
+        Simulates the given number of timesteps.
+        """
+        if not self._compiled:
+            self._compile()
+
+        state = {"v": self.v, "synaptic_input": self.synaptic_input, "refract_timer": self.refract_timer,
+                 "ring_buffer": self.ring_buffer}
+        record_v = np.flatnonzero(self.recorded["v"])
+        if self.engine == "event":
+            spikes, v_record = self._advance_events(self.current_step, n_steps, self.recorded["spikes"], record_v)
+        else:
+            spikes, v_record = self._advance(state, self.current_step, n_steps, 1, self.source_steps,
+                                             self.source_ids, self.recorded["spikes"], record_v)
+
+        if len(spikes):
+            self.spike_chunks.append(spikes)
+        if len(record_v):
+            self.v_chunks.append((self.current_step, record_v, v_record))
+        self.current_step += n_steps
+
+    def run_trials(self, n_steps, trial_spike_times):
+        """
+        Simulates the given number of timesteps from the initial state of the network for several independent trials
+        at once. The simulation time and the state of the regular simulation are not modified.
+
+        :param int n_steps: The number of timesteps to simulate.
+        :param dict trial_spike_times: A dictionary mapping spike source populations to a list with the spike times of each trial (in the same format as the spike_times parameter of SpikeSourceArray).
+        :return: The recorded spikes of each trial.
+        :rtype: TrialResults
+        :raise ValueError: If the number of trials is not the same for all the populations or no spikes are recorded.
+        """
+        if not self._compiled:
+            self._compile()
+
+        n_trials = {len(spike_times) for spike_times in trial_spike_times.values()}
+        if len(n_trials) != 1:
+            raise ValueError("The same number of trials is required for all the spike source populations")
+        n_trials = n_trials.pop()
+
+        record_spikes = self.recorded["spikes"]
+        if not np.any(record_spikes):
+            raise ValueError("No spikes are recorded")
+
+        # Spike sources of each trial: the given spike times replace the spike times of their populations
+        n = self.total_neurons
+        replaced = np.zeros(n, dtype=bool)
+        trial_steps = []
+        trial_ids = []
+
+        for population, spike_times in trial_spike_times.items():
+            ids = population._neuron_ids()
+            replaced[ids] = True
+            for trial, trial_times in enumerate(spike_times):
+                celltype = SpikeSourceArray(trial_times)
+                for neuron_id, times in zip(ids, celltype.neuron_spike_times(len(ids))):
+                    trial_steps.append(np.rint(times / self.timestep).astype(np.int64))
+                    trial_ids.append(np.full(len(times), trial * n + neuron_id, dtype=np.int64))
+
+        kept = ~replaced[self.source_ids]
+        for trial in range(n_trials):
+            trial_steps.append(self.source_steps[kept])
+            trial_ids.append(self.source_ids[kept] + trial * n)
+
+        source_steps = np.concatenate(trial_steps)
+        source_ids = np.concatenate(trial_ids)
+        order = np.argsort(source_steps, kind="stable")
+
+        # Initial state of every trial
+        state = {"v": np.tile(self._initial_v(0), n_trials),
+                 "synaptic_input": np.zeros((len(RECEPTOR_TYPES), n_trials * n)),
+                 "refract_timer": np.zeros(n_trials * n, dtype=np.int64),
+                 "ring_buffer": np.zeros((len(RECEPTOR_TYPES), self.ring_buffer.shape[1], n_trials * n))}
+
+        spikes, _ = self._advance(state, 0, n_steps, n_trials, source_steps[order], source_ids[order],
+                                  np.tile(record_spikes, n_trials), np.zeros(0, dtype=np.int64))
+
+        return TrialResults(spikes[:, 0], spikes[:, 1] // n, spikes[:, 1] % n, n_trials, n_steps, self.timestep,
+                            self.total_neurons)
+
+    # Recorded data
+
+    def get_data(self, neuron_ids, variables):
+        spiketrains = []
+        analogsignals = []
+
+        if "spikes" in variables:
+            spikes = np.concatenate(self.spike_chunks) if self.spike_chunks else np.zeros((0, 2), dtype=np.int64)
+            spikes = spikes[np.isin(spikes[:, 1], neuron_ids)]
+            order = np.lexsort((spikes[:, 0], spikes[:, 1]))
+            spikes = spikes[order]
+            bounds = np.searchsorted(spikes[:, 1], neuron_ids), np.searchsorted(spikes[:, 1], neuron_ids, side="right")
+            for start, end in zip(*bounds):
+                spiketrains.append((spikes[start:end, 0] * self.timestep).view(SpikeTrain))
+
+        if "v" in variables:
+            times = []
+            values = []
+            for first_step, record_v, v_record in self.v_chunks:
+                columns = np.searchsorted(record_v, neuron_ids)
+                columns = np.minimum(columns, len(record_v) - 1)
+                valid = record_v[columns] == neuron_ids
+                if not np.any(valid):  # Not recorded or cleared
+                    continue
+                chunk_values = np.full((len(v_record), len(neuron_ids)), np.nan)
+                chunk_values[:, valid] = v_record[:, columns[valid]]
+                values.append(chunk_values)
+                times.append((first_step + np.arange(len(v_record))) * self.timestep)
+
+            signal = (np.concatenate(values) if values else np.zeros((0, len(neuron_ids)))).view(AnalogSignal)
+            signal.name = "v"
+            signal.times = np.concatenate(times) if times else np.zeros(0)
+            signal.sampling_period = self.timestep
+            analogsignals.append(signal)
+
+        return Segment(spiketrains, analogsignals)
+
+    def clear_data(self, neuron_ids):
+        self.spike_chunks = [chunk[~np.isin(chunk[:, 1], neuron_ids)] for chunk in self.spike_chunks]
+
+        v_chunks = []
+        for first_step, record_v, v_record in self.v_chunks:
+            kept = ~np.isin(record_v, neuron_ids)
+            if np.any(kept):
+                v_chunks.append((first_step, record_v[kept], v_record[:, kept]))
+        self.v_chunks = v_chunks
+
+    def reset(self):
+        """
+        Sets the time back to zero and the neurons to their initial state, keeping the network and the recorded
+        variables.
+        """
+        self._resize_state()
+        self.current_step = 0
+        self.v = self._initial_v(0)
+        self.synaptic_input[:] = 0.0
+        self.refract_timer[:] = 0
+        self.ring_buffer[:] = 0.0
+        self.pending_steps = []
+        self.pending = {}
+        self.spike_chunks = []
+        self.v_chunks = []
+
+
+_simulator = _Simulator()
+
+
+# --- Simulator control ---
+
+def setup(timestep=1.0, min_delay=None, max_delay=None, engine="step", rest_tolerance=1e-9, **kwargs):
+    """
+    Initializes the simulator, removing any previous network.
+
+    :param float timestep: The simulation timestep (ms). 1.0 by default.
+    :param min_delay: Unused.
+    :param max_delay: Unused.
+    :param str engine: The simulation engine: "step" (all the neurons are updated every timestep) or "event" (only the neurons away from their resting state are updated). "step" by default. The trials of run_trials are always simulated with the "step" engine.
+    :param float rest_tolerance: The largest deviation from the resting state (mV) of the neurons put to sleep by the "event" engine. 1e-9 by default.
+    :return: The rank of the process (always 0).
+    :rtype: int
+    :raise ValueError: If the engine is unknown.
+    """
+    global _simulator
+    _simulator = _Simulator(timestep, engine, rest_tolerance)
+
+    # The objects kept by the library for the previous network are no longer valid
+    clear_simulator_state(sys.modules[__name__])
+    return 0
+
+
+def run(simtime):
+    """
+    Runs the simulation for the given time, continuing from the end of the previous run.
+
+    :param float simtime: The simulation time (ms).
+    :return: The current simulation time (ms).
+    :rtype: float
+    """
+    _simulator.run(int(round(simtime / _simulator.timestep)))
+    return get_current_time()
+
+
+def run_trials(simtime, trial_spike_times):
+    """
+    Simulates several independent trials of the network at once, each of them with its own input spikes, as a single
+    vectorized run from the initial state. Only the recorded spikes are returned. The regular simulation is not
+    modified.
+
+    :param float simtime: The simulation time of each trial (ms).
+    :param dict trial_spike_times: A dictionary mapping spike source populations to a list with the spike times of each trial (in the same format as the spike_times parameter of SpikeSourceArray). The rest of the sources keep their spike times in all the trials.
+    :return: The recorded spikes of each trial.
+    :rtype: TrialResults
+    """
+    return _simulator.run_trials(int(round(simtime / _simulator.timestep)), trial_spike_times)
+
+
+def reset():
+    """
+    Sets the simulation time back to zero and the neurons to their initial state.
+
+    :return: None
+    """
+    _simulator.reset()
+
+
+def end():
+    """
+    Finishes the simulation, removing the network.
+
+    :return: None
+    """
+    setup(_simulator.timestep, engine=_simulator.engine, rest_tolerance=_simulator.rest_tolerance)
+
+
+def is_active():
+    """
+    Checks whether a network has been built since the last call to setup or end.
+
+    :return: True if the simulator contains any population.
+    :rtype: bool
+    """
+    return len(_simulator.populations) > 0
+
+
+def get_current_time():
+    return _simulator.current_step * _simulator.timestep
+
+
+def get_time_step():
+    return _simulator.timestep
@@ -0,0 +1,132 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import sPyBlocks.numpy_backend as numpy_backend
+
+# Idealized neuron parameters, used to get the reference response of the blocks
+IDEAL_NEURON_PARAMS = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                       "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+
+def parameter_grid(base_params=None, **values):
+    """
+    Gets all the combinations of the given parameter values.
+
+    :param dict base_params: A dictionary containing the neuron parameters that are not swept. IDEAL_NEURON_PARAMS by default.
+    :param values: A list of values for each swept parameter (for example, tau_syn_E=[0.1, 0.5, 1.0]).
+    :return: A list containing a dictionary of neuron parameters for each combination.
+    :rtype: list
+    """
+    if base_params is None:
+        base_params = IDEAL_NEURON_PARAMS
+
+    names = list(values.keys())
+    return [dict(base_params, **dict(zip(names, combination)))
+            for combination in itertools.product(*[values[name] for name in names])]
+
+
+def simulate_block(block_factory, neuron_params, simtime, timestep=1.0):
+    """
+    Builds a block with the NumPy backend and simulates it, recording the spikes and the membrane potential of the
+    neurons returned by the factory. The simulator is set up and ended in the current process, so this is refused
+    while another network is built with the NumPy backend (see numpy_backend.is_active), as it would be removed together
+    with the objects the library keeps for it (see clear_simulator_state).
+
+    :param block_factory: A function receiving the simulator package and the neuron parameters, which builds the block and its input spike sources and returns a list of PyNN objects whose neurons are watched.
+    :param dict neuron_params: A dictionary containing the neuron parameters.
+    :param float simtime: The simulation time (ms).
+    :param float timestep: The simulation timestep (ms). 1.0 by default.
+    :return: A tuple (spikes, voltages) of arrays with a row for each timestep and a column for each watched neuron.
+    :rtype: tuple
+    :raise RuntimeError: If a network is already built with the NumPy backend.
+    """
+    sim = numpy_backend
+    if sim.is_active():
+        raise RuntimeError("A network is already built with the NumPy backend, end it before simulating a block")
+    sim.setup(timestep=timestep)
+
+    watched = sim.Assembly(*block_factory(sim, neuron_params))
+    watched.record(('spikes', 'v'))
+    sim.run(simtime)
+
+    segment = watched.get_data(variables=["spikes", "v"]).segments[0]
+    n_steps = int(round(simtime / timestep))
+    spikes = np.zeros((n_steps, watched.size), dtype=bool)
+    for i, spiketrain in enumerate(segment.spiketrains):
+        spikes[np.rint(np.asarray(spiketrain) / timestep).astype(int), i] = True
+    voltages = np.asarray(segment.analogsignals[0])
+
+    sim.end()
+    return spikes, voltages
+
+
+def _evaluate(arguments):
+    """
+    Simulates a block with a set of neuron parameters and compares its response with the reference one.
+    """
+    block_factory, neuron_params, simtime, timestep, reference_spikes, rest_tolerance = arguments
+    spikes, voltages = simulate_block(block_factory, neuron_params, simtime, timestep)
+
+    threshold = neuron_params["v_thresh"]
+    disturbed = np.abs(voltages - neuron_params["v_rest"]) > rest_tolerance
+
+    # Longest time a watched neuron stays away from its resting potential
+    longest_run = 0
+    for column in disturbed.T:
+        edges = np.diff(np.concatenate([[0], column.astype(np.int8), [0]]))
+        runs = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+        longest_run = max(longest_run, runs.max() if len(runs) else 0)
+
+    return {"correct": bool(np.array_equal(spikes, reference_spikes)),
+            "missing_spikes": int(np.count_nonzero(reference_spikes & ~spikes)),
+            "extra_spikes": int(np.count_nonzero(spikes & ~reference_spikes)),
+            "fire_margin": float(np.min(voltages[spikes] - threshold)) if spikes.any() else np.inf,
+            "rest_margin": float(np.min(threshold - voltages[~spikes])) if (~spikes).any() else np.inf,
+            "recovery_time": float(longest_run * timestep)}
+
+
+def parameter_sweep(block_factory, param_grid, simtime, reference_params=None, timestep=1.0, rest_tolerance=0.01,
+                    only_correct=True, max_workers=None):
+    """
+    Simulates a block with every set of neuron parameters of a grid using a pool of processes, and checks whether it
+    behaves as with the reference parameters (that is, whether the watched neurons fire exactly the same spikes).
+
+    The resulting table includes, for each set of parameters, the number of missing and extra spikes, the voltage
+    margins of the watched neurons (the smallest excess over the threshold when firing and the smallest distance to
+    the threshold when not firing) and the recovery time (the longest time a watched neuron stays away from its resting
+    potential, which bounds the time between input spikes).
+
+    :param block_factory: A function receiving the simulator package and the neuron parameters, which builds the block and its input spike sources and returns a list of PyNN objects whose neurons are watched. It must be defined at module level, so it can be sent to other processes.
+    :param list param_grid: A list of dictionaries of neuron parameters (see parameter_grid).
+    :param float simtime: The simulation time (ms).
+    :param dict reference_params: A dictionary containing the neuron parameters that give the expected response. IDEAL_NEURON_PARAMS by default.
+    :param float timestep: The simulation timestep (ms). 1.0 by default.
+    :param float rest_tolerance: The largest distance to the resting potential (mV) considered at rest. 0.01 by default.
+    :param bool only_correct: A boolean indicating whether or not to include only the sets of parameters with the expected response. True by default.
+    :param int max_workers: The number of processes. The number of processors of the machine by default. If it is 1, the simulations are run in the current process, which is refused while a network is built with the NumPy backend (see simulate_block). Otherwise, all the simulations (including the reference one) are run in the pool, and the network of the current process is not modified.
+    :return: A list of dictionaries containing the neuron parameters and the results of each simulation, sorted by decreasing voltage margin.
+    :rtype: list
+    """
+    if reference_params is None:
+        reference_params = IDEAL_NEURON_PARAMS
+
+    if max_workers == 1:
+        reference_spikes, _ = simulate_block(block_factory, reference_params, simtime, timestep)
+        results = [_evaluate((block_factory, neuron_params, simtime, timestep, reference_spikes, rest_tolerance))
+                   for neuron_params in param_grid]
+    else:
+        # The workers discard the network they may have inherited from the current process
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=numpy_backend.end) as executor:
+            reference_spikes, _ = executor.submit(simulate_block, block_factory, reference_params, simtime,
+                                                  timestep).result()
+            arguments = [(block_factory, neuron_params, simtime, timestep, reference_spikes, rest_tolerance)
+                         for neuron_params in param_grid]
+            results = list(executor.map(_evaluate, arguments, chunksize=max(1, len(arguments) // 64)))
+
+    table = [dict(neuron_params, **result) for neuron_params, result in zip(param_grid, results)
+             if result["correct"] or not only_correct]
+    table.sort(key=lambda row: -min(row["fire_margin"], row["rest_margin"]))
+
+    return table
@@ -0,0 +1,244 @@
+from math import ceil, log2
+
+import numpy as np
+
+from sPyBlocks.netlist import Netlist
+from sPyBlocks.neural_decoder import NeuralDecoder
+from sPyBlocks.neural_memory import NeuralMemory
+from sPyBlocks.neural_muxdemux import NeuralMuxDemux
+
+# Neurons per core of the sPyNNaker IF_curr_exp model (SpiNNaker 1)
+NEURONS_PER_CORE = 256
+
+# Neuron parameters used by the dry runs (they do not change the structure of the blocks)
+_DRY_RUN_NEURON_PARAMS = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                          "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+
+def _cores(population_sizes, neurons_per_core):
+    """
+    Gets the number of cores needed to simulate a set of populations, as every population is split into parts of at most
+    neurons_per_core neurons and each part is placed on its own core.
+    """
+    return int(sum(ceil(size / neurons_per_core) for size in population_sizes))
+
+
+def netlist_resources(netlist, neurons_per_core=NEURONS_PER_CORE):
+    """
+    Gets the resources used by all the neurons and connections recorded in a netlist.
+
+    The returned dictionary contains the number of neurons, the number of synapses by receptor type (excitatory and
+    inhibitory) and in total, the maximum fan-in and fan-out of the neurons, the number of projections and populations
+    created while building, and the estimated number of cores, both for the populations as built ("cores") and for the
+    pools emitted when the netlist is materialized ("materialized_cores").
+
+    :param Netlist netlist: The netlist containing the design.
+    :param int neurons_per_core: The maximum number of neurons of a population placed on a single core. 256 by default.
+    :return: A dictionary containing the resources.
+    :rtype: dict
+    """
+    edges = netlist.edges()
+    receptors = np.bincount(edges["receptor"].astype(np.int64), minlength=2)
+
+    # Populations with the same dynamics are pooled together when materialized
+    pools = {}
+    for population in netlist.populations:
+        pool_key = Netlist.pool_key(population)
+        pools[pool_key] = pools.get(pool_key, 0) + population.size
+
+    return {"neurons": netlist.total_neurons,
+            "excitatory_synapses": int(receptors[0]),
+            "inhibitory_synapses": int(receptors[1]),
+            "synapses": len(edges["pre"]),
+            "max_fan_in": int(np.bincount(edges["post"]).max()) if len(edges["post"]) else 0,
+            "max_fan_out": int(np.bincount(edges["pre"]).max()) if len(edges["pre"]) else 0,
+            "projections": netlist.total_projections,
+            "populations": len(netlist.populations),
+            "cores": _cores([population.size for population in netlist.populations], neurons_per_core),
+            "materialized_cores": _cores(pools.values(), neurons_per_core)}
+
+
+def dry_run_resources(block_class, *args, global_params=None, neuron_params=None,
+                      neurons_per_core=NEURONS_PER_CORE, **kwargs):
+    """
+    Builds a block in a new Netlist (no simulator is needed) and gets the resources it uses (see netlist_resources).
+    Only the block is built, so the connections of its input and output ports are not included. This works for every
+    block class of the library.
+
+    :param type block_class: The class of the block (for example, NeuralMemory).
+    :param args: The arguments of the constructor preceding the simulator package (for example, n_dir and width).
+    :param dict global_params: The global parameters of the block. {"min_delay": 1.0} by default.
+    :param dict neuron_params: The neuron parameters of the block. The idealized parameters by default.
+    :param int neurons_per_core: The maximum number of neurons of a population placed on a single core. 256 by default.
+    :param kwargs: The keyword arguments of the constructor (for example, and_type).
+    :return: A dictionary containing the resources.
+    :rtype: dict
+    """
+    if global_params is None:
+        global_params = {"min_delay": 1.0}
+    if neuron_params is None:
+        neuron_params = _DRY_RUN_NEURON_PARAMS
+
+    netlist = Netlist()
+    std_conn = netlist.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+    block_class(*args, netlist, global_params, neuron_params, std_conn, **kwargs)
+
+    return netlist_resources(netlist, neurons_per_core)
+
+
+def _and_size(and_type):
+    """
+    Gets the number of neurons of an AND block of the given variant (the classic variant has an internal OR neuron).
+    """
+    if and_type == "classic":
+        return 2
+    elif and_type == "fast":
+        return 1
+    raise ValueError("This type of AND gate is not implemented.")
+
+
+def _resources(neurons, excitatory, inhibitory, max_fan_in, max_fan_out, pooled_populations, pooled_cores,
+               pooled, neurons_per_core):
+    """
+    Gathers the resources of a block computed in closed form. Every internal connection of the blocks joins two single
+    neurons, so a projection is created for each synapse, and all the neurons share the same dynamics, so they are
+    pooled into a single population when materialized. Without pooling, every neuron is a population of its own.
+    """
+    return {"neurons": neurons,
+            "excitatory_synapses": excitatory,
+            "inhibitory_synapses": inhibitory,
+            "synapses": excitatory + inhibitory,
+            "max_fan_in": max_fan_in,
+            "max_fan_out": max_fan_out,
+            "projections": excitatory + inhibitory,
+            "populations": pooled_populations if pooled else neurons,
+            "cores": pooled_cores if pooled else neurons,
+            "materialized_cores": ceil(neurons / neurons_per_core)}
+
+
+def decoder_resources(n_inputs, and_type="classic", global_params=None, neurons_per_core=NEURONS_PER_CORE):
+    """
+    Gets the resources used by a NeuralDecoder block in closed form (see netlist_resources).
+
+    :param int n_inputs: The number of inputs of the decoder.
+    :param str and_type: A string indicating the AND variant ("classic" or "fast"). "classic" by default.
+    :param dict global_params: The global parameters of the block. Only the "pooled" keyword is used.
+    :param int neurons_per_core: The maximum number of neurons of a population placed on a single core. 256 by default.
+    :return: A dictionary containing the resources.
+    :rtype: dict
+    :raise ValueError: If the and_type string is not "classic" or "fast".
+    """
+    pooled = global_params is not None and global_params.get("pooled", False)
+    and_size = _and_size(and_type)
+    n_outputs = 2 ** n_inputs
+
+    # Each NOT neuron excites the AND blocks of the half of the outputs where its input is 0
+    not_fan_out = n_outputs // 2 * and_size
+
+    return _resources(neurons=n_inputs + n_outputs * and_size,
+                      excitatory=n_inputs * not_fan_out,
+                      inhibitory=n_outputs * (and_size - 1),
+                      max_fan_in=n_inputs + and_size - 1,
+                      max_fan_out=not_fan_out,
+                      pooled_populations=1 + and_size,
+                      pooled_cores=ceil(n_inputs / neurons_per_core) + and_size * ceil(n_outputs / neurons_per_core),
+                      pooled=pooled, neurons_per_core=neurons_per_core)
+
+
+def muxdemux_resources(n_select, build_type="mux", and_type="classic", global_params=None,
+                       neurons_per_core=NEURONS_PER_CORE):
+    """
+    Gets the resources used by a NeuralMuxDemux block in closed form (see netlist_resources).
+
+    :param int n_select: The number of select inputs of the block.
+    :param str build_type: A string indicating the block variant ("mux" or "demux"). "mux" by default.
+    :param str and_type: A string indicating the AND variant ("classic" or "fast"). "classic" by default.
+    :param dict global_params: The global parameters of the block. Only the "pooled" keyword is used.
+    :param int neurons_per_core: The maximum number of neurons of a population placed on a single core. 256 by default.
+    :return: A dictionary containing the resources.
+    :rtype: dict
+    :raise ValueError: If the build_type string is not "mux" or "demux", or the and_type string is not "classic" or "fast".
+    """
+    if build_type != "mux" and build_type != "demux":
+        raise ValueError("This build type is not implemented.")
+
+    resources = decoder_resources(n_select, and_type=and_type, global_params=global_params,
+                                  neurons_per_core=neurons_per_core)
+
+    # The multiplexer adds an OR neuron gathering the outputs of all the AND blocks
+    if build_type == "mux":
+        n_outputs = 2 ** n_select
+        pooled = global_params is not None and global_params.get("pooled", False)
+
+        resources = _resources(neurons=resources["neurons"] + 1,
+                               excitatory=resources["excitatory_synapses"] + n_outputs,
+                               inhibitory=resources["inhibitory_synapses"],
+                               max_fan_in=max(resources["max_fan_in"], n_outputs),
+                               max_fan_out=resources["max_fan_out"],
+                               pooled_populations=resources["populations"] + 1,
+                               pooled_cores=resources["cores"] + 1,
+                               pooled=pooled, neurons_per_core=neurons_per_core)
+
+    return resources
+
+
+def memory_resources(n_dir, width, and_type="classic", global_params=None, neurons_per_core=NEURONS_PER_CORE):
+    """
+    Gets the resources used by a NeuralMemory block in closed form (see netlist_resources).
+
+    :param int n_dir: The number of registers (addresses) of the memory.
+    :param int width: The number of bits of each register.
+    :param str and_type: A string indicating the AND variant ("classic" or "fast"). "classic" by default.
+    :param dict global_params: The global parameters of the block. Only the "pooled" keyword is used.
+    :param int neurons_per_core: The maximum number of neurons of a population placed on a single core. 256 by default.
+    :return: A dictionary containing the resources.
+    :rtype: dict
+    :raise ValueError: If the and_type string is not "classic" or "fast".
+    """
+    pooled = global_params is not None and global_params.get("pooled", False)
+    and_size = _and_size(and_type)
+    capacity = n_dir * width
+
+    decoder = decoder_resources(ceil(log2(n_dir + 1)), and_type=and_type, global_params=global_params,
+                                neurons_per_core=neurons_per_core)
+
+    # Each D latch has two AND blocks and a SR latch neuron (excited by its set AND block and by itself, and inhibited
+    # by its reset AND block). The NOT neuron of each bit feeds the reset AND block of the latches of that bit, and each
+    # decoder output feeds both AND blocks of the latches of its register
+    latch_excitatory = 2 + and_size + 2 * and_size
+    latch_inhibitory = 1 + 2 * (and_size - 1)
+
+    return _resources(neurons=decoder["neurons"] + width + capacity * (2 * and_size + 1),
+                      excitatory=decoder["excitatory_synapses"] + capacity * latch_excitatory,
+                      inhibitory=decoder["inhibitory_synapses"] + capacity * latch_inhibitory,
+                      max_fan_in=max(decoder["max_fan_in"], 3),
+                      max_fan_out=max(decoder["max_fan_out"], 2 * and_size * width, n_dir * and_size),
+                      pooled_populations=decoder["populations"] + 1 + capacity * (and_size + 1),
+                      pooled_cores=decoder["cores"] + ceil(width / neurons_per_core) + capacity * (and_size + 1),
+                      pooled=pooled, neurons_per_core=neurons_per_core)
+
+
+# Blocks whose resources can be computed in closed form
+CLOSED_FORMS = {NeuralDecoder: decoder_resources, NeuralMuxDemux: muxdemux_resources, NeuralMemory: memory_resources}
+
+
+def estimate_resources(block_class, *args, global_params=None, neurons_per_core=NEURONS_PER_CORE, **kwargs):
+    """
+    Estimates the resources used by a block without building it in a simulator (see netlist_resources). The closed
+    form of the block is used when there is one (see CLOSED_FORMS), as it takes no time even for the largest blocks.
+    Otherwise, the block is built in a new Netlist (see dry_run_resources).
+
+    :param type block_class: The class of the block (for example, NeuralMemory).
+    :param args: The arguments of the constructor preceding the simulator package (for example, n_dir and width).
+    :param dict global_params: The global parameters of the block. {"min_delay": 1.0} by default.
+    :param int neurons_per_core: The maximum number of neurons of a population placed on a single core. 256 by default.
+    :param kwargs: The keyword arguments of the constructor (for example, and_type).
+    :return: A dictionary containing the resources.
+    :rtype: dict
+    """
+    if block_class in CLOSED_FORMS:
+        return CLOSED_FORMS[block_class](*args, global_params=global_params, neurons_per_core=neurons_per_core,
+                                         **kwargs)
+
+    return dry_run_resources(block_class, *args, global_params=global_params, neurons_per_core=neurons_per_core,
+                             **kwargs)
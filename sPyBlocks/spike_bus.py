@@ -0,0 +1,54 @@
+class SpikeBus:
+    """
+    This class defines a multi-channel spike source, which holds all the channels of a bus (for example, the signal
+    lines of a decoder or the data bits of a memory) in a single SpikeSourceArray population. It can be passed directly
+    to the connect functions of any block, selecting the channels with the same indices used for lists of
+    populations, so an n-bit bus costs one source population instead of n.
+    """
+    def __init__(self, sim, spike_times, label=None):
+        """
+        Constructor of the class.
+
+        :param sim: The simulator package.
+        :param list spike_times: A list containing a list of spike times (ms) for each channel.
+        :param str label: The label of the population. None by default.
+        """
+        # Storing parameters
+        self.sim = sim
+        self.n_channels = len(spike_times)
+
+        # Neuron and connection amounts
+        self.total_neurons = 0
+        self.total_input_connections = 0
+        self.total_internal_connections = 0
+        self.total_output_connections = 0
+
+        # Create the neurons
+        self.population = sim.Population(self.n_channels, sim.SpikeSourceArray(spike_times=list(spike_times)),
+                                         label=label)
+        self.channels = [sim.PopulationView(self.population, [i]) for i in range(self.n_channels)]
+
+        self.total_neurons += self.population.size
+
+        # Total internal delay
+        self.delay = 0
+
+    @property
+    def size(self):
+        return self.population.size
+
+    def __len__(self):
+        return self.n_channels
+
+    def __getitem__(self, channel):
+        return self.channels[channel]
+
+    def get_output_neurons(self, flat=False):
+        """
+        Gets the output neurons of the block, that is, a view of each channel.
+
+        :param bool flat: A boolean indicating whether or not to flatten the output. It has no effect, as the list of channels is already flat.
+        :return: A list containing the view of each channel.
+        :rtype: list
+        """
+        return list(self.channels)
@@ -0,0 +1,125 @@
+import numpy as np
+
+from sPyBlocks.connection_functions import iter_flatten, neuron_indexes
+
+
+def block_ports(block):
+    """
+    Gets the names of the ports of a block, that is, the names of its get_<port>_neurons methods (for example, "data",
+    "signal" and "output" for a NeuralMemory).
+
+    :param block: A spiking functional block.
+    :return: A list containing the port names.
+    :rtype: list
+    """
+    return [name[4:-8] for name in dir(block)
+            if name.startswith("get_") and name.endswith("_neurons") and callable(getattr(block, name))]
+
+
+def spike_matrix(spiketrains, n_steps, timestep=1.0):
+    """
+    Converts a list of spike trains into a dense boolean matrix without iterating over the timesteps.
+
+    :param list spiketrains: A list of spike trains (or arrays of spike times in ms).
+    :param int n_steps: The number of timesteps (rows) of the matrix.
+    :param float timestep: The simulation timestep (ms). 1.0 by default.
+    :return: A boolean array with a row for each timestep and a column for each spike train.
+    :rtype: np.ndarray
+    """
+    times = [np.asarray(spiketrain, dtype=float).ravel() for spiketrain in spiketrains]
+    lengths = [len(spike_times) for spike_times in times]
+    steps = np.rint(np.concatenate(times) / timestep).astype(np.int64) if times else np.zeros(0, dtype=np.int64)
+    columns = np.repeat(np.arange(len(times)), lengths)
+
+    matrix = np.zeros((n_steps, len(times)), dtype=bool)
+    in_range = steps < n_steps
+    matrix[steps[in_range], columns[in_range]] = True
+    return matrix
+
+
+class SpikeReadout:
+    """
+    This class records the spikes of named groups of neurons (by default, the ports of a block) with a single recording
+    call, and reads them back as a dense matrix with a row for each timestep and a column for each neuron. The neurons
+    of each group are assigned consecutive columns, in the order given by their PyNN objects, and neurons belonging to
+    several groups share the same column.
+    """
+    def __init__(self, sim, block=None, ports=None, groups=None):
+        """
+        Constructor of the class. The root populations of all the neurons are recorded with one call.
+
+        :param sim: The simulator package.
+        :param block: A spiking functional block whose ports are recorded. None by default.
+        :param list ports: The names of the ports of the block to be recorded. All of them by default (see block_ports).
+        :param dict groups: A dictionary mapping group names to PyNN objects (or lists of PyNN objects) to be recorded in addition to the ports. None by default.
+        """
+        # Storing parameters
+        self.sim = sim
+
+        named_objects = {}
+        if block is not None:
+            for port in (block_ports(block) if ports is None else ports):
+                named_objects[port] = getattr(block, "get_" + port + "_neurons")()
+        if groups is not None:
+            named_objects.update(groups)
+
+        # Root populations and columns of each group
+        self.populations = []
+        population_indexes = {}
+        neuron_columns = {}
+        self.columns = {}
+
+        for name, objects in named_objects.items():
+            group_columns = []
+            for obj in iter_flatten(objects):
+                for population, indexes in neuron_indexes(obj):
+                    index = population_indexes.setdefault(id(population), len(self.populations))
+                    if index == len(self.populations):
+                        self.populations.append(population)
+                    for neuron in np.asarray(indexes).tolist():
+                        group_columns.append(neuron_columns.setdefault((index, neuron), len(neuron_columns)))
+            self.columns[name] = np.array(group_columns, dtype=np.int64)
+
+        # Position of the neuron of each column in the recorded assembly
+        offsets = np.cumsum([0] + [population.size for population in self.populations])
+        neurons = np.array(list(neuron_columns.keys()), dtype=np.int64).reshape(-1, 2)
+        self._positions = offsets[neurons[:, 0]] + neurons[:, 1]
+
+        # Recording
+        self.assembly = sim.Assembly(*self.populations)
+        self.assembly.record(('spikes'))
+
+    @property
+    def n_columns(self):
+        return len(self._positions)
+
+    def get_matrix(self, n_steps=None, packed=False):
+        """
+        Gets the recorded spikes as a matrix with a row for each timestep and a column for each recorded neuron.
+
+        :param int n_steps: The number of timesteps. All the simulated timesteps by default.
+        :param bool packed: A boolean indicating whether or not to pack the columns into bits (see np.packbits, with little bit order). False by default.
+        :return: A boolean array, or an uint8 array when packed.
+        :rtype: np.ndarray
+        """
+        timestep = self.sim.get_time_step()
+        if n_steps is None:
+            n_steps = int(round(self.sim.get_current_time() / timestep))
+
+        spiketrains = self.assembly.get_data(variables=["spikes"]).segments[0].spiketrains
+        matrix = spike_matrix([spiketrains[position] for position in self._positions], n_steps, timestep)
+
+        if packed:
+            return np.packbits(matrix, axis=1, bitorder="little")
+        return matrix
+
+    def get_groups(self, n_steps=None):
+        """
+        Gets the recorded spikes of each group.
+
+        :param int n_steps: The number of timesteps. All the simulated timesteps by default.
+        :return: A dictionary mapping each group name to a boolean array with a row for each timestep and a column for each neuron of the group.
+        :rtype: dict
+        """
+        matrix = self.get_matrix(n_steps)
+        return {name: matrix[:, columns] for name, columns in self.columns.items()}
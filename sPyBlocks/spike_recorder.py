@@ -0,0 +1,122 @@
+import os
+from bisect import bisect_left
+
+import numpy as np
+
+from sPyBlocks.spike_readout import SpikeReadout
+
+# Data type of the spike records stored in the files
+RECORD_DTYPE = np.dtype([("neuron", np.int32), ("step", np.int64)])
+
+
+class SpikeRecorder(SpikeReadout):
+    """
+    This class records the spikes of named groups of neurons (by default, the ports of a block) into a file while the
+    simulation runs. The simulation is run in chunks, and the spikes of each chunk are appended to the file as raw
+    (neuron, step) records and cleared from the simulator, so long runs use a constant amount of memory. The neuron of
+    each record is its column in the readout (see SpikeReadout.columns), and the records are sorted by timestep.
+    """
+    def __init__(self, sim, file_name, block=None, ports=None, groups=None, chunk_time=1000.0):
+        """
+        Constructor of the class. The root populations of all the neurons are recorded with one call, and the file is
+        created empty.
+
+        :param sim: The simulator package.
+        :param str file_name: Name of the file where the spike records are stored.
+        :param block: A spiking functional block whose ports are recorded. None by default.
+        :param list ports: The names of the ports of the block to be recorded. All of them by default.
+        :param dict groups: A dictionary mapping group names to PyNN objects (or lists of PyNN objects) to be recorded in addition to the ports. None by default.
+        :param float chunk_time: The simulation time of each chunk (ms). 1000.0 by default.
+        """
+        super().__init__(sim, block, ports, groups)
+
+        # Storing parameters
+        self.file_name = file_name
+        self.chunk_time = chunk_time
+        self.total_spikes = 0
+
+        open(file_name, "wb").close()
+
+    def run(self, simtime):
+        """
+        Runs the simulation for the given time in chunks, appending the recorded spikes of each chunk to the file.
+
+        :param float simtime: The simulation time (ms).
+        :return: The current simulation time (ms).
+        :rtype: float
+        """
+        timestep = self.sim.get_time_step()
+        end_time = self.sim.get_current_time() + simtime
+
+        while self.sim.get_current_time() < end_time - timestep / 2:
+            first_step = int(round(self.sim.get_current_time() / timestep))
+            self.sim.run(min(self.chunk_time, end_time - self.sim.get_current_time()))
+            end_step = int(round(self.sim.get_current_time() / timestep))
+
+            spiketrains = self.assembly.get_data(variables=["spikes"], clear=True).segments[0].spiketrains
+            self._append([spiketrains[position] for position in self._positions], first_step, end_step, timestep)
+
+        return self.sim.get_current_time()
+
+    def _append(self, spiketrains, first_step, end_step, timestep):
+        """
+        Appends the spikes of a chunk to the file, discarding the spikes of previous chunks in case the simulator does
+        not clear them.
+        """
+        times = [np.asarray(spiketrain, dtype=float).ravel() for spiketrain in spiketrains]
+        steps = np.rint(np.concatenate(times) / timestep).astype(np.int64) if times else np.zeros(0, dtype=np.int64)
+        neurons = np.repeat(np.arange(len(times), dtype=np.int32), [len(spike_times) for spike_times in times])
+
+        in_chunk = (steps >= first_step) & (steps < end_step)
+        records = np.empty(np.count_nonzero(in_chunk), dtype=RECORD_DTYPE)
+        records["neuron"] = neurons[in_chunk]
+        records["step"] = steps[in_chunk]
+        records.sort(order=["step", "neuron"])
+
+        with open(self.file_name, "ab") as file:
+            file.write(records.tobytes())
+        self.total_spikes += len(records)
+
+    def load(self):
+        """
+        Gets the records stored in the file (see load_spikes).
+
+        :return: A memory-mapped array of spike records.
+        :rtype: np.memmap
+        """
+        return load_spikes(self.file_name)
+
+
+def load_spikes(file_name):
+    """
+    Maps a file of spike records into memory, so it can be read lazily.
+
+    :param str file_name: Name of the file.
+    :return: A read-only memory-mapped structured array with the fields "neuron" and "step", sorted by step.
+    :rtype: np.memmap
+    """
+    if os.path.getsize(file_name) == 0:  # Empty files cannot be mapped
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(file_name, dtype=RECORD_DTYPE, mode="r")
+
+
+def spike_window(records, first_step, n_steps, n_neurons):
+    """
+    Gets the spikes of a time window from an array of spike records as a dense matrix. Only the records of the window
+    are read, as they are located with a binary search.
+
+    :param np.ndarray records: An array of spike records sorted by step (see load_spikes).
+    :param int first_step: The first timestep of the window.
+    :param int n_steps: The number of timesteps of the window.
+    :param int n_neurons: The number of neurons (columns) of the matrix.
+    :return: A boolean array with a row for each timestep of the window and a column for each neuron.
+    :rtype: np.ndarray
+    """
+    steps = records["step"]  # Element by element search, as np.searchsorted would read the whole array
+    start = bisect_left(steps, first_step)
+    end = bisect_left(steps, first_step + n_steps, lo=start)
+    window = np.asarray(records[start:end])
+
+    matrix = np.zeros((n_steps, n_neurons), dtype=bool)
+    matrix[window["step"] - first_step, window["neuron"]] = True
+    return matrix
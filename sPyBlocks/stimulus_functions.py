@@ -0,0 +1,155 @@
+import warnings
+
+import numpy as np
+
+from sPyBlocks.spike_bus import SpikeBus
+from sPyBlocks.timing_analysis import memory_interval
+
+# Actions taken when a spike schedule is faster than the minimum inter-stimulus interval
+VIOLATION_ACTIONS = ("raise", "warn", "ignore")
+
+# Data type of the memory transactions
+TRANSACTION_DTYPE = np.dtype([("time", np.float64), ("address", np.int64), ("data", np.uint64)])
+
+
+def as_transactions(transactions):
+    """
+    Converts an array of memory transactions into a structured array sorted by time.
+
+    :param np.ndarray transactions: A structured array with the fields "time", "address" and "data", or an array with a (time, address, data) row for each transaction.
+    :return: A structured array of TRANSACTION_DTYPE.
+    :rtype: np.ndarray
+    """
+    if isinstance(transactions, np.ndarray) and transactions.dtype.names is not None:
+        converted = np.empty(len(transactions), dtype=TRANSACTION_DTYPE)
+        for name in TRANSACTION_DTYPE.names:
+            converted[name] = transactions[name]
+    else:
+        rows = np.asarray(transactions).reshape(-1, 3)
+        converted = np.empty(len(rows), dtype=TRANSACTION_DTYPE)
+        converted["time"] = rows[:, 0]
+        converted["address"] = rows[:, 1]
+        converted["data"] = rows[:, 2]
+
+    return converted[np.argsort(converted["time"], kind="stable")]
+
+
+def check_spike_intervals(spike_times, min_interval, on_violation="raise"):
+    """
+    Checks that the consecutive spikes of each line of a spike schedule are separated by at least the minimum
+    inter-stimulus interval of the inputs they feed (see TimingAnalysis.port_intervals). Faster schedules overlap the
+    response of the block to consecutive inputs, corrupting it silently.
+
+    :param list spike_times: A list containing the spike times (ms) of each line.
+    :param float min_interval: The minimum interval (ms).
+    :param str on_violation: The action taken when the schedule is too fast: "raise" (an exception), "warn" (a RuntimeWarning) or "ignore" (nothing, the spikes are only returned). "raise" by default.
+    :return: A list of (line, time) tuples with the spikes that come too early after the previous spike of their line.
+    :rtype: list
+    :raise ValueError: If on_violation is not supported, or if it is "raise" and the schedule is too fast.
+    """
+    if on_violation not in VIOLATION_ACTIONS:
+        raise ValueError("Unsupported action " + str(on_violation) + ", it must be one of " +
+                         ", ".join(VIOLATION_ACTIONS))
+
+    violations = []
+    for line, times in enumerate(spike_times):
+        times = np.sort(np.asarray(times, dtype=float).ravel())
+        too_early = np.flatnonzero(np.diff(times) < min_interval - 1e-9) + 1
+        violations += [(line, time) for time in times[too_early].tolist()]
+
+    if violations:
+        message = str(len(violations)) + " spikes come less than " + str(min_interval) + \
+            " ms after the previous spike of their line (first: line " + str(violations[0][0]) + " at " + \
+            str(violations[0][1]) + " ms)"
+        if on_violation == "raise":
+            raise ValueError(message)
+        elif on_violation == "warn":
+            warnings.warn(message, RuntimeWarning, stacklevel=2)
+
+    return violations
+
+
+def memory_stimulus(transactions, memory, conn=None, min_interval=None, on_violation="raise"):
+    """
+    Compiles a list of write transactions of a NeuralMemory into the spike times of its signal (address) and data
+    lines. The time of each transaction is the time when the word must be stored in the memory, so the spikes are
+    emitted in advance by the delay of the input connections plus the write delay of the memory.
+
+    :param np.ndarray transactions: The transactions (see as_transactions). Addresses go from 1 to n_dir.
+    :param NeuralMemory memory: The memory.
+    :param conn: The synapse of the input connections. The standard connection of the memory by default.
+    :param float min_interval: The minimum interval between transactions (ms). By default, it is obtained in closed form from the parameters of the memory (see memory_interval). "analyse" obtains it from a copy of the memory built in a Netlist, which takes several seconds for large memories.
+    :param str on_violation: The action taken when the transactions are closer than min_interval: "raise", "warn" or "ignore" (see check_spike_intervals). "ignore" turns the check off, and the interval is not obtained. "raise" by default.
+    :return: A list with the spike times of each line: first the signal lines (from the least significant bit of the address), then the data lines (from the least significant bit of the word).
+    :rtype: list
+    :raise ValueError: If a transaction has an invalid address or word, is too early to be written in time, is in the same timestep as another transaction or is closer than min_interval to the previous one.
+    """
+    if conn is None:
+        conn = memory.std_conn
+
+    transactions = as_transactions(transactions)
+    times = transactions["time"] - (conn.delay + memory.write_delay)
+    addresses = transactions["address"]
+    data = transactions["data"]
+
+    if np.any((addresses < 1) | (addresses > memory.n_dir)):
+        raise ValueError("The addresses must go from 1 to " + str(memory.n_dir))
+    if memory.width < 64 and np.any(data >> np.uint64(memory.width)):
+        raise ValueError("The words must fit in " + str(memory.width) + " bits")
+    if len(times) and times[0] < 0:
+        raise ValueError("The transactions must be at least " + str(conn.delay + memory.write_delay) +
+                         " ms after the start of the simulation")
+    timestep = memory.sim.get_time_step() if hasattr(memory.sim, "get_time_step") else \
+        memory.global_params["min_delay"]
+    if np.any(np.diff(times) < timestep - 1e-9):
+        raise ValueError("Only one transaction per timestep is allowed")
+    if on_violation != "ignore":  # Every transaction is a wave through the signal lines
+        if min_interval is None or min_interval == "analyse":
+            min_interval = memory_interval(memory, analyse=min_interval == "analyse")
+        check_spike_intervals([times], min_interval, on_violation)
+
+    address_bits = bit_matrix(addresses, memory.decoder.n_inputs)
+    data_bits = bit_matrix(data, memory.width)
+
+    return [times[bits] for bits in address_bits] + [times[bits] for bits in data_bits]
+
+
+def bit_matrix(values, n_bits):
+    """
+    Unpacks the bits of an array of integers of up to 64 bits in one pass.
+
+    :param np.ndarray values: The integers.
+    :param int n_bits: The number of bits to be unpacked (from the least significant one).
+    :return: A boolean array with a row for each bit and a column for each integer.
+    :rtype: np.ndarray
+    """
+    n_bytes = (n_bits + 7) // 8
+    value_bytes = np.ascontiguousarray(values.astype("<u8").view(np.uint8).reshape(-1, 8)[:, :n_bytes].T)
+    return np.unpackbits(value_bytes, axis=0, count=n_bits, bitorder="little").view(bool)
+
+
+def connect_memory_stimulus(sim, memory, transactions, conn=None, min_interval=None, on_violation="raise"):
+    """
+    Creates a single spike bus with the signal and data lines of a list of write transactions of a NeuralMemory, and
+    connects it to the memory.
+
+    :param sim: The simulator package.
+    :param NeuralMemory memory: The memory.
+    :param np.ndarray transactions: The transactions (see memory_stimulus).
+    :param conn: The synapse of the input connections. The standard connection of the memory by default.
+    :param float min_interval: The minimum interval between transactions (ms). By default, it is obtained in closed form (see memory_stimulus).
+    :param str on_violation: The action taken when the transactions are closer than min_interval: "raise", "warn" or "ignore" (no check). "raise" by default.
+    :return: The spike bus, with a channel for each signal line followed by a channel for each data line.
+    :rtype: SpikeBus
+    """
+    if conn is None:
+        conn = memory.std_conn
+
+    spike_times = memory_stimulus(transactions, memory, conn, min_interval, on_violation)
+    n_signals = memory.decoder.n_inputs
+    stimulus = SpikeBus(sim, spike_times)
+
+    memory.connect_signals(stimulus, conn, ini_pop_indexes=[[i] for i in range(n_signals)])
+    memory.connect_data(stimulus, conn, ini_pop_indexes=[[n_signals + i] for i in range(memory.width)])
+
+    return stimulus
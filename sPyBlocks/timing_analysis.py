@@ -0,0 +1,443 @@
+import numpy as np
+
+from sPyBlocks.connection_functions import iter_flatten
+from sPyBlocks.connection_graph import IGNORED_ATTRIBUTES
+from sPyBlocks.constant_spike_source import ConstantSpikeSource
+from sPyBlocks.netlist import Netlist
+from sPyBlocks.neural_memory import NeuralMemory
+from sPyBlocks.numpy_backend import IF_CURR_EXP_DEFAULTS
+from sPyBlocks.spike_bus import SpikeBus
+
+# Block attributes declaring internal delays
+DECLARED_DELAYS = ("delay", "write_delay", "rising_delay", "falling_delay")
+
+# Ports of the blocks receiving input spikes (the supply ports are excluded)
+INPUT_PORTS = ("input", "data", "signal", "set", "reset")
+
+
+def object_ids(objects):
+    """
+    Gets the netlist identifiers of the neurons of a set of deferred PyNN objects.
+
+    :param objects: A deferred population, view, assembly or spike bus, or a (nested) list of them.
+    :return: An array containing the identifiers.
+    :rtype: np.ndarray
+    """
+    ids = [(obj.population if isinstance(obj, SpikeBus) else obj).ids
+           for obj in iter_flatten(objects if isinstance(objects, list) else [objects])]
+    return np.concatenate(ids).astype(np.int64) if ids else np.zeros(0, dtype=np.int64)
+
+
+def inner_blocks(block, path="", max_depth=None):
+    """
+    Walks the structure of a block, yielding the block and all the inner blocks it contains together with their path
+    inside the block (see block_populations). The elements of a list of blocks are at the same depth as the list.
+
+    :param block: A spiking functional block.
+    :param str path: The path of the block. Empty by default.
+    :param int max_depth: The maximum depth of the inner blocks. All of them by default.
+    :return: A generator yielding (path, block) tuples.
+    :rtype: generator
+    """
+    yield path, block
+
+    if max_depth is not None and max_depth <= 0:
+        return
+
+    for name, value in vars(block).items():
+        if name in IGNORED_ATTRIBUTES:
+            continue
+
+        value_path = path + "." + name if path else name
+        values = [(value_path + "[" + str(i) + "]", element) for i, element in enumerate(value)] \
+            if isinstance(value, list) else [(value_path, value)]
+
+        for element_path, element in values:
+            if hasattr(element, "total_neurons") and not isinstance(element, type) and \
+                    not isinstance(element, SpikeBus):
+                yield from inner_blocks(element, element_path, None if max_depth is None else max_depth - 1)
+
+
+def port_ids(block, port):
+    """
+    Gets the netlist identifiers of the neurons of a port of a block (get_<port>_neurons, get_<port>_neuron or
+    <port>_neuron, in this order).
+
+    :param block: A spiking functional block built with a Netlist.
+    :param str port: The name of the port (for example, "input" or "output").
+    :return: An array containing the identifiers, empty if the block has no such port.
+    :rtype: np.ndarray
+    """
+    for name in ("get_" + port + "_neurons", "get_" + port + "_neuron"):
+        if hasattr(block, name):
+            return object_ids(getattr(block, name)())
+    if hasattr(block, port + "_neuron"):
+        return object_ids(getattr(block, port + "_neuron"))
+    return np.zeros(0, dtype=np.int64)
+
+
+def recovery_time(neuron_params, weight=1.0, timestep=1.0, rest_tolerance=0.01):
+    """
+    Gets the time a neuron needs to return to its resting potential after receiving an input spike, from its time
+    constants. The response of the membrane to an exponential synaptic current is evaluated in closed form, and the
+    time after which it stays within rest_tolerance of the resting potential is added to the refractory period. The
+    result is rounded up to the timestep, with a minimum of one timestep.
+
+    :param dict neuron_params: A dictionary containing the IF_curr_exp parameters of the neurons (the PyNN defaults are used for the missing ones).
+    :param float weight: The weight of the input spike (nA). 1.0 by default.
+    :param float timestep: The simulation timestep (ms). 1.0 by default.
+    :param float rest_tolerance: The largest distance to the resting potential (mV) considered at rest. 0.01 by default.
+    :return: The recovery time (ms).
+    :rtype: float
+    """
+    params = dict(IF_CURR_EXP_DEFAULTS, **neuron_params)
+    cm = params["cm"]
+    tau_m = params["tau_m"]
+    tau_syn = max(params["tau_syn_E"], params["tau_syn_I"])
+
+    # Membrane response (mV) at a fine grid of times, long enough for both exponentials to vanish
+    times = np.linspace(0.0, 50.0 * max(tau_m, tau_syn), 100001)[1:]
+    if np.isclose(tau_m, tau_syn):
+        response = abs(weight) / cm * times * np.exp(-times / tau_m)
+    else:
+        response = abs(weight) / cm * tau_m * tau_syn / (tau_syn - tau_m) * \
+            (np.exp(-times / tau_syn) - np.exp(-times / tau_m))
+
+    disturbed = np.flatnonzero(np.abs(response) > rest_tolerance)
+    settling_time = times[disturbed[-1]] if len(disturbed) else 0.0
+
+    return round(max(float(np.ceil((settling_time + params["tau_refrac"]) / timestep - 1e-9)), 1.0) * timestep, 9)
+
+
+def block_intervals(block_factory, neuron_params, timestep=1.0, rest_tolerance=0.01):
+    """
+    Builds a block in a new Netlist and gets the minimum inter-stimulus interval of each of its input ports (see
+    TimingAnalysis.port_intervals).
+
+    :param block_factory: A function receiving the netlist (used as simulator package) and returning a dictionary mapping the input port names to the deferred PyNN objects (or spike buses) feeding them.
+    :param dict neuron_params: A dictionary containing the IF_curr_exp parameters of the neurons.
+    :param float timestep: The simulation timestep (ms). 1.0 by default.
+    :param float rest_tolerance: The largest distance to the resting potential (mV) considered at rest. 0.01 by default.
+    :return: A dictionary mapping each input port name to its minimum interval (ms).
+    :rtype: dict
+    """
+    netlist = Netlist()
+    inputs = block_factory(netlist)
+
+    return TimingAnalysis(netlist, inputs).port_intervals(neuron_params, timestep=timestep,
+                                                          rest_tolerance=rest_tolerance)
+
+
+# Minimum intervals between the transactions of the memories already analysed, indexed by their structure and parameters
+_memory_intervals = {}
+
+
+def memory_interval(memory, timestep=None, rest_tolerance=0.01, analyse=False):
+    """
+    Gets the minimum interval between two write transactions of a NeuralMemory built with any simulator.
+
+    By default, the interval is obtained in closed form, taking no time even for the largest memories. The declared
+    delays of the memory (the data lines are delayed by the delay of the decoder) make the waves of a transaction reach
+    every neuron at the same time, so the interval is the recovery time of the neurons (see recovery_time), but not
+    shorter than the feedback loop of the SR latches (the delay of the standard connection).
+
+    With analyse, a copy of the memory, with the same structure and parameters, is built in a new Netlist and the
+    minimum intervals of its signal and data ports are obtained (see block_intervals). This checks the closed form, but
+    its cost grows with the size of the memory (several seconds for thousands of registers). The results are cached
+    for each structure and parameters.
+
+    :param NeuralMemory memory: The memory.
+    :param float timestep: The simulation timestep (ms). The timestep of the simulator of the memory by default ("min_delay" if it cannot be obtained).
+    :param float rest_tolerance: The largest distance to the resting potential (mV) considered at rest. 0.01 by default.
+    :param bool analyse: A boolean indicating whether or not to analyse a copy of the memory. False by default.
+    :return: The minimum interval (ms).
+    :rtype: float
+    """
+    if timestep is None:
+        timestep = memory.sim.get_time_step() if hasattr(memory.sim, "get_time_step") else \
+            memory.global_params["min_delay"]
+
+    if not analyse:
+        return max(recovery_time(memory.neuron_params, timestep=timestep, rest_tolerance=rest_tolerance),
+                   float(memory.std_conn.delay))
+
+    key = (memory.n_dir, memory.width, memory.and_type, tuple(sorted(memory.global_params.items())),
+           tuple(sorted(memory.neuron_params.items())), memory.std_conn.weight, memory.std_conn.delay, timestep,
+           rest_tolerance)
+
+    if key not in _memory_intervals:
+        def memory_factory(netlist):
+            std_conn = netlist.StaticSynapse(weight=memory.std_conn.weight, delay=memory.std_conn.delay)
+            copy = NeuralMemory(memory.n_dir, memory.width, netlist, memory.global_params, memory.neuron_params,
+                                std_conn, and_type=memory.and_type)
+            constant_spike_source = ConstantSpikeSource(netlist, memory.global_params, memory.neuron_params, std_conn)
+
+            signal_bus = SpikeBus(netlist, [[] for _ in range(copy.decoder.n_inputs)])
+            data_bus = SpikeBus(netlist, [[] for _ in range(copy.width)])
+
+            copy.connect_constant_spikes([constant_spike_source.set_source,
+                                          constant_spike_source.latch.output_neuron])
+            copy.connect_signals(signal_bus, ini_pop_indexes=[[i] for i in range(copy.decoder.n_inputs)])
+            copy.connect_data(data_bus, ini_pop_indexes=[[i] for i in range(copy.width)])
+
+            return {"signals": signal_bus, "data": data_bus}
+
+        intervals = block_intervals(memory_factory, memory.neuron_params, timestep=timestep,
+                                    rest_tolerance=rest_tolerance)
+        _memory_intervals[key] = max(intervals.values())
+
+    return _memory_intervals[key]
+
+
+class TimingAnalysis:
+    """
+    This class computes the static timing of a design built with a Netlist, that is, the earliest and latest arrival
+    time of a spike wave at every neuron when all the given inputs fire at time 0. Arrival times are sums of synaptic
+    delays along the actual connections (excitatory and inhibitory), as the neurons of the blocks fire in the same
+    timestep their input arrives.
+
+    The latest arrival times are computed on the connection graph without its feedback connections (the connections
+    closing a loop, like those of the latches and the oscillators), which are found while sorting the neurons
+    topologically: when only loops are left, the neurons reached first are taken, and the connections arriving to them
+    from neurons not yet sorted are marked as feedback.
+    """
+    def __init__(self, netlist, inputs):
+        """
+        Constructor of the class. The analysis is done here.
+
+        :param Netlist netlist: The netlist containing the design.
+        :param inputs: The deferred PyNN objects (or spike buses) whose neurons fire at time 0, or a dictionary mapping input names to them.
+        """
+        # Storing parameters
+        self.netlist = netlist
+        self.inputs = inputs if isinstance(inputs, dict) else {"inputs": inputs}
+
+        edges = netlist.edges()
+        self.pre = edges["pre"].astype(np.int64)
+        self.post = edges["post"].astype(np.int64)
+        self.delay = edges["delay"]
+        self.n_neurons = netlist.total_neurons
+
+        input_ids = object_ids(list(self.inputs.values()))
+
+        self.earliest = self._earliest_arrivals(input_ids)
+        self.reached = np.isfinite(self.earliest)
+        self.level, self.feedback = self._topological_levels()
+        self.latest, self.predecessor = self._latest_arrivals(input_ids)
+
+    def _earliest_arrivals(self, input_ids):
+        """
+        Computes the earliest arrival times by relaxing all the connections at once until they do not change (shortest
+        paths, as all the delays are positive).
+        """
+        earliest = np.full(self.n_neurons, np.inf)
+        earliest[input_ids] = 0.0
+
+        if not len(self.pre):
+            return earliest
+
+        order = np.argsort(self.post, kind="stable")
+        pre = self.pre[order]
+        delay = self.delay[order]
+        targets, starts = np.unique(self.post[order], return_index=True)
+
+        while True:
+            best = np.minimum.reduceat(earliest[pre] + delay, starts)
+            improved = best < earliest[targets]
+            if not np.any(improved):
+                return earliest
+            earliest[targets[improved]] = best[improved]
+
+    def _topological_levels(self):
+        """
+        Sorts the reached neurons topologically by levels, marking the feedback connections.
+        """
+        active = self.reached[self.pre] & self.reached[self.post]
+        feedback = np.zeros(len(self.pre), dtype=bool)
+        level = np.full(self.n_neurons, -1, dtype=np.int64)
+
+        in_degree = np.bincount(self.post[active], minlength=self.n_neurons)
+        remaining = self.reached.copy()
+        current = remaining & (in_degree == 0)
+        current_level = 0
+
+        while np.any(remaining):
+            if not np.any(current):  # Only loops are left
+                current = remaining & (self.earliest == np.min(self.earliest[remaining]))
+                feedback |= active & current[self.post] & remaining[self.pre]
+
+            level[current] = current_level
+            remaining &= ~current
+
+            forward = active & current[self.pre] & ~feedback
+            in_degree -= np.bincount(self.post[forward], minlength=self.n_neurons)
+            current = remaining & (in_degree == 0)
+            current_level += 1
+
+        return level, feedback
+
+    def _latest_arrivals(self, input_ids):
+        """
+        Computes the latest arrival times level by level (longest paths without the feedback connections), and the
+        predecessor of each neuron in its longest path.
+        """
+        latest = np.full(self.n_neurons, -np.inf)
+        latest[input_ids] = 0.0
+        predecessor = np.full(self.n_neurons, -1, dtype=np.int64)
+
+        forward = np.flatnonzero(self.reached[self.pre] & self.reached[self.post] & ~self.feedback)
+        forward = forward[np.argsort(self.level[self.post[forward]], kind="stable")]
+        post_levels = self.level[self.post[forward]]
+        bounds = np.flatnonzero(np.diff(post_levels)) + 1
+
+        for selection in np.split(forward, bounds):
+            if len(selection):
+                np.maximum.at(latest, self.post[selection], latest[self.pre[selection]] + self.delay[selection])
+
+        critical = forward[latest[self.pre[forward]] + self.delay[forward] == latest[self.post[forward]]]
+        predecessor[self.post[critical]] = self.pre[critical]
+        predecessor[input_ids] = -1
+
+        latest[~self.reached] = np.nan
+        return latest, predecessor
+
+    def arrival(self, objects):
+        """
+        Gets the arrival times at the neurons of a set of objects.
+
+        :param objects: A deferred population, view, assembly or spike bus, or a (nested) list of them.
+        :return: A tuple (earliest, latest) of arrays with the arrival times (ms) of each neuron (inf and nan for the neurons that are not reached).
+        :rtype: tuple
+        """
+        ids = object_ids(objects)
+        return self.earliest[ids], self.latest[ids]
+
+    def critical_path(self, objects=None):
+        """
+        Gets the longest path from an input to the neuron with the latest arrival time among the given objects.
+
+        :param objects: A deferred population, view, assembly or spike bus, or a (nested) list of them. All the neurons of the netlist by default.
+        :return: A list of (neuron id, arrival time) tuples, from the input to the end of the path. Empty if no neuron is reached.
+        :rtype: list
+        """
+        ids = np.arange(self.n_neurons) if objects is None else object_ids(objects)
+        ids = ids[self.reached[ids]]
+        if not len(ids):
+            return []
+
+        neuron = int(ids[np.argmax(self.latest[ids])])
+        path = []
+        while neuron >= 0:
+            path.append((neuron, float(self.latest[neuron])))
+            neuron = int(self.predecessor[neuron])
+
+        return path[::-1]
+
+    def min_input_interval(self, objects=None, timestep=1.0):
+        """
+        Gets the minimum interval between two input waves that keeps them separated at every neuron, that is, the
+        largest spread between the earliest and latest arrival times at a neuron plus one timestep.
+
+        :param objects: A deferred population, view, assembly or spike bus, or a (nested) list of them. All the neurons of the netlist by default.
+        :param float timestep: The simulation timestep (ms). 1.0 by default.
+        :return: The minimum interval (ms).
+        :rtype: float
+        """
+        ids = np.arange(self.n_neurons) if objects is None else object_ids(objects)
+        ids = ids[self.reached[ids]]
+        spread = np.max(self.latest[ids] - self.earliest[ids]) if len(ids) else 0.0
+
+        return float(spread) + timestep
+
+    def max_input_rate(self, objects=None, timestep=1.0):
+        """
+        Gets the maximum safe input rate, that is, the inverse of the minimum input interval (see min_input_interval).
+
+        :param objects: A deferred population, view, assembly or spike bus, or a (nested) list of them. All the neurons of the netlist by default.
+        :param float timestep: The simulation timestep (ms). 1.0 by default.
+        :return: The maximum rate (spikes per ms).
+        :rtype: float
+        """
+        return 1.0 / self.min_input_interval(objects, timestep)
+
+    def loop_delays(self):
+        """
+        Gets the delay of the loops closed by the reached feedback connections, that is, the time from the earliest
+        arrival at the end neuron of each feedback connection to the latest arrival of the wave coming back through it.
+
+        :return: An array with the loop delay (ms) of each reached feedback connection.
+        :rtype: np.ndarray
+        """
+        feedback = np.flatnonzero(self.feedback)
+        return self.latest[self.pre[feedback]] + self.delay[feedback] - self.earliest[self.post[feedback]]
+
+    def min_stimulus_interval(self, recovery, objects=None):
+        """
+        Gets the minimum interval between two input waves when the neurons need some time to recover after their last
+        input. The next wave cannot reach a neuron before the previous one has left it and the neuron is back at rest
+        (largest arrival spread plus the recovery time), nor before the loops it has entered are closed.
+
+        :param float recovery: The recovery time of the neurons (ms), see recovery_time.
+        :param objects: A deferred population, view, assembly or spike bus, or a (nested) list of them. All the neurons of the netlist by default.
+        :return: The minimum interval (ms).
+        :rtype: float
+        """
+        interval = self.min_input_interval(objects, timestep=recovery)
+        loops = self.loop_delays()
+
+        return max(interval, float(np.max(loops))) if len(loops) else interval
+
+    def port_intervals(self, neuron_params, weight=1.0, timestep=1.0, rest_tolerance=0.01):
+        """
+        Gets the minimum inter-stimulus interval of each input of the analysis, analysing the waves entering through
+        each input separately (see min_stimulus_interval and recovery_time).
+
+        :param dict neuron_params: A dictionary containing the IF_curr_exp parameters of the neurons.
+        :param float weight: The weight of the input spikes (nA). 1.0 by default.
+        :param float timestep: The simulation timestep (ms). 1.0 by default.
+        :param float rest_tolerance: The largest distance to the resting potential (mV) considered at rest. 0.01 by default.
+        :return: A dictionary mapping each input name to its minimum interval (ms).
+        :rtype: dict
+        """
+        recovery = recovery_time(neuron_params, weight, timestep, rest_tolerance)
+
+        return {name: TimingAnalysis(self.netlist, {name: objects}).min_stimulus_interval(recovery)
+                for name, objects in self.inputs.items()}
+
+    def declared_delays(self, block, max_depth=1):
+        """
+        Compares the delays declared by a block and its inner blocks (see DECLARED_DELAYS) with the measured latencies
+        of the blocks, from the first arrival at the neurons of their input ports (see INPUT_PORTS) to the earliest and
+        latest arrivals at their output neurons. A declared delay matches if it is equal to one of both latencies.
+        Blocks whose inputs or outputs are not reached are skipped.
+
+        :param block: A spiking functional block built with the netlist.
+        :param int max_depth: The maximum depth of the inner blocks to check. 1 by default.
+        :return: A list of dictionaries with the "block" (path), "attribute", "declared", "min_latency", "max_latency" and "matches" keys.
+        :rtype: list
+        """
+        report = []
+
+        for path, inner_block in inner_blocks(block, max_depth=max_depth):
+            attributes = [name for name in DECLARED_DELAYS if isinstance(getattr(inner_block, name, None), (int, float))]
+            if not attributes:
+                continue
+
+            inputs = np.concatenate([port_ids(inner_block, port) for port in INPUT_PORTS])
+            inputs = inputs[self.reached[inputs]]
+            outputs = port_ids(inner_block, "output")
+            outputs = outputs[self.reached[outputs]]
+            if not len(inputs) or not len(outputs):
+                continue
+
+            entry = np.min(self.earliest[inputs])
+            min_latency = float(np.min(self.earliest[outputs]) - entry)
+            max_latency = float(np.max(self.latest[outputs]) - entry)
+
+            for name in attributes:
+                declared = float(getattr(inner_block, name))
+                report.append({"block": path, "attribute": name, "declared": declared, "min_latency": min_latency,
+                               "max_latency": max_latency,
+                               "matches": bool(np.isclose(declared, min_latency) or np.isclose(declared, max_latency))})
+
+        return report
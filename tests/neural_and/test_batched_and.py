@@ -0,0 +1,55 @@
+import numpy as np
+
+import sPyBlocks.numpy_backend as sim
+from sPyBlocks.constant_spike_source import ConstantSpikeSource
+from sPyBlocks.neural_and import NeuralAnd
+
+if __name__ == "__main__":
+    # Simulator initialization and simulation params
+    sim.setup(timestep=1.0)
+    simtime = 20.0  # (ms)
+
+    # Other parameters
+    n_inputs = 4
+    global_params = {"min_delay": 1.0}
+    neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                     "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+    # Network building
+    spike_source = sim.Population(n_inputs, sim.SpikeSourceArray(spike_times=[]))
+    std_conn = sim.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+
+    classic_and_gate = NeuralAnd(n_inputs, sim, global_params, neuron_params, std_conn)
+    fast_and_gate = NeuralAnd(n_inputs, sim, global_params, neuron_params, std_conn, "fast")
+    constant_spike_source = ConstantSpikeSource(sim, global_params, neuron_params, std_conn)
+
+    # Testing
+    classic_and_gate.connect_inputs(spike_source)
+    fast_and_gate.connect_inputs(spike_source)
+    fast_and_gate.connect_inhibition([constant_spike_source.set_source, constant_spike_source.latch.output_neuron])
+
+    classic_and_gate.output_neuron.record(('spikes'))
+    fast_and_gate.output_neuron.record(('spikes'))
+
+    # Run all the rows of the truth table as independent trials (one spike per active input at 10 ms)
+    n_trials = 2 ** n_inputs
+    trial_spike_times = [[[10.0] if (trial >> i) & 1 else [] for i in range(n_inputs)] for trial in range(n_trials)]
+    results = sim.run_trials(simtime, {spike_source: trial_spike_times})
+
+    # Data from the simulation
+    classic_spikes = results.spike_matrix(classic_and_gate.output_neuron)[:, :, 0]
+    fast_spikes = results.spike_matrix(fast_and_gate.output_neuron)[:, :, 0]
+
+    # End simulation
+    sim.end()
+
+    # The results can still be read after the network is removed
+    spikes_after_end = results.spike_matrix(classic_and_gate.output_neuron)[:, :, 0]
+
+    # Results
+    expected = np.arange(n_trials) == n_trials - 1
+    print("Classic AND truth table: " + str(classic_spikes.any(axis=1).astype(int)) +
+          "\nFast AND truth table: " + str(fast_spikes.any(axis=1).astype(int)) +
+          "\nCorrect: " + str(np.array_equal(classic_spikes.any(axis=1), expected) and
+                              np.array_equal(fast_spikes.any(axis=1), expected)) +
+          "\nSame spikes after the end of the simulation: " + str(np.array_equal(spikes_after_end, classic_spikes)))
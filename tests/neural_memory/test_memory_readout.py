@@ -0,0 +1,117 @@
+from math import ceil, log2
+
+import numpy as np
+import spynnaker8 as sim
+
+from sPyBlocks.connection_functions import truth_table_column
+from sPyBlocks.constant_spike_source import ConstantSpikeSource
+from sPyBlocks.neural_memory import NeuralMemory
+from sPyBlocks.spike_bus import SpikeBus
+from sPyBlocks.spike_readout import SpikeReadout, spike_matrix
+
+if __name__ == "__main__":
+    # Simulator initialization and simulation params
+    sim.setup(timestep=1.0)
+    simtime = 100.0  # (ms)
+
+    # Other parameters
+    n_dir = 7
+    n_signals = ceil(log2(n_dir + 1))
+    n_bits = 4
+    global_params = {"min_delay": 1.0}
+    neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                     "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+    # Input spikes (the same truth table columns as test_memory_stress_1)
+    dir_times = [truth_table_column(ceil(simtime), i, select=1) for i in range(n_signals)]
+    data_times = [truth_table_column(ceil(simtime), i, select=1) for i in range(n_bits)]
+
+    # Network building: the same memory fed by a source population per line and by spike buses
+    std_conn = sim.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+    constant_spike_source = ConstantSpikeSource(sim, global_params, neuron_params, std_conn)
+    constant_spikes = [constant_spike_source.set_source, constant_spike_source.latch.output_neuron]
+
+    memories = {}
+    for source_type in ["populations", "bus"]:
+        if source_type == "populations":
+            dir_sources = [sim.Population(1, sim.SpikeSourceArray(spike_times=times)) for times in dir_times]
+            data_sources = [sim.Population(1, sim.SpikeSourceArray(spike_times=times)) for times in data_times]
+        else:
+            dir_sources = SpikeBus(sim, dir_times)
+            data_sources = SpikeBus(sim, data_times)
+
+        memory = NeuralMemory(n_dir, n_bits, sim, global_params, neuron_params, std_conn, and_type="fast")
+        memory.connect_constant_spikes(constant_spikes)
+        memory.connect_signals(dir_sources, ini_pop_indexes=[[i] for i in range(n_signals)])
+        memory.connect_data(data_sources, ini_pop_indexes=[[i] for i in range(n_bits)])
+        memories[source_type] = memory
+
+    # Recording of every output neuron, one by one
+    for memory in memories.values():
+        for latch in memory.latches.latch_array:
+            latch.latch_sr.output_neuron.record(('spikes'))
+
+    memory = memories["populations"]
+    for gate in memory.decoder.and_gates.and_array:
+        gate.output_neuron.record(('spikes'))
+
+    # Recording of the same neurons with a single readout
+    readout = SpikeReadout(sim, groups={
+        "decoder_and": [gate.output_neuron for gate in memory.decoder.and_gates.and_array],
+        "output": [latch.latch_sr.output_neuron for latch in memory.latches.latch_array]})
+
+    # Run simulation
+    sim.run(simtime)
+
+    # Data from the simulation
+    out_spikes = {source_type: [latch.latch_sr.output_neuron.get_data(variables=["spikes"]).segments[0].spiketrains[0]
+                                for latch in memory.latches.latch_array]
+                  for source_type, memory in memories.items()}
+    decoder_and_spikes = [gate.output_neuron.get_data(variables=["spikes"]).segments[0].spiketrains[0]
+                          for gate in memories["populations"].decoder.and_gates.and_array]
+    spikes = readout.get_groups()
+
+    # End simulation
+    sim.end()
+
+    # Decoder output channel at each timestep, from the spikes of each gate (explicit loop)
+    simtime_int = int(simtime)
+    channels = ["" for time in range(simtime_int)]
+    for time in range(simtime_int):
+        for i in range(1, len(decoder_and_spikes)):
+            if time in decoder_and_spikes[i]:
+                channels[time] = str(i)
+
+    # Decoder output channel from the readout matrix (the highest one if several gates fire at the same time)
+    decoder_and = spikes["decoder_and"][:, 1:]
+    channel_values = decoder_and.shape[1] - np.argmax(decoder_and[:, ::-1], axis=1)
+    readout_channels = [str(channel) if fired else ""
+                        for channel, fired in zip(channel_values, decoder_and.any(axis=1))]
+
+    # Values of each memory direction at each timestep, from the spikes of each output neuron (explicit loop)
+    memory = memories["populations"]
+    values = np.zeros((memory.n_dir, simtime_int), dtype=int)
+    for time in range(simtime_int):
+        for i in range(memory.n_dir):  # For each direction
+            for j in range(memory.width):  # For each bit
+                if time in out_spikes["populations"][i * memory.width + j]:
+                    values[i][time] += 2 ** j
+
+    # Values of each memory direction from the readout matrix
+    state_values, write_times = memory.read_state(spikes["output"])
+    expected_write_times = [np.flatnonzero(np.diff(register, prepend=0) != 0) for register in values]
+
+    # Results
+    print("Same output spikes with source populations and spike buses: " +
+          str(all(np.array_equal(population_spikes, bus_spikes)
+                  for population_spikes, bus_spikes in zip(out_spikes["populations"], out_spikes["bus"]))))
+    print("Number of output spikes: " + str(sum(len(spiketrain) for spiketrain in out_spikes["bus"])))
+    print("Same spikes with the readout and with the neurons recorded one by one: " +
+          str(np.array_equal(spikes["output"], spike_matrix(out_spikes["populations"], simtime_int)) and
+              np.array_equal(spikes["decoder_and"], spike_matrix(decoder_and_spikes, simtime_int))))
+    print("Same decoder channels with the readout and with the loop: " + str(readout_channels == channels) +
+          " (" + str(sum(channel != "" for channel in channels)) + " timesteps with a channel)")
+    print("Same register values with read_state and with the loop: " + str(np.array_equal(state_values, values)) +
+          ", same write times: " + str(all(np.array_equal(times, expected)
+                                           for times, expected in zip(write_times, expected_write_times))) +
+          " (" + str(sum(len(times) for times in write_times)) + " writes)")
@@ -0,0 +1,26 @@
+from sPyBlocks.netlist import Netlist
+from sPyBlocks.neural_memory import NeuralMemory
+
+if __name__ == "__main__":
+    # Parameters
+    neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                     "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+    # The totals of the memory include the NOT gates of the data bits, so they match the neurons and connections
+    # created in a netlist containing only the memory
+    for n_dir, n_bits in [(3, 2), (7, 4), (15, 8)]:
+        for and_type in ["classic", "fast"]:
+            for pooled in [False, True]:
+                global_params = {"min_delay": 1.0, "pooled": pooled}
+                netlist = Netlist()
+                std_conn = netlist.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+                memory = NeuralMemory(n_dir, n_bits, netlist, global_params, neuron_params, std_conn,
+                                      and_type=and_type)
+
+                print(str(n_dir) + "x" + str(n_bits) + " " + and_type + (" pooled" if pooled else "") +
+                      ": " + str(memory.total_neurons) + " neurons (created: " + str(netlist.total_neurons) +
+                      ", NOT gates: " + str(memory.not_gates.total_neurons) + "), " +
+                      str(memory.total_internal_connections) + " internal connections (created: " +
+                      str(netlist.total_connections) + ")")
+                print("Totals match: " + str(memory.total_neurons == netlist.total_neurons and
+                                             memory.total_internal_connections == netlist.total_connections))
@@ -0,0 +1,94 @@
+import shutil
+import time
+
+import numpy as np
+import spynnaker8 as sim
+
+from sPyBlocks.build_cache import build_key, cached_build, source_hash
+from sPyBlocks.constant_spike_source import ConstantSpikeSource
+from sPyBlocks.netlist import Netlist
+from sPyBlocks.neural_memory import NeuralMemory
+from sPyBlocks.stimulus_functions import connect_memory_stimulus
+
+if __name__ == "__main__":
+    # Simulator initialization and simulation params
+    sim.setup(timestep=1.0)
+    simtime = 400.0  # (ms)
+
+    # Other parameters
+    n_dir = 15
+    n_bits = 8
+    global_params = {"min_delay": 1.0, "pooled": True}
+    neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                     "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+    shutil.rmtree("build_cache", ignore_errors=True)
+
+    # Write transactions (time, address, data), shared by both networks
+    rng = np.random.default_rng(0)
+    n_transactions = 30
+    transactions = np.column_stack([np.arange(n_transactions) * 10.0 + 20.0,
+                                    rng.integers(1, n_dir + 1, n_transactions),
+                                    rng.integers(0, 2 ** n_bits, n_transactions)])
+
+    # Network building (the memory is built directly, then with the cache, which is filled and then replayed)
+    netlists = {}
+    memories = {}
+    build_times = {}
+    for name in ["uncached", "cache filling", "cached"]:
+        netlist = Netlist(sim)
+        std_conn = netlist.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+
+        start = time.time()
+        if name == "uncached":
+            memory = NeuralMemory(n_dir, n_bits, netlist, global_params, neuron_params, std_conn, and_type="fast")
+        else:
+            memory = cached_build("build_cache", NeuralMemory, n_dir, n_bits, netlist, global_params, neuron_params,
+                                  std_conn, and_type="fast")
+        build_times[name] = time.time() - start
+
+        if name != "cache filling":
+            netlists[name] = netlist
+            memories[name] = memory
+
+    # The replayed memory is connected and read through the methods of NeuralMemory
+    for name, memory in memories.items():
+        netlist = memory.sim
+        constant_spike_source = ConstantSpikeSource(netlist, global_params, neuron_params, memory.std_conn)
+        memory.connect_constant_spikes([constant_spike_source.set_source, constant_spike_source.latch.output_neuron])
+        connect_memory_stimulus(netlist, memory, transactions)
+
+        for neuron in memory.get_output_neurons(flat=True):
+            neuron.record(('spikes'))
+
+    n_projections = {name: netlist.materialize() for name, netlist in netlists.items()}
+
+    # Run simulation
+    sim.run(simtime)
+
+    # Data from the simulation
+    out_spikes = {name: [neuron.get_data(variables=["spikes"]).segments[0].spiketrains[0]
+                         for neuron in memory.get_output_neurons(flat=True)] for name, memory in memories.items()}
+
+    # End simulation
+    sim.end()
+
+    # Results
+    print("First build: " + str(build_times["cache filling"]) + " s" +
+          "\nCached build: " + str(build_times["cached"]) + " s" +
+          "\nUncached build: " + str(build_times["uncached"]) + " s" +
+          "\nNumber of neurons: " + str(memories["cached"].total_neurons) +
+          "\nNumber of projections: " + str(n_projections))
+
+    for name, memory in memories.items():
+        print(name.capitalize() + " input connections: " + str(memory.total_input_connections))
+
+    print("Same output spikes with and without the cache: " +
+          str(all(np.array_equal(cached, uncached)
+                  for cached, uncached in zip(out_spikes["cached"], out_spikes["uncached"]))))
+    print("Number of output spikes: " + str(sum(len(spiketrain) for spiketrain in out_spikes["cached"])))
+
+    # The key depends on the parameters of the block and on its source code
+    keys = [build_key(NeuralMemory, n_dir, n_bits, netlist, global_params, neuron_params, std_conn, and_type=and_type)
+            for and_type in ["classic", "fast"]]
+    print("Different keys for different parameters: " + str(keys[0] != keys[1]) +
+          "\nSource hash: " + source_hash(NeuralMemory))
@@ -0,0 +1,62 @@
+import time
+
+import numpy as np
+import spynnaker8 as sim
+
+from sPyBlocks.connection_graph import block_connections, export_connections, load_connections
+from sPyBlocks.netlist import Netlist
+from sPyBlocks.neural_decoder import NeuralDecoder
+from sPyBlocks.neural_latch_d import MultipleNeuralLatchD
+from sPyBlocks.neural_memory import NeuralMemory
+
+if __name__ == "__main__":
+    # Parameters
+    n_dir = 1023
+    n_bits = 8
+    global_params = {"min_delay": 1.0, "pooled": True}
+    neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                     "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+    # Network building (deferred, no simulator is needed)
+    netlist = Netlist()
+    std_conn = netlist.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+    memory = NeuralMemory(n_dir, n_bits, netlist, global_params, neuron_params, std_conn, and_type="fast")
+
+    # Export and reload
+    n_connections = export_connections(memory, "connection_graph_test.npz")
+
+    start = time.time()
+    graph = load_connections("connection_graph_test.npz")
+    elapsed = time.time() - start
+
+    # Results
+    print("Number of exported connections: " + str(n_connections) +
+          "\nNumber of neurons: " + str(len(graph["neurons"])) +
+          "\nLoad time: " + str(elapsed * 1000) + " ms")
+
+    connections = graph["connections"]
+    print(graph["blocks"][connections["block"][:10]])
+
+    print("Exported connections match the internal connections: " +
+          str(n_connections == memory.total_internal_connections))
+
+    arrays = dict(zip(["connections", "neurons", "blocks"], block_connections(memory)))
+    for mmap in [True, False]:
+        loaded = load_connections("connection_graph_test.npz", mmap=mmap)
+        print("Identical arrays after save/load (" + ("memory mapped" if mmap else "in memory") + "): " +
+              str(all(np.array_equal(arrays[name], loaded[name]) for name in arrays)))
+
+    # Blocks built with a simulator are exported through a netlist copy (internal connections only)
+    sim.setup(timestep=1.0)
+    sim_std_conn = sim.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+    blocks = [NeuralMemory(15, n_bits, sim, global_params, neuron_params, sim_std_conn, and_type="classic"),
+              NeuralDecoder(4, sim, global_params, neuron_params, sim_std_conn, and_type="fast"),
+              MultipleNeuralLatchD(4, sim, global_params, neuron_params, sim_std_conn)]
+
+    for block in blocks:
+        connections, neurons, _ = block_connections(block)
+        print(type(block).__name__ + " (simulator): " + str(len(connections)) + " connections, matches the internal " +
+              "connections: " + str(len(connections) == block.total_internal_connections) + ", neurons match: " +
+              str(len(neurons) == block.total_neurons))
+
+    sim.end()
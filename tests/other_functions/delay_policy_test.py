@@ -0,0 +1,58 @@
+import numpy as np
+import spynnaker8 as sim
+
+from sPyBlocks.connection_functions import DelayPolicy, create_connections, set_delay_policy
+from sPyBlocks.neural_oscillator import NeuralSyncOscillator
+from sPyBlocks.spike_readout import SpikeReadout
+
+if __name__ == "__main__":
+    # Simulator initialization and simulation params
+    sim.setup(timestep=1.0)
+    simtime = 300.0  # (ms)
+
+    # Other parameters
+    n_period = 40
+    target_delays = [20.0, 35.0, 50.0, 50.0, 16.5, 17.0, 32.0]
+    global_params = {"min_delay": 1.0}
+    neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                     "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+    # Network building (the same oscillator and fan-out with native delays and through relay chains)
+    std_conn = sim.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+    spike_source = sim.Population(1, sim.SpikeSourceArray(spike_times=[5.0, 60.0, 61.0]))
+
+    def build():
+        oscillator = NeuralSyncOscillator(n_period, sim, global_params, neuron_params, std_conn)
+        targets = sim.Population(len(target_delays), sim.IF_curr_exp(**neuron_params),
+                                 initial_values={'v': neuron_params["v_rest"]})
+        for i, delay in enumerate(target_delays):
+            create_connections(spike_source, targets, sim, sim.StaticSynapse(weight=1.0, delay=delay),
+                               end_pop_indexes=[i])
+        return [oscillator.output_neuron, targets]
+
+    native_neurons = build()
+
+    policies = {}
+    for share in [False, True]:
+        policies[share] = DelayPolicy(sim, neuron_params, max_delay=16.0, share=share)
+        set_delay_policy(sim, policies[share])
+        policies[share].neurons = build()
+
+    readout = SpikeReadout(sim, groups={"native": native_neurons, "chains": policies[False].neurons,
+                                        "shared": policies[True].neurons})
+
+    # Run simulation
+    sim.run(simtime)
+
+    # Data from the simulation
+    spikes = readout.get_groups()
+
+    # End simulation (the delay policy is removed)
+    sim.end()
+
+    # Results
+    for share in [False, True]:
+        name = "shared" if share else "chains"
+        print(name.capitalize() + ": " + str(policies[share].total_relays) + " relay neurons, same spikes: " +
+              str(np.array_equal(spikes["native"], spikes[name])))
+    print("Delay policy removed at end: " + str(set_delay_policy(sim, None) is None))
@@ -0,0 +1,58 @@
+import time
+
+import numpy as np
+
+import sPyBlocks.numpy_backend as sim
+from sPyBlocks.neural_and import MultipleNeuralAnd
+
+if __name__ == "__main__":
+    # Simulation params
+    simtime = 5000.0  # (ms)
+
+    # Other parameters
+    n_components = 20000
+    global_params = {"min_delay": 1.0}
+    neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                     "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+    # Sparse input spikes: each input fires once, and the inputs of the even gates fire at the same time
+    rng = np.random.default_rng(0)
+    input_times = rng.integers(1, simtime - 10, (n_components, 2)).astype(float)
+    input_times[::2, 1] = input_times[::2, 0]
+    spike_times = [[time] for time in input_times.ravel()]
+
+    results = {}
+    for engine in ["step", "event"]:
+        # Simulator initialization
+        sim.setup(timestep=1.0, engine=engine)
+
+        # Network building
+        spike_source = sim.Population(2 * n_components, sim.SpikeSourceArray(spike_times=spike_times))
+        std_conn = sim.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+        and_gates = MultipleNeuralAnd(n_components, 2, sim, global_params, neuron_params, std_conn)
+
+        # Testing
+        for i, and_gate in enumerate(and_gates.and_array):
+            and_gate.connect_inputs(spike_source, ini_pop_indexes=[2 * i, 2 * i + 1])
+
+        output_neurons = sim.Assembly(*[and_gate.output_neuron for and_gate in and_gates.and_array])
+        output_neurons.record(('spikes'))
+
+        # Run simulation
+        start = time.time()
+        sim.run(simtime)
+        elapsed = time.time() - start
+
+        # Data from the simulation
+        results[engine] = output_neurons.get_data(variables=["spikes"]).segments[0].spiketrains
+
+        # End simulation
+        sim.end()
+
+        print("Simulation time (" + engine + " engine): " + str(elapsed) + " s")
+
+    # Results
+    expected = np.count_nonzero(input_times[:, 0] == input_times[:, 1])
+    print("Same spikes: " + str(all(np.array_equal(a, b) for a, b in zip(results["step"], results["event"]))))
+    print("AND output spikes: " + str(sum(len(spiketrain) for spiketrain in results["event"])) +
+          " (expected: " + str(expected) + ")")
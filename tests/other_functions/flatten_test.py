@@ -0,0 +1,75 @@
+import spynnaker8 as sim
+
+from sPyBlocks.connection_functions import flatten, neuron_indexes
+from sPyBlocks.neural_or import MultipleNeuralOr
+
+if __name__ == "__main__":
+    # Simulator initialization and simulation params
+    sim.setup(timestep=1.0)
+    simtime = 20.0  # (ms)
+
+    # Other parameters
+    n_components = 4
+    neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                     "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+    # Network building (the same gates with and without pooled neurons, each excited by its own spike source)
+    spike_times = {False: [5.0], True: [10.0]}
+    or_gates = {}
+    flattened = {}
+    for pooled in [False, True]:
+        global_params = {"min_delay": 1.0, "pooled": pooled}
+        std_conn = sim.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+        or_gates[pooled] = MultipleNeuralOr(n_components, sim, global_params, neuron_params, std_conn)
+
+        # The output neurons of the gates are connected with a single projection (an assembly of single-neuron
+        # populations without pooling, and a view of the pool with pooling)
+        output = "view" if pooled else "assembly"
+        flattened[pooled] = flatten(or_gates[pooled].get_output_neurons(), output=output, sim=sim)
+        spike_source = sim.Population(1, sim.SpikeSourceArray(spike_times=spike_times[pooled]))
+        sim.Projection(spike_source, flattened[pooled], sim.AllToAllConnector(), std_conn)
+
+        for neuron in or_gates[pooled].get_output_neurons(flat=True):
+            neuron.record(('spikes'))
+
+    # A view can not be created for the output neurons of gates without pooling, which are different populations
+    try:
+        flatten(or_gates[False].get_output_neurons(), output="view", sim=sim)
+        view_refused = False
+    except ValueError:
+        view_refused = True
+
+    # Unsupported output types, and PyNN objects requested without the simulator package
+    errors = []
+    for output, package in [("tuple", sim), ("assembly", None), ("view", None)]:
+        try:
+            flatten(or_gates[True].get_output_neurons(), output=output, sim=package)
+            errors.append(False)
+        except ValueError:
+            errors.append(True)
+
+    # Run simulation
+    sim.run(simtime)
+
+    # Data from the simulation
+    out_spikes = {pooled: [neuron.get_data(variables=["spikes"]).segments[0].spiketrains[0].tolist()
+                           for neuron in gates.get_output_neurons(flat=True)] for pooled, gates in or_gates.items()}
+
+    # End simulation
+    sim.end()
+
+    # Results
+    for pooled in [False, True]:
+        neurons = [(id(population), index) for element in or_gates[pooled].get_output_neurons(flat=True)
+                   for population, indexes in neuron_indexes(element) for index in indexes.tolist()]
+        flattened_neurons = [(id(population), index) for population, indexes in neuron_indexes(flattened[pooled])
+                             for index in indexes.tolist()]
+        same_neurons = flattened_neurons == neurons
+
+        print(("View" if pooled else "Assembly") + ": " + type(flattened[pooled]).__name__ + " of " +
+              str(flattened[pooled].size) + " neurons, same neurons as the list: " + str(same_neurons) +
+              ", output spikes: " + str(out_spikes[pooled]))  # Expected: [[6.0]] * 4 and [[11.0]] * 4
+
+    print("List: " + str(flatten([[1, [2, 3]], [4]])))  # Expected: [1, 2, 3, 4]
+    print("View of different populations refused: " + str(view_refused))
+    print("Unsupported output and missing simulator refused: " + str(errors))  # Expected: [True, True, True]
@@ -0,0 +1,80 @@
+import time
+from math import ceil, log2
+
+import numpy as np
+
+import sPyBlocks.numpy_backend as sim
+from sPyBlocks.connection_functions import truth_table_column
+from sPyBlocks.constant_spike_source import ConstantSpikeSource
+from sPyBlocks.functional_simulator import FunctionalSimulator
+from sPyBlocks.netlist import Netlist
+from sPyBlocks.neural_memory import NeuralMemory
+
+if __name__ == "__main__":
+    # Simulator initialization and simulation params
+    sim.setup(timestep=1.0)
+    simtime = 1000.0  # (ms)
+
+    # Other parameters
+    n_dir = 15
+    n_signals = ceil(log2(n_dir + 1))
+    n_bits = 8
+    global_params = {"min_delay": 1.0}
+    neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                     "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+    # Network building (deferred)
+    netlist = Netlist(sim)
+
+    dir_sources = []
+    data_sources = []
+
+    for i in range(n_signals):
+        dir_sources.append(netlist.Population(1, netlist.SpikeSourceArray(
+            spike_times=truth_table_column(ceil(simtime), i, select=1))))
+
+    for i in range(n_bits):
+        data_sources.append(netlist.Population(1, netlist.SpikeSourceArray(
+            spike_times=truth_table_column(ceil(simtime), i, select=1))))
+
+    std_conn = netlist.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+    memory = NeuralMemory(n_dir, n_bits, netlist, global_params, neuron_params, std_conn, and_type="fast")
+    constant_spike_source = ConstantSpikeSource(netlist, global_params, neuron_params, std_conn)
+
+    memory.connect_constant_spikes([constant_spike_source.set_source, constant_spike_source.latch.output_neuron])
+    memory.connect_signals(dir_sources, ini_pop_indexes=[[i] for i in range(n_signals)])
+    memory.connect_data(data_sources, ini_pop_indexes=[[i] for i in range(n_bits)])
+
+    # Functional simulation (golden model)
+    start = time.time()
+    functional_simulator = FunctionalSimulator(netlist)
+    functional_simulator.run(simtime)
+    functional_time = time.time() - start
+
+    functional_spikes = []
+    for latch in memory.latches.latch_array:
+        functional_spikes.append(functional_simulator.spike_times(latch.latch_sr.output_neuron)[0])
+
+    # Spiking simulation
+    for latch in memory.latches.latch_array:
+        latch.latch_sr.output_neuron.record(('spikes'))
+
+    netlist.materialize()
+
+    start = time.time()
+    sim.run(simtime)
+    spiking_time = time.time() - start
+
+    spiking_spikes = []
+    for latch in memory.latches.latch_array:
+        spiking_spikes.append(latch.latch_sr.output_neuron.get_data(variables=["spikes"]).segments[0].spiketrains[0])
+
+    # End simulation
+    sim.end()
+
+    # Results
+    mismatches = [i for i in range(memory.capacity) if not np.array_equal(functional_spikes[i], spiking_spikes[i])]
+
+    print("Functional simulation time: " + str(functional_time) + " s" +
+          "\nSpiking simulation time: " + str(spiking_time) + " s" +
+          "\nLatches with different spikes: " + str(mismatches))
@@ -0,0 +1,108 @@
+import time
+import warnings
+
+import numpy as np
+import spynnaker8 as sim
+
+from sPyBlocks.constant_spike_source import ConstantSpikeSource
+from sPyBlocks.neural_memory import NeuralMemory
+from sPyBlocks.spike_bus import SpikeBus
+from sPyBlocks.spike_readout import SpikeReadout
+from sPyBlocks.stimulus_functions import connect_memory_stimulus, memory_stimulus
+from sPyBlocks.timing_analysis import block_intervals, memory_interval
+
+# Parameters
+n_dir = 15
+n_bits = 8
+global_params = {"min_delay": 1.0}
+neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.5, "tau_syn_I": 0.5,
+                 "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+
+def memory_factory(netlist):
+    std_conn = netlist.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+    memory = NeuralMemory(n_dir, n_bits, netlist, global_params, neuron_params, std_conn, and_type="fast")
+    constant_spike_source = ConstantSpikeSource(netlist, global_params, neuron_params, std_conn)
+
+    signal_bus = SpikeBus(netlist, [[] for _ in range(memory.decoder.n_inputs)])
+    data_bus = SpikeBus(netlist, [[] for _ in range(n_bits)])
+
+    memory.connect_constant_spikes([constant_spike_source.set_source, constant_spike_source.latch.output_neuron])
+    memory.connect_signals(signal_bus, ini_pop_indexes=[[i] for i in range(memory.decoder.n_inputs)])
+    memory.connect_data(data_bus, ini_pop_indexes=[[i] for i in range(n_bits)])
+
+    return {"signals": signal_bus, "data": data_bus}
+
+
+if __name__ == "__main__":
+    # Minimum inter-stimulus interval of each input port (static analysis, no simulator is needed)
+    intervals = block_intervals(memory_factory, neuron_params)
+    min_interval = max(intervals.values())
+    print("Minimum intervals: " + str(intervals))
+
+    # Simulator initialization and simulation params
+    sim.setup(timestep=1.0)
+    simtime = 1000.0  # (ms)
+    n_transactions = 300
+
+    # Network building
+    std_conn = sim.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+    memory = NeuralMemory(n_dir, n_bits, sim, global_params, neuron_params, std_conn, and_type="fast")
+    constant_spike_source = ConstantSpikeSource(sim, global_params, neuron_params, std_conn)
+
+    # Write transactions at the maximum throughput
+    rng = np.random.default_rng(0)
+    transactions = np.column_stack([np.arange(n_transactions) * min_interval + 20.0,
+                                    rng.integers(1, n_dir + 1, n_transactions),
+                                    rng.integers(0, 2 ** n_bits, n_transactions)])
+
+    # The interval of the built memory is obtained in closed form by default, and from a copy of it when analysed
+    start = time.time()
+    closed_form = memory_interval(memory)
+    closed_form_time = time.time() - start
+
+    start = time.time()
+    analysed = memory_interval(memory, analyse=True)
+    analysis_time = time.time() - start
+
+    print("Interval of the built memory: " + str(closed_form) + " ms (" + str(closed_form_time * 1000) + " ms), " +
+          "analysed: " + str(analysed) + " ms (" + str(analysis_time * 1000) + " ms), same as the factory: " +
+          str(closed_form == analysed == min_interval))
+
+    # Faster schedules are refused (by default) or reported, unless the check is turned off
+    fast_transactions = transactions.copy()
+    fast_transactions[:, 0] = np.arange(n_transactions) + 20.0
+    try:
+        memory_stimulus(fast_transactions, memory)
+    except ValueError as error:
+        print("Refused: " + str(error))
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        memory_stimulus(fast_transactions, memory, min_interval=min_interval, on_violation="warn")
+        print("Warned: " + str(caught[0].message))
+
+    print("Unchecked schedule lines: " + str(len(memory_stimulus(fast_transactions, memory, on_violation="ignore"))))
+
+    # Testing
+    memory.connect_constant_spikes([constant_spike_source.set_source, constant_spike_source.latch.output_neuron])
+    connect_memory_stimulus(sim, memory, transactions)
+
+    readout = SpikeReadout(sim, memory, ports=["output"])
+
+    # Run simulation
+    sim.run(simtime)
+
+    # Data from the simulation
+    values, write_times = memory.read_state(readout.get_groups()["output"])
+
+    # End simulation
+    sim.end()
+
+    # Expected register values at each timestep
+    expected = np.zeros_like(values)
+    for time, address, data in transactions.astype(np.int64):
+        expected[address - 1, time:] = data
+
+    # Results
+    print("Transactions every " + str(min_interval) + " ms stored correctly: " + str(np.array_equal(values, expected)))
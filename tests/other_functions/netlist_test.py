@@ -0,0 +1,58 @@
+import spynnaker8 as sim
+
+from sPyBlocks.constant_spike_source import ConstantSpikeSource
+from sPyBlocks.netlist import Netlist
+from sPyBlocks.neural_memory import NeuralMemory
+
+if __name__ == "__main__":
+    # Simulator initialization and simulation params
+    sim.setup(timestep=1.0)
+    simtime = 50.0  # (ms)
+
+    # Other parameters
+    n_dir = 15
+    n_bits = 8
+    global_params = {"min_delay": 1.0}
+    neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                     "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+    # Network building (deferred)
+    netlist = Netlist(sim)
+
+    dir_source = netlist.Population(4, netlist.SpikeSourceArray(spike_times=[[5.0], [5.0], [], []]))
+    data_source = netlist.Population(n_bits, netlist.SpikeSourceArray(spike_times=[5.0]))
+
+    std_conn = netlist.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+    memory = NeuralMemory(n_dir, n_bits, netlist, global_params, neuron_params, std_conn, and_type="fast")
+    constant_spike_source = ConstantSpikeSource(netlist, global_params, neuron_params, std_conn)
+
+    memory.connect_constant_spikes([constant_spike_source.set_source, constant_spike_source.latch.output_neuron])
+    memory.connect_signals(dir_source, ini_pop_indexes=[[i] for i in range(4)])
+    memory.connect_data(data_source, ini_pop_indexes=[[i] for i in range(n_bits)])
+
+    for latch in memory.latches.latch_array:
+        latch.latch_sr.output_neuron.record(('spikes'))
+
+    # Optimization and materialization
+    n_merged = netlist.merge_parallel_synapses()
+    n_projections = netlist.materialize()
+
+    # Run simulation
+    sim.run(simtime)
+
+    # Data from the simulation
+    out_spikes = []
+    for latch in memory.latches.latch_array:
+        out_spikes.append(latch.latch_sr.output_neuron.get_data(variables=["spikes"]).segments[0].spiketrains[0])
+
+    # End simulation
+    sim.end()
+
+    # Results
+    print("Number of netlist neurons: " + str(netlist.total_neurons) +
+          "\nNumber of netlist connections: " + str(netlist.total_connections) +
+          "\nNumber of merged parallel synapses: " + str(n_merged) +
+          "\nNumber of populations: " + str(len(netlist.real_populations)) +
+          "\nNumber of projections: " + str(n_projections))
+
+    print(out_spikes[2 * n_bits:3 * n_bits])
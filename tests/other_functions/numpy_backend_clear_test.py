@@ -0,0 +1,44 @@
+import numpy as np
+
+import sPyBlocks.numpy_backend as sim
+
+if __name__ == "__main__":
+    # Simulator initialization and simulation params
+    sim.setup(timestep=1.0)
+    simtime = 10.0  # (ms)
+
+    # Other parameters
+    neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                     "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+    # Network building (two populations excited by the same spikes)
+    spike_source = sim.Population(1, sim.SpikeSourceArray(spike_times=[[2.0, 5.0]]))
+    std_conn = sim.StaticSynapse(weight=1.0, delay=1.0)
+
+    population_a = sim.Population(2, sim.IF_curr_exp(**neuron_params), initial_values={'v': neuron_params["v_rest"]})
+    population_b = sim.Population(2, sim.IF_curr_exp(**neuron_params), initial_values={'v': neuron_params["v_rest"]})
+    for population in [population_a, population_b]:
+        sim.Projection(spike_source, population, sim.AllToAllConnector(), std_conn)
+        population.record(('spikes', 'v'))
+
+    # Run simulation
+    sim.run(simtime)
+
+    # Data from the simulation (the data of A is cleared, as done by SpikeRecorder for each chunk)
+    b_voltage = np.array(population_b.get_data(variables=["v"]).segments[0].analogsignals[0])
+    b_spikes = population_b.get_data(variables=["spikes"]).segments[0].spiketrains
+    a_spikes = population_a.get_data(variables=["spikes"], clear=True).segments[0].spiketrains
+    a_voltage_after = np.array(population_a.get_data(variables=["v"]).segments[0].analogsignals[0])
+    b_voltage_after = np.array(population_b.get_data(variables=["v"]).segments[0].analogsignals[0])
+    b_spikes_after = population_b.get_data(variables=["spikes"]).segments[0].spiketrains
+
+    # End simulation
+    sim.end()
+
+    # Results
+    print("Spikes of A: " + str([list(spiketrain) for spiketrain in a_spikes]))
+    print("Voltage of A cleared: " + str(a_voltage_after.shape))  # Expected: (0, 2)
+    print("Voltage of B kept: " + str(b_voltage_after.shape) + ", unchanged: " +
+          str(np.array_equal(b_voltage, b_voltage_after)))  # Expected: (10, 2), True
+    print("Spikes of B kept: " + str(all(np.array_equal(before, after)
+                                         for before, after in zip(b_spikes, b_spikes_after))))  # Expected: True
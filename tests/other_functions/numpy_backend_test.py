@@ -0,0 +1,53 @@
+import time
+
+import sPyBlocks.numpy_backend as sim
+from sPyBlocks.constant_spike_source import ConstantSpikeSource
+from sPyBlocks.neural_and import NeuralAnd
+from sPyBlocks.neural_memory import NeuralMemory
+
+if __name__ == "__main__":
+    # Simulator initialization and simulation params
+    sim.setup(timestep=1.0)
+    simtime = 2000.0  # (ms)
+
+    # Other parameters
+    n_inputs = 4
+    n_dir = 255
+    n_bits = 8
+    global_params = {"min_delay": 1.0}
+    neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                     "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+    # Network building
+    spike_times = [[4.0, 11.0, 41.0], [4.0, 11.0, 20.0], [4.0, 30.0, 41.0], [4.0, 11.0, 41.0]]
+    spike_source = sim.Population(n_inputs, sim.SpikeSourceArray(spike_times=spike_times))
+    std_conn = sim.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+
+    and_gate = NeuralAnd(n_inputs, sim, global_params, neuron_params, std_conn, "fast")
+    memory = NeuralMemory(n_dir, n_bits, sim, global_params, neuron_params, std_conn, and_type="fast")
+    constant_spike_source = ConstantSpikeSource(sim, global_params, neuron_params, std_conn)
+
+    # Testing
+    and_gate.connect_inputs(spike_source)
+    and_gate.connect_inhibition([constant_spike_source.set_source, constant_spike_source.latch.output_neuron])
+    memory.connect_constant_spikes([constant_spike_source.set_source, constant_spike_source.latch.output_neuron])
+
+    and_gate.output_neuron.record(('spikes', 'v'))
+
+    # Run simulation
+    start = time.time()
+    sim.run(simtime)
+    elapsed = time.time() - start
+
+    # Data from the simulation
+    and_spikes = and_gate.output_neuron.get_data(variables=["spikes"]).segments[0].spiketrains
+    and_voltage = and_gate.output_neuron.get_data(variables=["v"]).segments[0].analogsignals[0]
+
+    # End simulation
+    sim.end()
+
+    # Results
+    print("Simulation time: " + str(elapsed) + " s" +
+          "\nNumber of memory neurons: " + str(memory.total_neurons))
+
+    print(and_spikes)  # Expected: [5.0]
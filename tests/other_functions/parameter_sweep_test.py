@@ -0,0 +1,72 @@
+import time
+
+import sPyBlocks.numpy_backend as sim
+
+from sPyBlocks.connection_functions import static_synapse
+from sPyBlocks.constant_spike_source import ConstantSpikeSource
+from sPyBlocks.neural_and import NeuralAnd
+from sPyBlocks.neural_latch_d import NeuralLatchD
+from sPyBlocks.parameter_sweep import parameter_grid, parameter_sweep
+
+global_params = {"min_delay": 1.0}
+
+
+def and_factory(sim, neuron_params):
+    std_conn = sim.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+    spike_times = [[4.0, 11.0, 41.0], [4.0, 11.0, 20.0], [4.0, 30.0, 41.0]]
+    spike_source = sim.Population(3, sim.SpikeSourceArray(spike_times=spike_times))
+
+    and_gate = NeuralAnd(3, sim, global_params, neuron_params, std_conn)
+    and_gate.connect_inputs(spike_source)
+
+    return [and_gate.output_neuron]
+
+
+def latch_d_factory(sim, neuron_params):
+    std_conn = sim.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+    data_source = sim.Population(1, sim.SpikeSourceArray(spike_times=[10.0, 20.0, 45.0, 70.0]))
+    signal_source = sim.Population(1, sim.SpikeSourceArray(spike_times=[10.0, 15.0, 32.0, 45.0, 69.0, 70.0]))
+
+    latch = NeuralLatchD(sim, global_params, neuron_params, std_conn, and_type="fast")
+    constant_spike_source = ConstantSpikeSource(sim, global_params, neuron_params, std_conn)
+    latch.connect_constant_spikes(constant_spike_source.latch.output_neuron)
+    latch.connect_data(data_source)
+    latch.connect_signal(signal_source)
+
+    return [latch.latch_sr.output_neuron, latch.and_gates.and_array[0].output_neuron,
+            latch.and_gates.and_array[1].output_neuron]
+
+
+if __name__ == "__main__":
+    grid = parameter_grid(cm=[0.1, 0.5, 1.0], tau_m=[0.1, 1.0, 5.0], tau_syn_E=[0.1, 1.0, 5.0],
+                          tau_syn_I=[0.1, 1.0, 5.0], v_thresh=[-64.91, -64.0, -60.0])
+
+    for name, factory in [("AND", and_factory), ("Latch D", latch_d_factory)]:
+        start = time.time()
+        table = parameter_sweep(factory, grid, 100.0)
+        elapsed = time.time() - start
+
+        print(name + ": " + str(len(table)) + " of " + str(len(grid)) + " settings are correct (" + str(elapsed) +
+              " s)")
+        for row in table[:5]:
+            print({key: row[key] for key in ["cm", "tau_m", "tau_syn_E", "tau_syn_I", "v_thresh", "fire_margin",
+                                             "rest_margin", "recovery_time"]})
+
+    # The network of the current process is kept while sweeping, and simulating in this process is refused
+    sim.setup(timestep=1.0)
+    output_neurons = and_factory(sim, grid[0])
+    synapse = static_synapse(sim, 1.0, 2.0)
+
+    table = parameter_sweep(and_factory, grid[:8], 100.0, max_workers=2)
+    print("Network kept after sweeping: " + str(sim.is_active() and static_synapse(sim, 1.0, 2.0) is synapse))
+
+    try:
+        parameter_sweep(and_factory, grid[:8], 100.0, max_workers=1)
+    except RuntimeError as error:
+        print("Refused: " + str(error))
+
+    output_neurons[0].record(('spikes'))
+    sim.run(50.0)
+    print(output_neurons[0].get_data(variables=["spikes"]).segments[0].spiketrains)  # Expected: [SpikeTrain([6.])]
+
+    sim.end()
@@ -0,0 +1,84 @@
+import numpy as np
+import spynnaker8 as sim
+
+from sPyBlocks.constant_spike_source import ConstantSpikeSource
+from sPyBlocks.neural_and import MultipleNeuralAnd
+from sPyBlocks.neural_latch_d import MultipleNeuralLatchD
+from sPyBlocks.neural_latch_sr import MultipleNeuralLatchSR
+from sPyBlocks.neural_not import MultipleNeuralNot
+from sPyBlocks.neural_or import MultipleNeuralOr
+from sPyBlocks.spike_bus import SpikeBus
+from sPyBlocks.spike_readout import SpikeReadout
+
+if __name__ == "__main__":
+    # Simulator initialization and simulation params
+    sim.setup(timestep=1.0)
+    simtime = 200.0  # (ms)
+
+    # Other parameters
+    n_components = 4
+    neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                     "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+    # Random input spikes, shared by both networks
+    rng = np.random.default_rng(0)
+    spike_times = [(np.flatnonzero(rng.random(int(simtime) - 20) < 0.1) + 10.0).tolist()
+                   for _ in range(2 * n_components)]
+    bus = SpikeBus(sim, spike_times)
+    first_half = [[i] for i in range(n_components)]
+    second_half = [[i + n_components] for i in range(n_components)]
+
+    # Network building (the same gates and latches with and without pooled neurons)
+    outputs = {}
+    for pooled in [False, True]:
+        global_params = {"min_delay": 1.0, "pooled": pooled}
+        std_conn = sim.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+        constant_spike_source = ConstantSpikeSource(sim, global_params, neuron_params, std_conn)
+        constant_spikes = [constant_spike_source.set_source, constant_spike_source.latch.output_neuron]
+
+        not_gates = MultipleNeuralNot(n_components, sim, global_params, neuron_params, std_conn)
+        not_gates.connect_excitation(constant_spikes)
+        not_gates.connect_inputs(bus, ini_pop_indexes=first_half)
+
+        or_gates = MultipleNeuralOr(n_components, sim, global_params, neuron_params, std_conn)
+        or_gates.connect_inputs(bus, ini_pop_indexes=[[i, i + n_components] for i in range(n_components)])
+
+        and_gates = {}
+        for and_type in ["classic", "fast"]:
+            and_gates[and_type] = MultipleNeuralAnd(n_components, 2, sim, global_params, neuron_params, std_conn,
+                                                    build_type=and_type)
+            and_gates[and_type].connect_inputs(bus, ini_pop_indexes=[[i, i + n_components]
+                                                                     for i in range(n_components)])
+        and_gates["fast"].connect_inhibition(constant_spikes)
+
+        latches_sr = MultipleNeuralLatchSR(n_components, sim, global_params, neuron_params, std_conn)
+        latches_sr.connect_set(bus, ini_pop_indexes=first_half)
+        latches_sr.connect_reset(bus, ini_pop_indexes=second_half)
+
+        latches_d = MultipleNeuralLatchD(n_components, sim, global_params, neuron_params, std_conn, and_type="fast")
+        latches_d.connect_constant_spikes(constant_spikes)
+        latches_d.connect_data(bus, ini_pop_indexes=first_half)
+        latches_d.connect_signals(bus, ini_pop_indexes=second_half)
+
+        outputs[pooled] = {"NOT": not_gates.get_output_neurons(), "OR": or_gates.get_output_neurons(),
+                           "AND (classic)": and_gates["classic"].get_output_neurons(),
+                           "AND (fast)": and_gates["fast"].get_output_neurons(),
+                           "Latch SR": latches_sr.get_output_neurons(), "Latch D": latches_d.get_output_neurons()}
+
+    readout = SpikeReadout(sim, groups={(name, pooled): outputs[pooled][name]
+                                        for pooled in [False, True] for name in outputs[pooled]})
+
+    # Run simulation
+    sim.run(simtime)
+
+    # Data from the simulation
+    spikes = readout.get_groups()
+
+    # End simulation
+    sim.end()
+
+    # Results
+    for name in outputs[True]:
+        print(name + ": same outputs with pooled neurons: " +
+              str(np.array_equal(spikes[(name, False)], spikes[(name, True)])) + " (" +
+              str(spikes[(name, True)].sum()) + " output spikes)")
@@ -0,0 +1,51 @@
+import gc
+
+import spynnaker8 as sim
+
+from sPyBlocks import connection_functions
+from sPyBlocks.constant_spike_source import ConstantSpikeSource
+from sPyBlocks.neural_decoder import NeuralDecoder
+from sPyBlocks.spike_readout import SpikeReadout
+
+# Parameters
+n_inputs = 3
+simtime = 50.0  # (ms)
+global_params = {"min_delay": 1.0}
+neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                 "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+
+def simulation_cycle():
+    # Simulator initialization
+    sim.setup(timestep=1.0)
+
+    # Network building
+    std_conn = sim.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+    decoder = NeuralDecoder(n_inputs, sim, global_params, neuron_params, std_conn, and_type="fast")
+    constant_spike_source = ConstantSpikeSource(sim, global_params, neuron_params, std_conn)
+    decoder.connect_constant_spikes([constant_spike_source.set_source, constant_spike_source.latch.output_neuron])
+
+    readout = SpikeReadout(sim, groups={"outputs": decoder.get_output_neurons()})
+    cached_populations = len(connection_functions._population_views)
+
+    # Run simulation
+    sim.run(simtime)
+    spikes = readout.get_groups()["outputs"]
+
+    # End simulation
+    sim.end()
+
+    return cached_populations, spikes.sum()
+
+
+if __name__ == "__main__":
+    for cycle in range(2):
+        cached_populations, n_spikes = simulation_cycle()
+        gc.collect()
+
+        print("Cycle " + str(cycle) + ": " + str(cached_populations) + " populations cached while building, " +
+              str(len(connection_functions._population_views)) + " after end (" + str(n_spikes) + " output spikes)")
+
+    print("Cache empty after two setup/end cycles: " + str(len(connection_functions._population_views) == 0))
+    print("Interned synapses forgotten after end: " + str(sim not in connection_functions._static_synapses))
+    print("Synapse with default delay: " + str(connection_functions.static_synapse(sim, 1.0, None).delay))
@@ -0,0 +1,83 @@
+import numpy as np
+import spynnaker8 as sim
+
+from sPyBlocks.connection_functions import flush_projection_batch, start_projection_batch, truth_table_column
+from sPyBlocks.constant_spike_source import ConstantSpikeSource
+from sPyBlocks.neural_decoder import NeuralDecoder
+from sPyBlocks.spike_bus import SpikeBus
+from sPyBlocks.spike_readout import SpikeReadout
+
+# Projections created through the simulator, counted by connector type
+projection_counts = {}
+sim_projection = sim.Projection
+
+
+def counted_projection(presynaptic_population, postsynaptic_population, connector, *args, **kwargs):
+    name = type(connector).__name__
+    projection_counts[name] = projection_counts.get(name, 0) + 1
+    return sim_projection(presynaptic_population, postsynaptic_population, connector, *args, **kwargs)
+
+
+sim.Projection = counted_projection
+
+if __name__ == "__main__":
+    # Simulator initialization and simulation params
+    sim.setup(timestep=1.0)
+    simtime = 100.0  # (ms)
+
+    # Other parameters
+    n_inputs = 4
+    global_params = {"min_delay": 1.0, "pooled": True}
+    neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                     "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+    # Network building (the same decoder built projection by projection and in batched mode)
+    std_conn = sim.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+    bus = SpikeBus(sim, [truth_table_column(int(simtime) // 4, i, select=1) for i in range(n_inputs)])
+
+    def build():
+        decoder = NeuralDecoder(n_inputs, sim, global_params, neuron_params, std_conn, and_type="fast")
+        constant_spike_source = ConstantSpikeSource(sim, global_params, neuron_params, std_conn)
+
+        created_connections = decoder.total_internal_connections
+        created_connections += decoder.connect_constant_spikes([constant_spike_source.set_source,
+                                                                constant_spike_source.latch.output_neuron])
+        created_connections += decoder.connect_inputs(bus, ini_pop_indexes=[[i] for i in range(n_inputs)])
+
+        return decoder, created_connections
+
+    results = {}
+    for batched in [False, True]:
+        projection_counts.clear()
+        if batched:
+            batch = start_projection_batch(sim)
+            decoder, created_connections = build()
+            flush_projection_batch(sim)
+        else:
+            decoder, created_connections = build()
+
+        results[batched] = {"decoder": decoder, "connections": created_connections,
+                            "projections": dict(projection_counts)}
+
+    readout = SpikeReadout(sim, groups={batched: results[batched]["decoder"].get_output_neurons()
+                                        for batched in [False, True]})
+
+    # Run simulation
+    sim.run(simtime)
+
+    # Data from the simulation
+    spikes = readout.get_groups()
+
+    # End simulation
+    sim.end()
+
+    # Results
+    for batched in [False, True]:
+        print(("Batched" if batched else "Unbatched") + ": " + str(results[batched]["connections"]) +
+              " connections, projections " + str(results[batched]["projections"]))
+
+    print("Same connection amounts: " + str(results[False]["connections"] == results[True]["connections"]))
+    print("Fewer projections: " + str(sum(results[True]["projections"].values()) <
+                                      sum(results[False]["projections"].values())))
+    print("Same spikes: " + str(np.array_equal(spikes[False], spikes[True])) + " (" + str(spikes[True].sum()) +
+          " output spikes)")
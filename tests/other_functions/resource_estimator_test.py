@@ -0,0 +1,34 @@
+import time
+
+from sPyBlocks.neural_decoder import NeuralDecoder
+from sPyBlocks.neural_latch_d import NeuralLatchD
+from sPyBlocks.neural_memory import NeuralMemory
+from sPyBlocks.neural_muxdemux import NeuralMuxDemux
+from sPyBlocks.resource_estimator import dry_run_resources, estimate_resources
+
+if __name__ == "__main__":
+    # Closed forms against dry runs (no simulator is needed)
+    cases = [(NeuralDecoder, (4,), {"and_type": "classic"}),
+             (NeuralMuxDemux, (3,), {"build_type": "mux", "and_type": "fast"}),
+             (NeuralMuxDemux, (3,), {"build_type": "demux", "and_type": "classic"}),
+             (NeuralMemory, (15, 8), {"and_type": "fast"}),
+             (NeuralMemory, (40, 5), {"and_type": "classic"})]
+
+    for global_params in [{"min_delay": 1.0}, {"min_delay": 1.0, "pooled": True}]:
+        for block_class, args, kwargs in cases:
+            estimated = estimate_resources(block_class, *args, global_params=global_params, **kwargs)
+            measured = dry_run_resources(block_class, *args, global_params=global_params, **kwargs)
+            print(block_class.__name__ + str(args) + " " + str(kwargs) + (" (pooled)" if "pooled" in global_params
+                                                                          else "") +
+                  ": closed form matches dry run: " + str(estimated == measured))
+
+    # Blocks without closed form are estimated with a dry run
+    print("NeuralLatchD: " + str(estimate_resources(NeuralLatchD, and_type="classic")))
+
+    # Capacity planning of a large memory
+    start = time.time()
+    resources = estimate_resources(NeuralMemory, 4095, 64, and_type="fast",
+                                   global_params={"min_delay": 1.0, "pooled": True})
+    elapsed = time.time() - start
+
+    print("Memory of 4095 x 64 bits (" + str(elapsed * 1000) + " ms): " + str(resources))
@@ -0,0 +1,54 @@
+import numpy as np
+import spynnaker8 as sim
+
+from sPyBlocks.connection_functions import truth_table_column
+from sPyBlocks.constant_spike_source import ConstantSpikeSource
+from sPyBlocks.neural_decoder import NeuralDecoder
+from sPyBlocks.spike_bus import SpikeBus
+from sPyBlocks.spike_readout import SpikeReadout
+
+if __name__ == "__main__":
+    # Simulator initialization and simulation params
+    sim.setup(timestep=1.0)
+    simtime = 100.0  # (ms)
+
+    # Other parameters
+    n_inputs = 3
+    global_params = {"min_delay": 1.0}
+    neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                     "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+    # Network building (the same select lines fed from a bus and from a population per line)
+    spike_times = [truth_table_column(int(simtime), i, select=1) for i in range(n_inputs)]
+
+    bus = SpikeBus(sim, spike_times)
+    spike_sources = [sim.Population(1, sim.SpikeSourceArray(spike_times=times)) for times in spike_times]
+
+    std_conn = sim.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+    bus_decoder = NeuralDecoder(n_inputs, sim, global_params, neuron_params, std_conn, and_type="classic")
+    list_decoder = NeuralDecoder(n_inputs, sim, global_params, neuron_params, std_conn, and_type="classic")
+    constant_spike_source = ConstantSpikeSource(sim, global_params, neuron_params, std_conn)
+
+    # Testing
+    for decoder in [bus_decoder, list_decoder]:
+        decoder.connect_constant_spikes([constant_spike_source.set_source, constant_spike_source.latch.output_neuron])
+
+    bus_decoder.connect_inputs(bus, ini_pop_indexes=[[i] for i in range(n_inputs)])
+    list_decoder.connect_inputs(spike_sources, ini_pop_indexes=[[i] for i in range(n_inputs)])
+
+    readout = SpikeReadout(sim, groups={"bus": bus_decoder.get_output_neurons(),
+                                        "list": list_decoder.get_output_neurons()})
+
+    # Run simulation
+    sim.run(simtime)
+
+    # Data from the simulation
+    spikes = readout.get_groups()
+
+    # End simulation
+    sim.end()
+
+    # Results
+    print("Source populations: 1 (bus) vs " + str(len(spike_sources)) + " (list)")
+    print("Selected outputs: " + str(np.argmax(spikes["bus"], axis=1)[n_inputs:n_inputs + 2 ** n_inputs].tolist()))
+    print("Same outputs: " + str(np.array_equal(spikes["bus"], spikes["list"])))
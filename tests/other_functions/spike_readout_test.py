@@ -0,0 +1,48 @@
+import numpy as np
+import spynnaker8 as sim
+
+from sPyBlocks.constant_spike_source import ConstantSpikeSource
+from sPyBlocks.neural_decoder import NeuralDecoder
+from sPyBlocks.spike_readout import SpikeReadout
+
+if __name__ == "__main__":
+    # Simulator initialization and simulation params
+    sim.setup(timestep=1.0)
+    simtime = 20.0  # (ms)
+
+    # Other parameters
+    n_inputs = 2
+    global_params = {"min_delay": 1.0}
+    neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                     "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+    # Network building
+    spike_times = [[3.0, 9.0], [6.0, 9.0]]
+    spike_source = sim.Population(n_inputs, sim.SpikeSourceArray(spike_times=spike_times))
+    std_conn = sim.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+    decoder = NeuralDecoder(n_inputs, sim, global_params, neuron_params, std_conn)
+    constant_spike_source = ConstantSpikeSource(sim, global_params, neuron_params, std_conn)
+
+    # Testing
+    decoder.connect_constant_spikes([constant_spike_source.set_source, constant_spike_source.latch.output_neuron])
+    decoder.connect_inputs(spike_source, ini_pop_indexes=[[0], [1]])
+
+    # One recording call for all the ports of the decoder and the spike source
+    readout = SpikeReadout(sim, decoder, groups={"source": spike_source})
+
+    # Run simulation
+    sim.run(simtime)
+
+    # Data from the simulation
+    spikes = readout.get_groups()
+    packed_spikes = readout.get_matrix(packed=True)
+
+    # End simulation
+    sim.end()
+
+    # Results
+    print("Ports: " + str(list(readout.columns.keys())) +
+          "\nRecorded neurons: " + str(readout.n_columns) + " (packed into " + str(packed_spikes.shape[1]) + " bytes)")
+    for time, outputs in enumerate(spikes["output"][:, 1:]):
+        if outputs.any():
+            print(str(time) + " ms: output " + str(np.flatnonzero(outputs) + 1))  # Expected: 1, 2 and 3 (6, 9, 12 ms)
@@ -0,0 +1,54 @@
+from math import ceil, log2
+
+import spynnaker8 as sim
+
+from sPyBlocks.connection_functions import truth_table_column
+from sPyBlocks.constant_spike_source import ConstantSpikeSource
+from sPyBlocks.neural_memory import NeuralMemory
+from sPyBlocks.spike_recorder import SpikeRecorder, spike_window
+
+if __name__ == "__main__":
+    # Simulator initialization and simulation params
+    sim.setup(timestep=1.0)
+    simtime = 20000.0  # (ms)
+    chunk_time = 2000.0  # (ms)
+
+    # Other parameters
+    n_dir = 15
+    n_signals = ceil(log2(n_dir + 1))
+    n_bits = 8
+    global_params = {"min_delay": 1.0}
+    neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                     "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+    # Network building
+    dir_sources = [sim.Population(1, sim.SpikeSourceArray(spike_times=truth_table_column(ceil(simtime), i, select=1)))
+                   for i in range(n_signals)]
+    data_sources = [sim.Population(1, sim.SpikeSourceArray(spike_times=truth_table_column(ceil(simtime), i, select=1)))
+                    for i in range(n_bits)]
+
+    std_conn = sim.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+    memory = NeuralMemory(n_dir, n_bits, sim, global_params, neuron_params, std_conn, and_type="fast")
+    constant_spike_source = ConstantSpikeSource(sim, global_params, neuron_params, std_conn)
+
+    # Testing
+    memory.connect_constant_spikes([constant_spike_source.set_source, constant_spike_source.latch.output_neuron])
+    memory.connect_signals(dir_sources, ini_pop_indexes=[[i] for i in range(n_signals)])
+    memory.connect_data(data_sources, ini_pop_indexes=[[i] for i in range(n_bits)])
+
+    recorder = SpikeRecorder(sim, "spike_recorder_test.spikes", memory, ports=["output"], chunk_time=chunk_time)
+
+    # Run simulation (the spikes of each chunk are written to the file)
+    recorder.run(simtime)
+
+    # End simulation
+    sim.end()
+
+    # Lazy reading of the last second of the simulation
+    records = recorder.load()
+    window = spike_window(records, int(simtime) - 1000, 1000, recorder.n_columns)
+    values, write_times = memory.read_state(window[:, recorder.columns["output"]])
+
+    # Results
+    print("Recorded spikes: " + str(recorder.total_spikes) + " (" + str(records.nbytes) + " bytes)")
+    print("Register values at the end of the simulation: " + str([hex(value) for value in values[:, -1]]))
@@ -0,0 +1,71 @@
+import numpy as np
+import spynnaker8 as sim
+
+from sPyBlocks.constant_spike_source import ConstantSpikeSource
+from sPyBlocks.neural_memory import NeuralMemory
+from sPyBlocks.spike_readout import SpikeReadout
+from sPyBlocks.stimulus_functions import connect_memory_stimulus, memory_stimulus
+from sPyBlocks.trace_functions import SpikeTrace
+
+if __name__ == "__main__":
+    # Simulator initialization and simulation params
+    sim.setup(timestep=1.0)
+    simtime = 2000.0  # (ms)
+
+    # Other parameters
+    n_dir = 15
+    n_bits = 8
+    n_transactions = 200
+    global_params = {"min_delay": 1.0}
+    neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                     "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+    # Network building
+    std_conn = sim.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+    memory = NeuralMemory(n_dir, n_bits, sim, global_params, neuron_params, std_conn, and_type="fast")
+    constant_spike_source = ConstantSpikeSource(sim, global_params, neuron_params, std_conn)
+
+    # Random write transactions (time, address, data), one every 5 ms
+    rng = np.random.default_rng(0)
+    transactions = np.column_stack([np.arange(n_transactions) * 5.0 + 20.0,
+                                    rng.integers(1, n_dir + 1, n_transactions),
+                                    rng.integers(0, 2 ** n_bits, n_transactions)])
+
+    # Testing
+    memory.connect_constant_spikes([constant_spike_source.set_source, constant_spike_source.latch.output_neuron])
+    stimulus = connect_memory_stimulus(sim, memory, transactions)
+
+    readout = SpikeReadout(sim, memory, ports=["output"])
+
+    # Run simulation
+    sim.run(simtime)
+
+    # Transactions less than a timestep apart (0.5 ms) are refused, even if the interval check is turned off
+    try:
+        memory_stimulus([[20.0, 1, 1], [20.5, 2, 1]], memory, on_violation="ignore")
+        close_refused = False
+    except ValueError:
+        close_refused = True
+
+    # Data from the simulation
+    values, write_times = memory.read_state(readout.get_groups()["output"])
+
+    # End simulation
+    sim.end()
+
+    # Expected register values at each timestep
+    expected = np.zeros_like(values)
+    for time, address, data in transactions.astype(np.int64):
+        expected[address - 1, time:] = data
+
+    # Results
+    print("Transactions: " + str(n_transactions) + ", stimulus neurons: " + str(stimulus.size))
+    print("Stored words match the transactions: " + str(np.array_equal(values, expected)))
+    print("Transactions 0.5 ms apart refused: " + str(close_refused))
+
+    # Trace of the registers in a columnar format
+    trace = SpikeTrace("stimulus_functions_test", simtime, file_format="rle")
+    for address in range(n_dir):
+        trace.printRow(address + 1, "Address " + str(address + 1), values[address].tolist(), "#FFF2CC")
+
+    trace.closeExcel()
@@ -0,0 +1,48 @@
+import time
+
+from sPyBlocks.constant_spike_source import ConstantSpikeSource
+from sPyBlocks.netlist import Netlist
+from sPyBlocks.neural_memory import NeuralMemory
+from sPyBlocks.spike_bus import SpikeBus
+from sPyBlocks.timing_analysis import TimingAnalysis
+
+if __name__ == "__main__":
+    # Parameters
+    n_dir = 1023
+    n_bits = 32
+    global_params = {"min_delay": 1.0}
+    neuron_params = {"cm": 0.1, "tau_m": 0.1, "tau_refrac": 0.0, "tau_syn_E": 0.1, "tau_syn_I": 0.1,
+                     "v_rest": -65.0, "v_reset": -65.0, "v_thresh": -64.91}
+
+    # Network building (deferred, no simulator is needed)
+    netlist = Netlist()
+    std_conn = netlist.StaticSynapse(weight=1.0, delay=global_params["min_delay"])
+    memory = NeuralMemory(n_dir, n_bits, netlist, global_params, neuron_params, std_conn, and_type="fast")
+    constant_spike_source = ConstantSpikeSource(netlist, global_params, neuron_params, std_conn)
+
+    signal_bus = SpikeBus(netlist, [[] for _ in range(memory.decoder.n_inputs)])
+    data_bus = SpikeBus(netlist, [[] for _ in range(n_bits)])
+
+    memory.connect_constant_spikes([constant_spike_source.set_source, constant_spike_source.latch.output_neuron])
+    memory.connect_signals(signal_bus, ini_pop_indexes=[[i] for i in range(memory.decoder.n_inputs)])
+    memory.connect_data(data_bus, ini_pop_indexes=[[i] for i in range(n_bits)])
+
+    # Analysis
+    start = time.time()
+    timing = TimingAnalysis(netlist, {"signals": signal_bus, "data": data_bus})
+    elapsed = time.time() - start
+
+    earliest, latest = timing.arrival(memory.get_output_neurons())
+
+    # Results
+    print("Analysis time: " + str(elapsed * 1000) + " ms (" + str(netlist.total_connections) + " connections, " +
+          str(timing.feedback.sum()) + " feedback)")
+    print("Output arrival: " + str(earliest.min()) + " - " + str(latest.max()) + " ms (write delay " +
+          str(memory.write_delay) + " ms + input delay " + str(std_conn.delay) + " ms)")
+    print("Critical path: " + str(timing.critical_path(memory.get_output_neurons())))
+    print("Maximum input rate: " + str(timing.max_input_rate()) + " spikes/ms")
+
+    for check in timing.declared_delays(memory):
+        print(("OK       " if check["matches"] else "MISMATCH ") + (check["block"] or "memory") + "." +
+              check["attribute"] + " = " + str(check["declared"]) + " (measured " + str(check["min_latency"]) +
+              " - " + str(check["max_latency"]) + ")")
@@ -0,0 +1,132 @@
+import os
+import zipfile
+import xml.etree.ElementTree as ElementTree
+
+import numpy as np
+import xlsxwriter
+
+from sPyBlocks.trace_functions import SpikeTrace
+
+NAMESPACE = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def baseline_trace(file_name, simtime, spike_rows, value_rows):
+    """
+    Writes an Excel trace with the original loops of SpikeTrace (a write call for each cell).
+    """
+    excel = xlsxwriter.Workbook(os.getcwd() + "/" + file_name + ".xlsx")
+
+    def create_format(color):
+        excel_format = excel.add_format()
+        excel_format.set_border()
+        excel_format.set_bold()
+        excel_format.set_align('center')
+        excel_format.set_align('vcenter')
+        excel_format.set_bg_color(color)
+        return excel_format
+
+    header_format = create_format("#F4B084")
+    background_format = create_format("#FCE4D6")
+
+    worksheets = []
+    for i in range(simtime):
+        if i % 1023 == 0:
+            worksheets.append(excel.add_worksheet())
+            worksheets[-1].write(0, 0, "Time (ms)", header_format)
+        worksheets[-1].write(0, i % 1023 + 1, i, header_format)
+
+    for index, (row_name, spikes, color) in spike_rows.items():
+        values_format = create_format(color)
+        for worksheet in worksheets:
+            worksheet.write(index, 0, row_name, header_format)
+        for i in range(simtime):
+            if i in spikes:
+                worksheets[i // 1023].write(index, i % 1023 + 1, 1, values_format)
+            else:
+                worksheets[i // 1023].write(index, i % 1023 + 1, "", background_format)
+
+    for index, (row_name, values, color) in value_rows.items():
+        values_format = create_format(color)
+        for worksheet in worksheets:
+            worksheet.write(index, 0, row_name, header_format)
+        for i in range(simtime):
+            if i < len(values):
+                worksheets[i // 1023].write(index, i % 1023 + 1, values[i], values_format)
+            else:
+                worksheets[i // 1023].write(index, i % 1023 + 1, "", background_format)
+
+    excel.close()
+
+
+def read_cells(path):
+    """
+    Reads the value and the background color of each cell of each worksheet of an Excel file.
+    """
+    with zipfile.ZipFile(path) as file:
+        names = file.namelist()
+        shared_strings = []
+        if "xl/sharedStrings.xml" in names:
+            root = ElementTree.fromstring(file.read("xl/sharedStrings.xml"))
+            shared_strings = ["".join(text.text or "" for text in item.iter("{" + NAMESPACE["x"] + "}t"))
+                              for item in root.findall("x:si", NAMESPACE)]
+
+        styles = ElementTree.fromstring(file.read("xl/styles.xml"))
+        fills = [fill.find("x:patternFill/x:fgColor", NAMESPACE)
+                 for fill in styles.findall("x:fills/x:fill", NAMESPACE)]
+        fill_colors = [None if color is None else color.get("rgb") for color in fills]
+        style_colors = [fill_colors[int(xf.get("fillId", 0))] for xf in styles.findall("x:cellXfs/x:xf", NAMESPACE)]
+
+        sheets = []
+        sheet_names = sorted((name for name in names if name.startswith("xl/worksheets/sheet")),
+                             key=lambda name: int(name[len("xl/worksheets/sheet"):-len(".xml")]))
+        for name in sheet_names:
+            cells = {}
+            for cell in ElementTree.fromstring(file.read(name)).iter("{" + NAMESPACE["x"] + "}c"):
+                cell_type = cell.get("t")
+                value = cell.find("x:v", NAMESPACE)
+                if cell_type == "s":
+                    content = shared_strings[int(value.text)]
+                elif cell_type == "inlineStr":
+                    content = "".join(text.text or "" for text in cell.iter("{" + NAMESPACE["x"] + "}t"))
+                elif value is None:
+                    content = ""
+                else:
+                    content = float(value.text)
+                cells[cell.get("r")] = (content, style_colors[int(cell.get("s", 0))])
+            sheets.append(cells)
+
+    return sheets
+
+
+if __name__ == "__main__":
+    # Parameters (the trace takes three worksheets of 1023 milliseconds)
+    simtime = 2100  # (ms)
+
+    # Rows of the trace: spike rows with spikes at both sides of the worksheet boundaries, and value rows shorter
+    # than the simulation (one of them crossing the first boundary)
+    rng = np.random.default_rng(0)
+    spike_rows = {1: ("Boundaries", [0.0, 1021.0, 1022.0, 1023.0, 1024.0, 2045.0, 2046.0, 2099.0], "#FFF2CC"),
+                  2: ("Random", np.flatnonzero(rng.random(simtime) < 0.2).astype(float).tolist(), "#E2EFDA"),
+                  4: ("Not in a millisecond", [2.5, 1500.0], "#FFF2CC")}
+    value_rows = {3: ("Values", rng.integers(0, 16, 1500).tolist(), "#DDEBF7"),
+                  5: ("Short", ["A", "B", "C"], "#DDEBF7")}
+
+    # The same rows are written by the original loops and by SpikeTrace
+    baseline_trace("trace_excel_test_baseline", simtime, spike_rows, value_rows)
+
+    trace = SpikeTrace("trace_excel_test", simtime)
+    for index, (row_name, spikes, color) in spike_rows.items():
+        trace.printSpikes(index, row_name, spikes, color)
+    for index, (row_name, values, color) in value_rows.items():
+        trace.printRow(index, row_name, values, color)
+    trace.closeExcel()
+
+    # Results
+    expected = read_cells("trace_excel_test_baseline.xlsx")
+    cells = read_cells("trace_excel_test.xlsx")
+    print("Worksheets: " + str(len(cells)) + " (expected " + str(len(expected)) + ")")
+    for sheet, (sheet_cells, expected_cells) in enumerate(zip(cells, expected)):
+        different = [ref for ref in expected_cells.keys() | sheet_cells.keys()
+                     if sheet_cells.get(ref) != expected_cells.get(ref)]
+        print("Worksheet " + str(sheet + 1) + ": " + str(len(sheet_cells)) + " cells, same values and colors as the " +
+              "original loops: " + str(not different))
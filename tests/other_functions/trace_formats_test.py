@@ -0,0 +1,79 @@
+import csv
+import gzip
+import json
+import time
+
+import numpy as np
+
+from sPyBlocks.trace_functions import SpikeTrace
+
+if __name__ == "__main__":
+    # Parameters
+    simtime = 5000  # (ms)
+    n_spike_rows = 6
+
+    # Rows of the trace: spike rows (with times out of the trace or not in a millisecond, which are not printed) and
+    # a value row shorter than the simulation
+    rng = np.random.default_rng(0)
+    spike_times = [np.flatnonzero(rng.random(simtime) < 0.1).astype(float) for _ in range(n_spike_rows)]
+    extra_times = [-1.0, 2.5, float(simtime), simtime + 10.0]
+    values = rng.integers(0, 4, simtime - 300).tolist()
+
+    # The same rows are written in each columnar format
+    write_times = {}
+    for file_format in ["csv.gz", "npz", "rle"]:
+        trace = SpikeTrace("trace_formats_test", simtime, file_format=file_format)
+        for i, times in enumerate(spike_times):
+            trace.printSpikes(i + 1, "Row " + str(i), np.concatenate((times, extra_times)), "#FFF2CC")
+        trace.printRow(n_spike_rows + 1, "Values", values, "#DDEBF7")
+
+        start = time.time()
+        trace.closeExcel()
+        write_times[file_format] = time.time() - start
+
+    # Expected contents: spike times of each spike row and text of the value row (empty after its last value)
+    expected_names = ["Row " + str(i) for i in range(n_spike_rows)] + ["Values"]
+    expected_spikes = [times.astype(np.int64) for times in spike_times]
+    expected_values = [str(value) for value in values] + [""] * (simtime - len(values))
+
+    # Decoding of the compressed CSV file (a column for each row)
+    with gzip.open("trace_formats_test.csv.gz", "rt", newline="") as file:
+        lines = list(csv.reader(file))
+    columns = list(zip(*lines[1:]))
+    csv_names = lines[0][1:]
+    csv_spikes = [np.flatnonzero(np.array(column) == "1") for column in columns[1:n_spike_rows + 1]]
+    csv_values = list(columns[n_spike_rows + 1])
+    csv_times = [int(t) for t in columns[0]] == list(range(simtime))
+
+    # Decoding of the NumPy file (spike bitmaps and value text)
+    with np.load("trace_formats_test.npz") as npz:
+        npz_names = npz["spike_names"].tolist() + npz["value_names"].tolist()
+        bitmaps = np.unpackbits(npz["spike_bitmaps"], axis=1)[:, :simtime]
+        npz_spikes = [np.flatnonzero(bitmap) for bitmap in bitmaps]
+        npz_values = npz["values"][0].tolist()
+        npz_times = int(npz["simtime"]) == simtime
+
+    # Decoding of the run-length encoded JSON file
+    with open("trace_formats_test.rle.json") as file:
+        rle = json.load(file)
+    rle_names = [row["name"] for row in rle["rows"]]
+    rle_spikes = [np.concatenate([np.arange(start, start + length) for start, length in row["runs"]] +
+                                 [np.zeros(0, dtype=np.int64)]) for row in rle["rows"][:n_spike_rows]]
+    rle_values = [""] * simtime
+    for start, length, value in rle["rows"][n_spike_rows]["runs"]:
+        rle_values[start:start + length] = [value] * length
+    rle_times = rle["simtime"] == simtime
+
+    decoded = {"csv.gz": (csv_names, csv_spikes, csv_values, csv_times),
+               "npz": (npz_names, npz_spikes, npz_values, npz_times),
+               "rle": (rle_names, rle_spikes, rle_values, rle_times)}
+
+    # Results
+    print("Spikes: " + str(sum(len(times) for times in expected_spikes)) + ", values: " + str(len(values)) +
+          ", milliseconds: " + str(simtime))
+    for file_format, (names, spikes, row_values, times) in decoded.items():
+        print(file_format + ": names match: " + str(names == expected_names) +
+              ", spike times match: " + str(all(np.array_equal(decoded_times, expected_times)
+                                                for decoded_times, expected_times in zip(spikes, expected_spikes))) +
+              ", values match: " + str(row_values == expected_values) + ", times match: " + str(times) +
+              ", write time: " + str(write_times[file_format]) + " s")
@@ -0,0 +1,56 @@
+import numpy as np
+
+from sPyBlocks.connection_functions import _truth_table_indexes, truth_table_column
+
+
+def loop_truth_table_column(n_values, n_var, select=1):
+    """
+    Original implementation of truth_table_column, with a loop over the rows of the truth table.
+    """
+    numbers = range(0, n_values)
+
+    zeros = []
+    for i in numbers:
+        if i % (2 ** (n_var + 1)) == 0:
+            for j in range(i, i + 2 ** n_var):
+                if i >= n_values:
+                    break
+                zeros.append(i)
+                i += 1
+
+    if not select:
+        return zeros
+    else:
+        ones = np.delete(numbers, zeros)
+        return ones.tolist()
+
+
+if __name__ == "__main__":
+    # Columns of complete truth tables (2^n rows) and of truncated ones (as used by the decoders and memories)
+    parameters = [(n_values, n_var, select) for n_values in [1, 2, 7, 8, 15, 16, 100, 1023, 1024]
+                  for n_var in range(max(int(n_values - 1).bit_length(), 1) + 1) for select in [0, 1]]
+
+    different = [params for params in parameters
+                 if truth_table_column(*params) != loop_truth_table_column(*params)]
+    print("Columns compared: " + str(len(parameters)) + ", same indices as the loop: " + str(not different))
+
+    # The cached result can not be changed by the callers: they get a new list and the cached array is read-only
+    column = truth_table_column(16, 2, select=1)
+    column.append(100)
+    column[0] = -1
+    print("Column not changed by a caller: " + str(truth_table_column(16, 2, select=1) == [4, 5, 6, 7, 12, 13, 14, 15]))
+    print("Different list in each call: " + str(truth_table_column(16, 2) is not truth_table_column(16, 2)))
+
+    try:
+        _truth_table_indexes(16, 2, 1)[0] = -1
+        read_only = False
+    except ValueError:
+        read_only = True
+    print("Cached array read-only: " + str(read_only) + ", cache hits: " + str(_truth_table_indexes.cache_info().hits))
+
+    # Only binary values can be selected
+    try:
+        truth_table_column(8, 0, select=2)
+        print("Select 2 refused: False")
+    except ValueError:
+        print("Select 2 refused: True")